@@ -0,0 +1,6 @@
+"""
+Benchmarks for dict_deserializer. These are not part of the test suite; run
+them from the repository root. ``python -m benchmarks`` runs the benchmark
+suite (see ``benchmarks.suite``); the other modules measure specific
+features, e.g. ``python -m benchmarks.directory``.
+"""
@@ -0,0 +1,84 @@
+"""
+Runs the benchmark suite, or compares the results of two runs.
+
+To compare two revisions, run the suite on each of them and compare the
+stored results. The suite itself always runs from the current checkout; use
+``--library`` to time the library of another one, e.g. a ``git worktree``
+of the revision to compare against::
+
+    git worktree add ../baseline <revision>
+    python -m benchmarks run --library ../baseline --output old.json
+    python -m benchmarks run --output new.json
+    python -m benchmarks compare old.json new.json
+
+Revisions that lack a measured function (like ``validate``) or an option
+that is enabled are reported as an error. Cases that fail are recorded as
+such, and the other cases are still measured.
+
+``compare`` exits with status 1 when any case got slower or used more
+memory by more than the threshold, or failed in the new run only.
+"""
+import argparse
+import sys
+
+from benchmarks import suite
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks', description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run = commands.add_parser('run', help='Run the benchmark suite.')
+    run.add_argument('cases', nargs='*',
+                     help='The cases to run (default: all).')
+    run.add_argument('--scale', type=int, default=1,
+                     help='Multiplies the size of the payloads.')
+    run.add_argument('--min-time', type=float, default=1.0,
+                     help='The minimal amount of seconds to time each case.')
+    run.add_argument('--enable', action='append', default=[],
+                     choices=sorted(suite.OPTIONS),
+                     help='Enables an optional feature, may be repeated.')
+    function = run.add_mutually_exclusive_group()
+    function.add_argument('--validate', action='store_true',
+                          help='Measures validate() instead of '
+                               'deserialize().')
+    function.add_argument('--roundtrip', action='store_true',
+                          help='Measures deserialize() followed by '
+                               'serialize().')
+    run.add_argument('--library', metavar='PATH',
+                     help='Imports dict_deserializer from the checkout at '
+                          'PATH instead of the current directory.')
+    run.add_argument('--output', help='Stores the results as JSON.')
+
+    compare = commands.add_parser(
+        'compare', help='Compare the results of two runs.')
+    compare.add_argument('old', help='The results of the baseline run.')
+    compare.add_argument('new', help='The results of the run to check.')
+    compare.add_argument('--threshold', type=float, default=0.1,
+                         help='The relative slowdown (or growth in peak '
+                              'memory) that counts as a regression '
+                              '(default: 0.1).')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        try:
+            results = suite.run(args.cases, args.scale, args.min_time,
+                                args.enable, args.validate,
+                                args.roundtrip, args.library)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.output:
+            suite.save(results, args.output)
+        return 0
+
+    regressions = suite.compare(suite.load(args.old), suite.load(args.new),
+                                args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+The cases of the benchmark suite. Each case is a rule and a payload that is
+deserialized into it, covering one of the hot paths of the library.
+"""
+from collections import namedtuple
+from typing import Dict, List, Optional, Union
+
+from dict_deserializer.annotations import abstract, discriminate, validated
+from dict_deserializer.deserializer import Deserializable, Rule
+
+Case = namedtuple('Case', ['name', 'description', 'rule', 'payload',
+                           'objects'])
+
+
+class Record(Deserializable):
+    id: int
+    name: str
+    email: str
+    score: float
+    active: bool
+    nickname: Optional[str] = None
+
+
+class Node(Deserializable):
+    name: str
+
+
+# Self-referencing fields are added after the class exists.
+Node.__annotations__['child'] = Optional[Node]
+
+
+def _make_variant(i: int) -> type:
+    return type('Variant{}'.format(i), (Deserializable,), {
+        '__annotations__': {'name': str, 'field{}'.format(i): int},
+    })
+
+
+# Only the last variant matches, so every other one is tried first.
+variants = [_make_variant(i) for i in range(8)]
+WideUnion = Union[tuple(variants)]
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+@discriminate('type', 'user')
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+@discriminate('type', 'group')
+class Group(Object):
+    members: List[Object]
+
+
+@abstract
+class Event(Deserializable):
+    at: int
+
+
+class Created(Event):
+    creator: str
+
+
+class Deleted(Event):
+    reason: str
+
+
+class Moved(Event):
+    source: str
+    target: str
+
+
+class Account(Deserializable):
+    name: str
+
+    @validated()
+    def age(self, value):
+        if not isinstance(value, int) or value < 0:
+            raise TypeError('age must be a non-negative int')
+
+    @validated()
+    def email(self, value):
+        if not isinstance(value, str) or '@' not in value:
+            raise TypeError('email must be an address')
+
+
+def _record(i: int) -> dict:
+    return {
+        'id': i,
+        'name': 'record{}'.format(i),
+        'email': 'record{}@example.com'.format(i),
+        'score': i / 10,
+        'active': i % 2 == 0,
+    }
+
+
+def _chain(depth: int) -> dict:
+    node = None
+    for i in range(depth):
+        node = {'name': 'node{}'.format(i), 'child': node}
+    return node
+
+
+def _directory(groups: int, users: int) -> dict:
+    return {
+        'type': 'group',
+        'name': 'root',
+        'members': [{
+            'type': 'group',
+            'name': 'group{}'.format(g),
+            'members': [{
+                'type': 'user',
+                'name': 'user{}'.format(u),
+                'full_name': 'User {} of group {}'.format(u, g),
+            } for u in range(users)],
+        } for g in range(groups)],
+    }
+
+
+def get_cases(scale: int = 1) -> List[Case]:
+    """
+    Returns all cases. scale multiplies the size of the payloads.
+    """
+    return [
+        Case('flat', 'a single record of primitive fields',
+             Rule(Record), _record(1), 1),
+        Case('deep', 'a chain of 100 nested objects',
+             Rule(Node), _chain(100), 100),
+        Case('wide_union', '100 elements of an 8-way Union of classes',
+             Rule(List[WideUnion]),
+             [{'name': 'v', 'field7': i} for i in range(100 * scale)],
+             100 * scale),
+        Case('polymorphic', 'a discriminated group/user hierarchy',
+             Rule(Object), _directory(10, 20 * scale),
+             1 + 10 * (1 + 20 * scale)),
+        Case('skewed', '1000 events of the subclass that was declared last',
+             Rule(List[Event]),
+             [{'at': i, 'source': 'a', 'target': 'b'}
+              for i in range(1000 * scale)],
+             1000 * scale),
+        Case('large_list', 'a list of 10000 records',
+             Rule(List[Record]), [_record(i) for i in range(10000 * scale)],
+             10000 * scale),
+        Case('large_dict', 'a dict of 10000 records',
+             Rule(Dict[str, Record]),
+             {str(i): _record(i) for i in range(10000 * scale)},
+             10000 * scale),
+        Case('validated', '1000 objects with @validated fields',
+             Rule(List[Account]),
+             [{'name': 'a{}'.format(i), 'age': i,
+               'email': 'a{}@example.com'.format(i)}
+              for i in range(1000 * scale)],
+             1000 * scale),
+    ]
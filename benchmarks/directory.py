@@ -0,0 +1,70 @@
+"""
+Throughput of deserializing the directory model from
+``test_DirectoryExample.py``.
+
+Every group in the directory payload is first attempted as a ``User``, which
+fails, so this exercises both the successful path and the candidate fallback
+path. The user list payload is a flat, homogeneous ``List[User]``.
+"""
+import argparse
+from timeit import Timer
+from typing import List
+
+from dict_deserializer.deserializer import deserialize, Rule
+from test_DirectoryExample import Object, User
+
+
+def make_directory(groups: int, users: int) -> dict:
+    """
+    Builds a directory payload with the given number of groups, each holding
+    the given number of users.
+    """
+    return {
+        'name': 'root',
+        'members': [{
+            'name': 'group{}'.format(g),
+            'members': [{
+                'name': 'user{}'.format(u),
+                'full_name': 'User {} of group {}'.format(u, g),
+            } for u in range(users)],
+        } for g in range(groups)],
+    }
+
+
+def make_users(users: int) -> list:
+    """
+    Builds a list of user payloads.
+    """
+    return [{
+        'name': 'user{}'.format(u),
+        'full_name': 'User {}'.format(u),
+        'calling_name': 'U{}'.format(u),
+    } for u in range(users)]
+
+
+def measure(title: str, rule: Rule, payload, objects: int, repeat: int,
+            number: int):
+    timer = Timer(lambda: deserialize(rule, payload))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    print(title)
+    print('  {} objects per payload'.format(objects))
+    print('  {:.3f} ms per payload'.format(best * 1000))
+    print('  {:.0f} objects/s'.format(objects / best))
+
+
+def run(groups: int = 10, users: int = 50, repeat: int = 5, number: int = 10):
+    measure('directory', Rule(Object), make_directory(groups, users),
+            1 + groups * (users + 1), repeat, number)
+    measure('user list', Rule(List[User]), make_users(groups * users),
+            groups * users, repeat, number)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--groups', type=int, default=10)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args()
+    run(args.groups, args.users, args.repeat, args.number)
@@ -0,0 +1,74 @@
+"""
+Memory footprint of deserialized instances, with and without
+``slots=True``.
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import List, Optional
+
+from dict_deserializer.annotations import abstract
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+@abstract
+class SlotsObject(Deserializable, slots=True):
+    name: str
+
+
+class SlotsUser(SlotsObject):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+def make_users(users: int) -> list:
+    """
+    Builds a list of user payloads.
+    """
+    return [{
+        'name': 'user{}'.format(u),
+        'full_name': 'User {}'.format(u),
+    } for u in range(users)]
+
+
+def measure(rule: Rule, payload) -> int:
+    """
+    Returns the amount of bytes held by the deserialized payload, excluding
+    the strings it shares with the payload itself.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = deserialize(rule, payload)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def run(users: int = 100000):
+    payload = make_users(users)
+    for title, t in (('dict', User), ('slots', SlotsUser)):
+        size = measure(Rule(List[t]), payload)
+        print(title)
+        print('  {:.1f} MiB for {} instances'.format(size / 2 ** 20, users))
+        print('  {:.0f} bytes per instance'.format(size / users))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100000)
+    args = parser.parse_args()
+    run(args.users)
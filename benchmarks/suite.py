@@ -0,0 +1,289 @@
+"""
+The benchmark suite: measures every case from ``benchmarks.cases`` and
+compares the results of two runs.
+
+Every case is timed call by call, which gives its throughput (objects per
+second, based on the mean time per call) and latency percentiles. Its peak
+memory is measured separately with ``tracemalloc``, since tracing slows
+everything down.
+
+Cases are timed through the public ``deserialize(rule, data)``, so that the
+suite can time older revisions of the library as well (see ``--library``).
+Nothing is imported from the library until a run starts. Functions and
+options that a revision lacks are reported as errors.
+"""
+import gc
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Optional features that can be enabled for a run, by name, mapped to the
+# module whose enable() enables them.
+OPTIONS = {
+    'adaptive': 'dict_deserializer.adaptive',
+    'codegen': 'dict_deserializer.codegen',
+}
+
+
+# The maximal length of the error message that is stored for a failed case.
+_max_error = 200
+
+
+def _require(module: str, name: str) -> Callable:
+    """
+    Returns the function called name from module of the library, or raises
+    a ValueError when the revision that is being measured does not have it.
+    """
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError):
+        raise ValueError('{}.{} is not available in this revision of '
+                         'dict_deserializer.'.format(module, name))
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """
+    Returns the p-th percentile (0 to 100) of the sorted samples, by
+    linear interpolation.
+    """
+    position = (len(samples) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * \
+        (position - lower)
+
+
+def measure(case, min_time: float = 1.0, min_calls: int = 10,
+            validating: bool = False, roundtrip: bool = False) -> dict:
+    """
+    Measures a single case.
+
+    :param case: The case to measure.
+    :param min_time: The minimal amount of seconds to spend timing calls.
+    :param min_calls: The minimal amount of calls to time.
+    :param validating: Whether to measure ``validate`` rather than
+        ``deserialize``.
+    :param roundtrip: Whether to measure ``deserialize`` followed by
+        ``serialize`` of the result, rather than only ``deserialize``.
+    :return: The results, with times in seconds and memory in bytes.
+    """
+    module = 'dict_deserializer.deserializer'
+    deserialize = _require(module, 'deserialize')
+    if validating:
+        validate = _require(module, 'validate')
+
+        def plan(data):
+            return validate(case.rule, data)
+    elif roundtrip:
+        serialize = _require(module, 'serialize')
+
+        def plan(data):
+            return serialize(case.rule, deserialize(case.rule, data))
+    else:
+        def plan(data):
+            return deserialize(case.rule, data)
+    payload = case.payload
+    # Warm up: compiles everything the case needs.
+    plan(payload)
+
+    samples = []
+    gc.collect()
+    timer = time.perf_counter
+    end = timer() + min_time
+    while len(samples) < min_calls or timer() < end:
+        start = timer()
+        plan(payload)
+        samples.append(timer() - start)
+    samples.sort()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        plan(payload)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    mean = sum(samples) / len(samples)
+    return {
+        'description': case.description,
+        'objects': case.objects,
+        'calls': len(samples),
+        'throughput': case.objects / mean,
+        'mean': mean,
+        'p50': percentile(samples, 50),
+        'p90': percentile(samples, 90),
+        'p99': percentile(samples, 99),
+        'peak_memory': peak,
+    }
+
+
+def revision(path: Optional[str] = None) -> Optional[str]:
+    """
+    Returns a description of the git revision checked out at path (by
+    default the current directory), if any.
+    """
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'], cwd=path,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names: Optional[List[str]] = None, scale: int = 1,
+        min_time: float = 1.0, options: Sequence[str] = (),
+        validating: bool = False, roundtrip: bool = False,
+        library: Optional[str] = None, report=print) -> dict:
+    """
+    Runs the suite.
+
+    :param names: (Optionally) the names of the cases to run.
+    :param scale: Multiplies the size of the payloads.
+    :param min_time: The minimal amount of seconds to time each case.
+    :param options: The optional features to enable, see ``OPTIONS``.
+    :param validating: Whether to measure ``validate`` rather than
+        ``deserialize``.
+    :param roundtrip: Whether to measure ``deserialize`` followed by
+        ``serialize``, rather than only ``deserialize``.
+    :param library: (Optionally) the checkout to import dict_deserializer
+        from, instead of the current directory. E.g. a ``git worktree`` of
+        another revision.
+    :param report: Called with a line of text after every case.
+    :return: The results, which can be stored as JSON.
+    """
+    if library is not None:
+        if 'dict_deserializer' in sys.modules:
+            raise ValueError('dict_deserializer was already imported.')
+        sys.path.insert(0, os.path.abspath(library))
+
+    for option in options:
+        _require(OPTIONS[option], 'enable')()
+
+    # Imports the library.
+    from benchmarks.cases import get_cases
+    if validating:
+        _require('dict_deserializer.deserializer', 'validate')
+    elif roundtrip:
+        _require('dict_deserializer.deserializer', 'serialize')
+
+    cases = get_cases(scale)
+    if names:
+        unknown = set(names) - {case.name for case in cases}
+        if unknown:
+            raise ValueError('Unknown cases: {}'.format(
+                ', '.join(sorted(unknown))))
+        cases = [case for case in cases if case.name in names]
+
+    results = {
+        'revision': revision(library),
+        'python': platform.python_implementation() + ' ' +
+        platform.python_version(),
+        'scale': scale,
+        'options': sorted(options),
+        'function': 'validate' if validating else
+        'roundtrip' if roundtrip else 'deserialize',
+        'cases': {},
+    }
+    report('{:<12} {:>14} {:>10} {:>10} {:>10} {:>10}'.format(
+        'case', 'objects/s', 'p50 ms', 'p90 ms', 'p99 ms', 'peak KiB'))
+    for case in cases:
+        try:
+            result = measure(case, min_time, validating=validating,
+                             roundtrip=roundtrip)
+        except Exception as e:
+            # E.g. a case that an older revision does not support.
+            message = '{}: {}'.format(type(e).__name__, e)
+            if len(message) > _max_error:
+                message = message[:_max_error - 3] + '...'
+            results['cases'][case.name] = {
+                'description': case.description,
+                'objects': case.objects,
+                'error': message,
+            }
+            report('{:<12} failed: {}'.format(case.name, message))
+            continue
+        results['cases'][case.name] = result
+        report('{:<12} {:>14.0f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.1f}'
+               .format(case.name, result['throughput'],
+                       result['p50'] * 1000, result['p90'] * 1000,
+                       result['p99'] * 1000, result['peak_memory'] / 1024))
+    return results
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1,
+            report=print) -> List[str]:
+    """
+    Compares the results of two runs.
+
+    A case regressed when it got slower by more than threshold, when its
+    peak memory grew by more than threshold (both are marked separately),
+    or when it failed in the new run only.
+
+    :param old: The results of the baseline run.
+    :param new: The results of the run to check.
+    :param threshold: The relative slowdown (or growth in peak memory) above
+        which a case counts as a regression.
+    :param report: Called with every line of the comparison.
+    :return: The names of the cases that regressed.
+    """
+    regressions = []
+    report('{} {} -> {} {}'.format(
+        old.get('revision'), old.get('options', []),
+        new.get('revision'), new.get('options', [])))
+    report('{:<12} {:>14} {:>14} {:>9} {:>9} {:>9}'.format(
+        'case', 'old objects/s', 'new objects/s', 'speed', 'p99', 'memory'))
+
+    for name, n in new['cases'].items():
+        o = old['cases'].get(name)
+        if o is None:
+            report('{:<12} (new case)'.format(name))
+            continue
+        if 'error' in n:
+            if 'error' not in o:
+                regressions.append(name)
+            report('{:<12} (failed in the new run: {})'.format(
+                name, n['error']))
+            continue
+        if 'error' in o:
+            report('{:<12} (failed in the old run: {})'.format(
+                name, o['error']))
+            continue
+
+        changes = _changes(o, n)
+        marks = []
+        if changes['throughput'] < -threshold:
+            marks.append('SLOWER')
+        if changes['peak_memory'] > threshold:
+            marks.append('MORE MEMORY')
+        if marks:
+            regressions.append(name)
+        report('{:<12} {:>14.0f} {:>14.0f} {:>+8.1%} {:>+8.1%} {:>+8.1%}{}'
+               .format(name, o['throughput'], n['throughput'],
+                       changes['throughput'], changes['p99'],
+                       changes['peak_memory'],
+                       ''.join('  ' + mark for mark in marks)))
+    return regressions
+
+
+def _changes(old: dict, new: dict) -> Dict[str, float]:
+    changes = {}
+    for k in ('throughput', 'p99', 'peak_memory'):
+        changes[k] = new[k] / old[k] - 1 if old[k] else 0.0
+    return changes
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(results: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
@@ -0,0 +1,70 @@
+"""
+Throughput of deserializing from several threads at once.
+
+Every thread deserializes the same payloads, so after the first call all
+threads only read the shared caches. On a regular CPython build the threads
+take turns holding the GIL, so the total throughput should stay about the
+same as with one thread. On a free-threaded build, it should scale with the
+number of threads.
+"""
+import argparse
+import sys
+import threading
+import time
+from typing import List
+
+from dict_deserializer.deserializer import deserialize, Rule
+from benchmarks.directory import make_directory, make_users
+from test_DirectoryExample import Object, User
+
+
+def measure(threads: int, rule: Rule, payload, number: int) -> float:
+    """
+    Returns the amount of seconds it takes for the given number of threads
+    to deserialize payload number times each.
+    """
+    barrier = threading.Barrier(threads + 1)
+
+    def _run():
+        barrier.wait()
+        for _ in range(number):
+            deserialize(rule, payload)
+
+    workers = [threading.Thread(target=_run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def run(max_threads: int = 8, number: int = 20):
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('GIL enabled: {}'.format(gil))
+
+    cases = (
+        ('directory', Rule(Object), make_directory(10, 50), 1 + 10 * 51),
+        ('user list', Rule(List[User]), make_users(500), 500),
+    )
+    for title, rule, payload, objects in cases:
+        # Compile everything up front.
+        deserialize(rule, payload)
+        print(title)
+        threads = 1
+        while threads <= max_threads:
+            elapsed = measure(threads, rule, payload, number)
+            print('  {} thread(s): {:.0f} objects/s'.format(
+                threads, threads * number * objects / elapsed))
+            threads *= 2
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8,
+                        help='The maximum number of threads.')
+    parser.add_argument('--number', type=int, default=20,
+                        help='The number of payloads per thread.')
+    args = parser.parse_args()
+    run(args.threads, args.number)
@@ -0,0 +1,190 @@
+"""
+Adaptive ordering of Union arguments and candidate subclasses.
+
+Normally, the arguments of a Union and the candidate subclasses of a class
+are tried in the order they were declared. When adaptive ordering is
+enabled, the argument or class that matched last time is tried first, for
+data of the same shape: dicts with the same set of keys, or other values of
+the same type. This helps when most data matches an argument or subclass
+that was declared last.
+
+Example::
+
+    from dict_deserializer import adaptive
+
+    adaptive.enable(size=4096)
+
+Note that when data matches several arguments or subclasses, the one that
+matched before is used, rather than the one that was declared first. Errors
+are reported exactly like they are without adaptive ordering.
+"""
+from collections import OrderedDict
+from sys import version_info
+from typing import Hashable, Union
+
+from dict_deserializer import deserializer
+from dict_deserializer.deserializer import Deserializable, _candidates, \
+    _clear_plans, _compile_check, _compile_class, _compile_union, \
+    _get_handler, _Handler, _Mismatch, _Path
+
+if version_info.minor >= 10:
+    from types import UnionType
+
+
+class _Winners:
+    """
+    A bounded LRU mapping from ``(type, shape)`` to what matched last.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.entries = OrderedDict()
+
+    def get(self, key: Hashable):
+        try:
+            value = self.entries[key]
+            self.entries.move_to_end(key)
+        except KeyError:
+            # Also raised when another thread evicted key in between.
+            return None
+        return value
+
+    def put(self, key: Hashable, value):
+        entries = self.entries
+        entries[key] = value
+        try:
+            entries.move_to_end(key)
+            while len(entries) > self.size:
+                entries.popitem(last=False)
+        except KeyError:
+            pass
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# The _Winners that are tracked while enabled, or None.
+_winners = None
+
+
+def enable(size: int = 4096):
+    """
+    Enables adaptive ordering.
+
+    :param size: The maximal amount of (type, shape) pairs to remember.
+    """
+    global _winners
+    if size < 1:
+        raise ValueError('size must be at least 1.')
+
+    # noinspection PyProtectedMember
+    with deserializer._lock:
+        _winners = _Winners(size)
+        _set_factories(_compile_adaptive_union, _compile_adaptive_class)
+
+
+def disable():
+    """
+    Disables adaptive ordering again, and forgets what matched.
+    """
+    global _winners
+    # noinspection PyProtectedMember
+    with deserializer._lock:
+        _winners = None
+        _set_factories(_compile_union, _compile_class)
+
+
+def _set_factories(union_factory, class_factory):
+    # noinspection PyProtectedMember
+    deserializer._origin_factories[Union] = union_factory
+    if version_info.minor >= 10:
+        # noinspection PyProtectedMember
+        deserializer._origin_factories[UnionType] = union_factory
+    # noinspection PyProtectedMember
+    deserializer._class_factories[Deserializable] = class_factory
+    _clear_plans()
+
+
+def _shape(data) -> Hashable:
+    if isinstance(data, dict):
+        return frozenset(data)
+    return type(data)
+
+
+def _compile_adaptive_union(t) -> _Handler:
+    check = _compile_check(t)
+    args = t.__args__
+    handlers = [_get_handler(arg) for arg in args]
+    branches = [(i, arg, handler.plan)
+                for i, (arg, handler) in enumerate(zip(args, handlers))]
+    # The order to try the branches in, for every branch that matched last.
+    orders = [[branches[i]] + branches[:i] + branches[i + 1:]
+              for i in range(len(branches))]
+    winners = _winners
+
+    def _plan(data, try_all=True, key='[root]'):
+        if check(data):
+            return data
+
+        shape = (t, _shape(data))
+        first = winners.get(shape)
+        for i, arg, plan in branches if first is None else orders[first]:
+            try:
+                value = plan(data, try_all, key)
+            except TypeError:
+                # Raised by a validator further down.
+                pass
+            else:
+                if type(value) is not _Mismatch:
+                    if i != (first or 0):
+                        winners.put(shape, i)
+                    return value
+            # noinspection PyProtectedMember
+            if deserializer._observing:
+                # noinspection PyProtectedMember
+                deserializer._union_branch_failed(t, arg)
+        return _Mismatch('{} did not match any of {} for key <{}>.',
+                         type(data).__name__, args, _Path(key))
+
+    return _Handler('union', t, _plan, handlers)
+
+
+def _compile_adaptive_class(t) -> _Handler:
+    winners = _winners
+
+    def _plan(data, try_all=True, key='[root]'):
+        if isinstance(data, t):
+            return data
+
+        if not isinstance(data, dict):
+            return _Mismatch(
+                'Cannot deserialize non-dict into class instance '
+                'at <>.')
+
+        classes = _candidates(t, data, try_all)
+        if not try_all or len(classes) < 2:
+            # noinspection PyProtectedMember
+            return deserializer._instantiate(t, classes, data, try_all, key)
+
+        shape = (t, frozenset(data))
+        first = winners.get(shape)
+        if first is None or first is classes[0] or first not in classes:
+            ordered = classes
+        else:
+            ordered = [first] + [cls for cls in classes if cls is not first]
+
+        # noinspection PyProtectedMember
+        value = deserializer._instantiate(t, ordered, data, try_all, key)
+        if type(value) is _Mismatch:
+            if ordered is not classes:
+                # Report the same cause as trying them in order would.
+                # noinspection PyProtectedMember
+                value = deserializer._instantiate(t, classes, data, try_all,
+                                                  key)
+            return value
+
+        if type(value) is not (first or classes[0]):
+            winners.put(shape, type(value))
+        return value
+
+    return _Handler('class', t, _plan)
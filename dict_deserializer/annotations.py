@@ -75,7 +75,9 @@ def discriminate(key=None, value=_sentinel, matcher=None):
         if dc is None:
             return cls
 
-        cls._discriminators.append(dc)
+        # Assigning (rather than appending) lets the class drop any
+        # dispatch tables that depend on its discriminators.
+        cls._discriminators = cls._discriminators + [dc]
 
         return cls
     return _inner
@@ -95,6 +97,38 @@ def abstract(cls):
     return cls
 
 
+class ValidatedProperty(property):
+    """
+    The property created by ``@validated``. The value is stored per instance
+    in a private attribute (``_validated_<name>``), and the validator is
+    exposed so deserialization can call it directly.
+    """
+    def __init__(self, validator, default=None):
+        super(ValidatedProperty, self).__init__(
+            self._get, self._set, None, validator.__doc__)
+        self.validator = validator
+        self.default = default
+        self.storage = self.storage_name(validator.__name__)
+
+    @staticmethod
+    def storage_name(name: str) -> str:
+        """
+        Returns the name of the attribute that holds the value of the
+        validated property called name.
+        """
+        return '_validated_' + name
+
+    def __set_name__(self, owner, name):
+        self.storage = self.storage_name(name)
+
+    def _get(self, instance):
+        return getattr(instance, self.storage, self.default)
+
+    def _set(self, instance, value):
+        self.validator(instance, value)
+        setattr(instance, self.storage, value)
+
+
 def validated(default=None):
     """
     Used to decorate a validator function. Can be used if one would want to
@@ -105,15 +139,5 @@ def validated(default=None):
     :return: the wrapper function.
     """
     def _wrapper(fn):
-        # List is used because of stupid python scoping rules.
-        iv = [default]
-
-        def _getter(_):
-            return iv[0]
-
-        def _setter(self, val):
-            fn(self, val)
-            iv[0] = val
-
-        return property(fget=_getter, fset=_setter)
+        return ValidatedProperty(fn, default)
     return _wrapper
@@ -0,0 +1,263 @@
+"""
+Generates specialized Python source for deserializing into (and serializing)
+each Deserializable class.
+
+By default, a class is deserialized by looping over its field plans. When
+code generation is enabled, every class instead gets a straight-line function
+with the dict lookups, defaults and checks of primitive fields inlined, which
+calls the plans of nested types directly. Serializers are generated likewise,
+reading every field as a plain attribute. Both behave exactly the same
+either way.
+
+Example::
+
+    from dict_deserializer import codegen
+
+    codegen.enable()
+    print(codegen.get_source(User))
+"""
+import keyword
+import linecache
+from typing import Any, Callable, Optional, Tuple
+
+from dict_deserializer import deserializer
+from dict_deserializer.deserializer import Deserializable, Rule, _Mismatch, \
+    _Path, _accepted, _compile_builder, _compile_fields_serializer, \
+    _compile_serializer, _discriminated, _get_builder, _get_field_plans, \
+    _get_serializer, _is_union
+
+# Called with the class and the source of every generated function.
+_hook = None
+
+
+def enable(hook: Optional[Callable[[type, str], Any]] = None):
+    """
+    Enables code generation for all Deserializable classes.
+
+    :param hook: (Optionally) a function that is called with the class and
+        the generated source, every time source is generated. Useful for
+        debugging, e.g. ``enable(hook=lambda cls, source: print(source))``.
+    """
+    global _hook
+    _hook = hook
+    # noinspection PyProtectedMember
+    with deserializer._lock:
+        deserializer._builder_factory = generate_builder
+        deserializer._serializer_factory = generate_serializer
+        # noinspection PyProtectedMember
+        Deserializable._invalidate()
+
+
+def disable():
+    """
+    Disables code generation again.
+    """
+    global _hook
+    _hook = None
+    # noinspection PyProtectedMember
+    with deserializer._lock:
+        deserializer._builder_factory = _compile_builder
+        deserializer._serializer_factory = _compile_fields_serializer
+        # noinspection PyProtectedMember
+        Deserializable._invalidate()
+
+
+def get_source(cls: type) -> Optional[str]:
+    """
+    Returns the source that was generated for cls, or None when code
+    generation is disabled.
+    """
+    return getattr(_get_builder(cls), 'source', None)
+
+
+def get_serializer_source(cls: type, skip_defaults: bool = False) \
+        -> Optional[str]:
+    """
+    Returns the source of the serializer that was generated for cls, or None
+    when code generation is disabled.
+    """
+    return getattr(_get_serializer(cls, skip_defaults), 'source', None)
+
+
+def _is_name(attribute: str) -> bool:
+    return attribute.isidentifier() and not keyword.iskeyword(attribute)
+
+
+def _assignment(attribute: str, value: str) -> str:
+    if _is_name(attribute):
+        return 'instance.{} = {}'.format(attribute, value)
+    return 'setattr(instance, {!r}, {})'.format(attribute, value)
+
+
+def _lookup(attribute: str) -> str:
+    if _is_name(attribute):
+        return 'instance.{}'.format(attribute)
+    return 'getattr(instance, {!r})'.format(attribute)
+
+
+def generate_source(cls: type) -> Tuple[str, dict]:
+    """
+    Generates the source of the builder of cls.
+
+    :param cls: The Deserializable class.
+    :return: The source, and the globals it needs.
+    """
+    attrs = cls.get_attrs()
+    namespace = {
+        '_Mismatch': _Mismatch,
+        '_Path': _Path,
+        'new': cls.__new__,
+        'cls': cls,
+    }
+    lines = ['def build(data, try_all, key):']
+
+    fields = _get_field_plans(cls)
+    for i, (k, default, plan, validator, _) in enumerate(fields):
+        t = attrs[k].type
+        v = 'v{}'.format(i)
+        namespace['d{}'.format(i)] = default
+        lines.append('    # {!r}: {}'.format(k, str(t).replace('\n', ' ')))
+        lines.append('    {v} = data[{k!r}] if {k!r} in data else d{i}'
+                     .format(v=v, k=k, i=i))
+
+        accepted = _accepted(t)
+        if t is Any:
+            pass
+        elif accepted is not None and _is_union(t):
+            namespace['a{}'.format(i)] = accepted
+            namespace['args{}'.format(i)] = t.__args__
+            lines += [
+                '    if not isinstance({}, a{}):'.format(v, i),
+                '        return _Mismatch({!r}, type({}).__name__, args{}, '
+                '_Path((key, {!r})))'.format(
+                    '{} did not match any of {} for key <{}>.', v, i, k),
+            ]
+        elif accepted is not None and isinstance(t, type):
+            namespace['a{}'.format(i)] = accepted
+            lines += [
+                '    if not isinstance({}, a{}):'.format(v, i),
+                '        return _Mismatch({!r}, {!r}, type({}).__name__, '
+                '_Path((key, {!r})))'.format(
+                    'Expected something of type {}, but got type {} '
+                    'at <{}>.', Rule(t).error_string(), v, k),
+            ]
+        else:
+            namespace['p{}'.format(i)] = plan
+            lines += [
+                '    {v} = p{i}({v}, try_all, (key, {k!r}))'.format(
+                    v=v, i=i, k=k),
+                '    if type({}) is _Mismatch:'.format(v),
+                '        return {}'.format(v),
+            ]
+
+        if default is not None:
+            lines += [
+                '    if {} is None:'.format(v),
+                '        {} = d{}'.format(v, i),
+            ]
+
+    lines.append('    instance = new(cls)')
+    for i, (k, _, _, validator, attribute) in enumerate(fields):
+        if validator is not None:
+            namespace['f{}'.format(i)] = validator
+            lines.append('    f{}(instance, v{})'.format(i, i))
+        lines.append('    ' + _assignment(attribute, 'v{}'.format(i)))
+    lines.append('    return instance')
+
+    return '\n'.join(lines) + '\n', namespace
+
+
+def _exec(cls: type, source: str, namespace: dict, name: str,
+          kind: str) -> Callable[..., Any]:
+    """
+    Compiles source, and returns the function called name that it defines.
+    """
+    filename = '<dict_deserializer.codegen {} {}.{}>'.format(
+        kind, cls.__module__, cls.__qualname__)
+    exec(compile(source, filename, 'exec'), namespace)
+    # Makes the source show up in tracebacks.
+    linecache.cache[filename] = (len(source), None, source.splitlines(True),
+                                 filename)
+
+    function = namespace[name]
+    function.source = source
+    if _hook is not None:
+        _hook(cls, source)
+    return function
+
+
+def generate_builder(cls: type) -> Callable[..., Any]:
+    """
+    Generates, compiles and returns the builder of cls.
+    """
+    source, namespace = generate_source(cls)
+    return _exec(cls, source, namespace, 'build', 'builder')
+
+
+def generate_serializer_source(cls: type, skip_defaults: bool = False) \
+        -> Tuple[str, dict]:
+    """
+    Generates the source of the serializer of cls.
+
+    :param cls: The Deserializable class.
+    :param skip_defaults: Whether to leave out fields that are equal to
+        their default.
+    :return: The source, and the globals it needs.
+    """
+    attrs = cls.get_attrs()
+    namespace = {
+        # Used for instances of which not all fields are set.
+        'fallback': _compile_fields_serializer(cls, skip_defaults),
+    }
+    lines = [
+        'def serialize(instance):',
+        '    try:',
+    ]
+
+    fields = _get_field_plans(cls)
+    for i, (_, _, _, _, attribute) in enumerate(fields):
+        lines.append('        v{} = {}'.format(i, _lookup(attribute)))
+    lines += [
+        '    except AttributeError:',
+        '        return fallback(instance)',
+    ]
+
+    entries = []
+    for i, (k, v) in enumerate(_discriminated(cls).items()):
+        namespace['dk{}'.format(i)] = k
+        namespace['dv{}'.format(i)] = v
+        entries.append('dk{0}: dv{0}'.format(i))
+
+    values = []
+    for i, (k, default, _, _, _) in enumerate(fields):
+        v = 'v{}'.format(i)
+        serializer = _compile_serializer(attrs[k].type, skip_defaults)
+        if serializer is not None:
+            namespace['s{}'.format(i)] = serializer
+            v = 'None if {v} is None else s{i}({v})'.format(v=v, i=i)
+        values.append((i, k, default, v))
+
+    if not skip_defaults:
+        entries += ['{!r}: {}'.format(k, v) for _, k, _, v in values]
+        lines.append('    return {{{}}}'.format(', '.join(entries)))
+        return '\n'.join(lines) + '\n', namespace
+
+    lines.append('    result = {{{}}}'.format(', '.join(entries)))
+    for i, k, default, v in values:
+        namespace['d{}'.format(i)] = default
+        lines += [
+            '    if not (v{0} is d{0} or (type(v{0}) is type(d{0}) and '
+            'v{0} == d{0})):'.format(i),
+            '        result[{!r}] = {}'.format(k, v),
+        ]
+    lines.append('    return result')
+    return '\n'.join(lines) + '\n', namespace
+
+
+def generate_serializer(cls: type, skip_defaults: bool = False) \
+        -> Callable[[Any], dict]:
+    """
+    Generates, compiles and returns the serializer of cls.
+    """
+    source, namespace = generate_serializer_source(cls, skip_defaults)
+    return _exec(cls, source, namespace, 'serialize', 'serializer')
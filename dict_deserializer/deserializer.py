@@ -1,9 +1,24 @@
+import dis
+import os
+from contextlib import contextmanager
+from operator import attrgetter
+from string import Formatter
 from sys import version_info
+from threading import local, RLock
+from time import perf_counter
 from typeguard import check_type
-from typing import Optional, Union, List, Tuple, Dict, Any
+from types import MappingProxyType, MemberDescriptorType
+from typing import Optional, Union, List, Tuple, Dict, Any, Callable, \
+    Iterable, Mapping, Sequence
+
+from dict_deserializer.annotations import KeyValueDiscriminator, \
+    ValidatedProperty
+from dict_deserializer.observers import Observer
 
 if version_info.minor >= 8:
     from typing import get_origin
+if version_info.minor >= 10:
+    from types import UnionType
 
 
 def _type_to_str(t, default=None):
@@ -59,36 +74,258 @@ class Rule:
         return _type_to_str(self.type, default=self.__str__())
 
 
+# Guards all writes to the caches in this module: filling them and dropping
+# them. Reads do not take the lock, so deserializing never waits on it once
+# everything has been compiled. A cache is only filled while holding the lock,
+# and always dropped (while holding the lock) after the change that made it
+# stale, so a cache can never be filled with an outdated value.
+_lock = RLock()
+
+
+def _reset_lock():
+    global _lock
+    _lock = RLock()
+
+
+if hasattr(os, 'register_at_fork'):
+    # A forked child (e.g. a process pool worker) only has a copy of the
+    # calling thread, so the lock might be held by a thread that is gone.
+    os.register_at_fork(after_in_child=_reset_lock)
+
+
+class _Annotations(dict):
+    """
+    The merged annotations of a Deserializable class. Changing them
+    invalidates the cached field tables of the owning class and its
+    subclasses, and forwards the change to subclasses that do not declare
+    the annotation themselves.
+    """
+
+    def __init__(self, owner: 'DeserializableMeta', *args, **kwargs):
+        super(_Annotations, self).__init__(*args, **kwargs)
+        self.owner = owner
+
+    def __setitem__(self, key, value):
+        super(_Annotations, self).__setitem__(key, value)
+        # noinspection PyProtectedMember
+        self.owner._declared = self.owner._declared | {key}
+        self._changed(key)
+
+    def __delitem__(self, key):
+        super(_Annotations, self).__delitem__(key)
+        # noinspection PyProtectedMember
+        self.owner._declared = self.owner._declared - {key}
+        self._changed(key)
+
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *args):
+        if key not in self:
+            return super(_Annotations, self).pop(key, *args)
+        value = self[key]
+        del self[key]
+        return value
+
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+    def _changed(self, key):
+        with _lock:
+            for sc in self.owner.__subclasses__():
+                # noinspection PyProtectedMember
+                if key in getattr(sc, '_declared', (key,)):
+                    continue
+                annotations = sc.__dict__['__annotations__']
+                if key in self:
+                    dict.__setitem__(annotations, key, self[key])
+                elif key in annotations:
+                    dict.__delitem__(annotations, key)
+                annotations._changed(key)
+            self.owner._invalidate()
+
+
+def _own_annotations(cls: type) -> dict:
+    """
+    Returns the annotations declared on cls itself.
+    """
+    if version_info >= (3, 10):
+        return dict(cls.__annotations__)
+    return dict(cls.__dict__.get('__annotations__', {}))
+
+
+def _slot_names(bases: Tuple[type], namespace: dict) -> List[str]:
+    """
+    Returns the fields declared in namespace that need a slot, because none
+    of the bases provides storage for them yet.
+    """
+    names = list(namespace.get('__annotations__', {}))
+    for k, v in namespace.items():
+        if _is_valid(k, v) and k not in names:
+            names.append(k)
+
+    for k, v in namespace.items():
+        if isinstance(v, ValidatedProperty):
+            names.append(ValidatedProperty.storage_name(k))
+
+    result = []
+    for k in names:
+        if isinstance(namespace.get(k), property):
+            continue
+        if any(isinstance(getattr(b, k, None),
+                          (property, MemberDescriptorType))
+               for b in bases):
+            continue
+        result.append(k)
+    return result
+
+
 class DeserializableMeta(type):
     """
     Metaclass for all Deserializable
+
+    Accepts the class keyword ``slots``. When it is true, the fields of the
+    class are stored in ``__slots__`` instead of in the instance ``__dict__``,
+    which makes instances a lot smaller. The option is inherited by
+    subclasses, unless they pass ``slots=False``.
     """
 
     def __new__(
             mcs: 'DeserializableMeta', name: str, bases: Tuple[type],
-            namespace: dict) \
+            namespace: dict, slots: Optional[bool] = None, **kwargs) \
             -> type:
-        def auto_ctor(self, **kwargs):
-            for k, v in type(self).get_attrs().items():
+        def auto_ctor(*args, **kwargs):
+            """
+            Sets every field to the matching keyword argument, or None.
+
+            An attribute map (as returned by ``get_attrs()``) may be passed as
+            the only positional argument to avoid looking it up again.
+            """
+            if len(args) > 2:
+                raise TypeError('{}() takes at most 1 positional argument '
+                                '({} given)'.format(name, len(args) - 1))
+            self = args[0]
+            attrs = args[1] if len(args) > 1 else type(self).get_attrs()
+            for k in attrs:
                 setattr(self, k, kwargs.get(k))
 
+        if slots is None:
+            slots = any(getattr(b, '_slots', False) for b in bases)
+
         namespace['_discriminators'] = []
         namespace['_abstract'] = False
+        namespace['_attrs'] = None
+        namespace['_dispatch'] = None
+        namespace['_field_plans'] = None
+        namespace['_builder'] = None
+        namespace['_required'] = None
+        namespace['_field_validation'] = None
+        namespace['_projected'] = None
+        namespace['_field_table'] = None
+        namespace['_lazy_builder'] = None
+        namespace['_serializers'] = None
+        namespace['_slots'] = slots
+        namespace['_slot_defaults'] = {}
         namespace['__init__'] = auto_ctor
 
-        cls = type.__new__(mcs, name, bases, namespace)
+        if slots:
+            names = _slot_names(bases, namespace)
+            for k, v in list(namespace.items()):
+                # A slot can't have a class level value, so defaults are kept
+                # aside for get_attrs(). This includes new defaults for the
+                # slots of bases, which would otherwise hide them.
+                if k in names or _is_valid(k, v) and any(
+                        isinstance(getattr(b, k, None), MemberDescriptorType)
+                        for b in bases):
+                    namespace['_slot_defaults'][k] = namespace.pop(k)
+            namespace['__slots__'] = tuple(namespace.get('__slots__', ())) + \
+                tuple(names)
 
+        cls = type.__new__(mcs, name, bases, namespace, **kwargs)
+
+        own = _own_annotations(cls)
+        annotations = dict(own)
         for b in bases:
             if b is object:
                 continue
 
             if hasattr(b, '__annotations__'):
-                annotations = dict(b.__annotations__)
-                annotations.update(cls.__annotations__)
-                cls.__annotations__ = annotations
+                merged = dict(b.__annotations__)
+                merged.update(annotations)
+                annotations = merged
+
+        type.__setattr__(cls, '_declared', frozenset(own))
+        type.__setattr__(cls, '__annotations__',
+                         _Annotations(cls, annotations))
+
+        cls._invalidate_dispatch()
 
         return cls
 
+    def __init__(cls, name: str, bases: Tuple[type], namespace: dict,
+                 slots: Optional[bool] = None, **kwargs):
+        super(DeserializableMeta, cls).__init__(name, bases, namespace,
+                                                **kwargs)
+
+    def __setattr__(cls, key, value):
+        if key == '__annotations__':
+            value = _Annotations(cls, value)
+            type.__setattr__(cls, '_declared', frozenset(value))
+        type.__setattr__(cls, key, value)
+        if key == '__annotations__' or not key.startswith('_'):
+            cls._invalidate()
+        elif key in ('_abstract', '_discriminators'):
+            cls._invalidate_dispatch()
+            if key == '_discriminators':
+                # Serializers write the values of discriminators.
+                cls._invalidate()
+
+    def __delattr__(cls, key):
+        type.__delattr__(cls, key)
+        if not key.startswith('_'):
+            cls._invalidate()
+
+    def _invalidate(cls):
+        """
+        Drops the cached field tables of this class and all of its
+        subclasses. They will be recomputed on their next use.
+        """
+        with _lock:
+            type.__setattr__(cls, '_attrs', None)
+            type.__setattr__(cls, '_field_plans', None)
+            type.__setattr__(cls, '_builder', None)
+            type.__setattr__(cls, '_required', None)
+            type.__setattr__(cls, '_field_validation', None)
+            type.__setattr__(cls, '_projected', None)
+            type.__setattr__(cls, '_field_table', None)
+            type.__setattr__(cls, '_lazy_builder', None)
+            type.__setattr__(cls, '_serializers', None)
+            for sc in cls.__subclasses__():
+                sc._invalidate()
+
+    def _invalidate_dispatch(cls):
+        """
+        Drops the cached dispatch indexes of this class and all of its
+        (Deserializable) bases, since these depend on the subclass tree.
+        """
+        with _lock:
+            for c in cls.__mro__:
+                if isinstance(c, DeserializableMeta):
+                    type.__setattr__(c, '_dispatch', None)
+
 
 def _rbase(cls: type, ls: List[type] = None) -> List[type]:
     """
@@ -114,6 +351,7 @@ def _is_valid(key: str, value) -> bool:
     """
     return not key.startswith('_') and \
            not callable(value) and \
+           not isinstance(value, MemberDescriptorType) and \
            not isinstance(value, classmethod) and \
            not isinstance(value, staticmethod) and \
            not isinstance(value, property)
@@ -122,20 +360,58 @@ def _is_valid(key: str, value) -> bool:
 class Deserializable(metaclass=DeserializableMeta):
     """
     Base class for all automagically deserializing classes.
+
+    Pass ``slots=True`` in the class definition (``class User(Deserializable,
+    slots=True)``) to store fields in ``__slots__``.
     """
 
+    # Holds the fields that deserialize(..., lazy=True) deferred, if any.
+    __slots__ = ('_lazy',)
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, which includes the
+        # fields that deserialize(..., lazy=True) deferred.
+        return _resolve_deferred(self, name)
+
+    def to_dict(self, skip_defaults: bool = False) -> dict:
+        """
+        Converts this instance back into a dict, see ``serialize``.
+
+        :param skip_defaults: Whether to leave out fields that are equal to
+            their default.
+        :return: A dict that deserializes into an equal instance.
+        """
+        return _get_serializer(type(self), skip_defaults)(self)
+
     @classmethod
-    def get_attrs(cls) -> Dict[str, Rule]:
+    def get_attrs(cls) -> Mapping[str, Rule]:
         """
         Returns a list of all type rules for the given class.
 
-        :return: a dict from property to type rule.
+        The result is computed once and cached until the class (or one of its
+        bases) changes.
+
+        :return: a read-only mapping from property to type rule.
         """
+        attrs = cls.__dict__['_attrs']
+        if attrs is None:
+            with _lock:
+                attrs = cls.__dict__['_attrs']
+                if attrs is None:
+                    attrs = MappingProxyType(cls._compute_attrs())
+                    type.__setattr__(cls, '_attrs', attrs)
+        return attrs
+
+    @classmethod
+    def _compute_attrs(cls) -> Dict[str, Rule]:
         fields = {}
         defaults = {}
         rl = list(reversed(_rbase(cls)))
         rl.append(cls)
         for c in rl:
+            for k, v in c.__dict__.get('_slot_defaults', {}).items():
+                defaults[k] = v
+                fields[k] = Rule(Optional[type(v)], default=v)
             for k in c.__dict__:
                 if isinstance(c.__dict__[k], property):
                     fields[k] = Rule(Any)
@@ -156,6 +432,120 @@ class Deserializable(metaclass=DeserializableMeta):
         return fields
 
 
+class _DispatchIndex:
+    """
+    Precomputed subclass lookup for a Deserializable class.
+
+    Subclasses with a ``KeyValueDiscriminator`` are indexed on their
+    ``(key, value)`` pair, so the common "type tag" pattern costs a hash
+    lookup. Subclasses that are discriminated otherwise are checked linearly.
+    """
+
+    def __init__(self, cls: type):
+        self.own = () if getattr(cls, '_abstract', True) else (cls,)
+        # noinspection PyProtectedMember
+        self.subclasses = [sc for sc in cls.__subclasses__()
+                           if hasattr(sc, '_discriminators')]
+        self.always = []
+        self.linear = []
+        self.by_value = {}
+
+        for i, sc in enumerate(self.subclasses):
+            # noinspection PyProtectedMember
+            discriminators = list(sc._discriminators)
+            if not discriminators:
+                self.always.append(i)
+                continue
+
+            for j, dc in enumerate(discriminators):
+                if isinstance(dc, KeyValueDiscriminator) and dc.has_value:
+                    try:
+                        entries = self.by_value.setdefault(
+                            (dc.key, dc.value), [])
+                    except TypeError:
+                        # Unhashable value
+                        continue
+                    entries.append((i, discriminators[:j] +
+                                    discriminators[j + 1:]))
+                    break
+            else:
+                self.linear.append((i, discriminators))
+
+        self.keys = tuple({key: None for key, _ in self.by_value})
+        self.static = not self.linear and not self.by_value and \
+            all(_get_dispatch(sc).static for sc in self.subclasses)
+        if self.static:
+            candidates = []
+            for sc in self.subclasses:
+                candidates.extend(_get_dispatch(sc).candidates)
+            candidates.extend(self.own)
+            self.candidates = tuple(candidates)
+
+    def match(self, d: dict) -> List[type]:
+        """
+        Returns the direct subclasses whose discriminators all match d, in
+        the order they were defined.
+        """
+        matched = list(self.always)
+        for i, discriminators in self.linear:
+            for discriminator in discriminators:
+                if not discriminator.check(d):
+                    break
+            else:
+                matched.append(i)
+
+        for key in self.keys:
+            if key not in d:
+                continue
+            try:
+                entries = self.by_value.get((key, d[key]))
+            except TypeError:
+                # Unhashable values never equal a discriminator value.
+                continue
+            if not entries:
+                continue
+            for i, discriminators in entries:
+                for discriminator in discriminators:
+                    if not discriminator.check(d):
+                        break
+                else:
+                    matched.append(i)
+
+        if len(matched) > 1:
+            matched.sort()
+        return [self.subclasses[i] for i in matched]
+
+
+def _get_dispatch(cls: type) -> _DispatchIndex:
+    """
+    Returns the (cached) dispatch index of cls.
+    """
+    index = cls.__dict__.get('_dispatch')
+    if index is None:
+        with _lock:
+            index = cls.__dict__.get('_dispatch')
+            if index is None:
+                index = _DispatchIndex(cls)
+                type.__setattr__(cls, '_dispatch', index)
+    return index
+
+
+def _candidates(t: type, d: dict, try_all: bool) -> Sequence[type]:
+    index = _get_dispatch(t)
+    if index.static:
+        return index.candidates
+
+    candidates = []
+    for sc in index.match(d):
+        try:
+            candidates.extend(_candidates(sc, d, try_all))
+        except TypeError as e:
+            if not try_all:
+                raise e
+    candidates.extend(index.own)
+    return candidates
+
+
 def get_deserialization_classes(t, d, try_all=True) -> List[type]:
     """
     Find all candidates that are a (sub)type of t, matching d.
@@ -165,172 +555,2370 @@ def get_deserialization_classes(t, d, try_all=True) -> List[type]:
     :param try_all: Whether to support automatic discrimination.
     :return: an ordered list of candidate classes to deserialize into.
     """
-    candidates = []
-    for sc in t.__subclasses__():
-        if hasattr(sc, '_discriminators'):
-            # noinspection PyProtectedMember
-            for discriminator in sc._discriminators:
-                if not discriminator.check(d):
-                    # Invalid
-                    break
-            else:
-                # All were valid
-                try:
-                    candidates.extend(
-                        get_deserialization_classes(sc, t, try_all))
-                except TypeError as e:
-                    if not try_all:
-                        raise e
-    if not getattr(t, '_abstract', True):
-        candidates.append(t)
+    return list(_candidates(t, d, try_all))
 
-    return candidates
+
+def _get_origin(t):
+    """
+    Returns the unsubscripted version of a typing construct, like list for
+    ``List[int]`` and Union for ``Optional[int]``, or None for anything else.
+    """
+    if version_info.minor >= 8:
+        return get_origin(t)
+    origin = getattr(t, '__origin__', None)
+    if origin is List:
+        return list
+    if origin is Dict:
+        return dict
+    if origin is Tuple:
+        return tuple
+    return origin
+
+
+def _is_union(t) -> bool:
+    origin = _get_origin(t)
+    return origin is Union or \
+        (version_info.minor >= 10 and origin is UnionType)
 
 
-def deserialize(rule: Rule, data, try_all: bool = True, key: str = '[root]'):
+def _is_dict(t) -> bool:
+    return _get_origin(t) is dict
+
+
+def _is_list(t) -> bool:
+    return _get_origin(t) is list
+
+
+def _is_tuple(t) -> bool:
+    return _get_origin(t) is tuple
+
+
+class _Path:
     """
-    Converts the passed in data into a type that is compatible with rule.
+    Formats a path that was built lazily while deserializing.
 
-    :param rule:
-    :param data:
-    :param try_all: Whether to attempt other subtypes when a TypeError has
-        occurred. This is useful when automatically deriving discriminators.
-    :param key: Used for exceptions and error reporting. Preferrably the full
-        path to the current value.
-    :return: An instance matching Rule.
+    Paths are either the root key, or a ``(parent, segment)`` tuple. They are
+    only turned into a dotted string (like ``[root].members.0.name``) when an
+    error message is formatted.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def segments(self) -> tuple:
+        path = self.path
+        segments = []
+        while type(path) is tuple:
+            path, segment = path
+            segments.append(segment)
+        segments.append(path)
+        return tuple(reversed(segments))
+
+    def __str__(self):
+        return '.'.join(str(segment) for segment in self.segments())
+
+
+# The number of nested causes that are written out in full, when a mismatch
+# is formatted.
+_max_causes = 32
+
+
+class _Mismatch:
+    """
+    Returned by plans (instead of raising a TypeError) when the data does not
+    match. The message is only formatted when it is actually needed.
+    """
+
+    def __init__(self, message: str, *args):
+        self.message = message
+        self.args = args
+
+    def __str__(self):
+        # Causes are nested as deeply as the data (see
+        # dict_deserializer.iterative), so they are written out using an
+        # explicit stack. Beyond _max_causes, only the innermost cause is.
+        formatter = Formatter()
+        parts = []
+        stack = [(self, 0)]
+        while stack:
+            item, depth = stack.pop()
+            if type(item) is not _Mismatch:
+                parts.append(item)
+                continue
+
+            if depth == _max_causes:
+                omitted = 0
+                while True:
+                    causes = [arg for arg in item.args
+                              if type(arg) is _Mismatch]
+                    if len(causes) != 1:
+                        break
+                    item = causes[0]
+                    omitted += 1
+                if omitted:
+                    parts.append('({} nested causes omitted) '
+                                 .format(omitted))
+
+            pieces = []
+            index = 0
+            for literal, field, spec, conversion in \
+                    formatter.parse(item.message):
+                pieces.append((literal, depth))
+                if field is None:
+                    continue
+                if field:
+                    arg = item.args[int(field)]
+                else:
+                    arg = item.args[index]
+                    index += 1
+                if type(arg) is _Mismatch and not spec and not conversion:
+                    pieces.append((arg, depth + 1))
+                else:
+                    pieces.append((formatter.format_field(
+                        formatter.convert_field(arg, conversion), spec),
+                        depth))
+            stack.extend(reversed(pieces))
+        return ''.join(parts)
+
+    def error(self) -> TypeError:
+        return TypeError(str(self))
+
+
+def _always(_) -> bool:
+    return True
+
+
+def _never(_) -> bool:
+    return False
+
+
+def _native_type(t) -> Optional[Tuple[type, ...]]:
+    """
+    Returns the classes accepted for t if it is checked natively, or None.
+    """
+    try:
+        return _native_types.get(t)
+    except TypeError:
+        return None
+
+
+def _typeguard_check(t) -> Callable[[Any], bool]:
+    def _check(value) -> bool:
+        try:
+            check_type('value', value, t)
+            return True
+        except TypeError:
+            return False
+
+    return _check
+
+
+def _accepted(t):
+    """
+    Returns the classes accepted for t if its check can be inlined: for
+    natively checked types, and for unions of those. Types with a registered
+    handler are never inlined.
+    """
+    if not _is_union(t):
+        accepted = _native_type(t)
+        if accepted is None or _get_handler(t).tag != 'terminal':
+            return None
+        return accepted
+
+    if _get_handler(t).tag != 'union':
+        return None
+    accepted = ()
+    for arg in t.__args__:
+        arg_accepted = _native_type(arg)
+        if arg_accepted is None or _get_handler(arg).tag != 'terminal':
+            return None
+        accepted += arg_accepted
+    return accepted
+
+
+# Types that are checked natively, mapped to the classes that are accepted
+# for them. These match typeguard: bool is a subclass of int, so it is
+# accepted for int (and for float and complex, which accept ints as well),
+# but an int is never accepted for bool.
+_native_types = {
+    int: (int,),
+    float: (int, float),
+    complex: (int, float, complex),
+    bool: (bool,),
+    str: (str,),
+    dict: (dict,),
+    list: (list,),
+    type(None): (type(None),),
+    None: (type(None),),
+}
+
+# Type checks, keyed on the type they check for.
+_checks = {}
+
+
+def _compile_check(t) -> Callable[[Any], bool]:
+    """
+    Returns a (cached) predicate that tells whether a value already is of
+    type t, without raising. It agrees with typeguard's ``check_type``.
     """
-    # Deserialize primitives
     try:
-        return rule.validate(key, data)
+        return _checks[t]
+    except KeyError:
+        pass
     except TypeError:
+        return _compile_check_uncached(t)
+
+    with _lock:
+        check = _checks.get(t)
+        if check is None:
+            check = _compile_check_uncached(t)
+            _checks[t] = check
+    return check
+
+
+def _compile_check_uncached(t) -> Callable[[Any], bool]:
+    if t is Any:
+        return _always
+
+    accepted = _native_type(t)
+    if accepted is not None:
+        return lambda value: isinstance(value, accepted)
+
+    if _is_union(t):
+        checks = [_compile_check(arg) for arg in t.__args__]
+
+        def _check_union(value) -> bool:
+            for check in checks:
+                if check(value):
+                    return True
+            return False
+
+        return _check_union
+
+    args = getattr(t, '__args__', None)
+
+    if _is_list(t):
+        if not args:
+            return lambda value: isinstance(value, list)
+        item_check = _compile_check(args[0])
+
+        def _check_list(value) -> bool:
+            if not isinstance(value, list):
+                return False
+            for v in value:
+                if not item_check(v):
+                    return False
+            return True
+
+        return _check_list
+
+    if _is_dict(t):
+        if not args:
+            return lambda value: isinstance(value, dict)
+        key_check = _compile_check(args[0])
+        value_check = _compile_check(args[1])
+
+        def _check_dict(value) -> bool:
+            if not isinstance(value, dict):
+                return False
+            for k, v in value.items():
+                if not key_check(k) or not value_check(v):
+                    return False
+            return True
+
+        return _check_dict
+
+    if _is_tuple(t) and args is not None:
+        if len(args) == 2 and args[1] is Ellipsis:
+            item_check = _compile_check(args[0])
+
+            def _check_variadic_tuple(value) -> bool:
+                if not isinstance(value, tuple):
+                    return False
+                for v in value:
+                    if not item_check(v):
+                        return False
+                return True
+
+            return _check_variadic_tuple
+
+        if args == ((),):
+            args = ()
+        item_checks = [_compile_check(arg) for arg in args]
+
+        def _check_tuple(value) -> bool:
+            if not isinstance(value, tuple) or \
+                    len(value) != len(item_checks):
+                return False
+            for check, v in zip(item_checks, value):
+                if not check(v):
+                    return False
+            return True
+
+        return _check_tuple
+
+    if isinstance(t, type) and issubclass(t, Deserializable):
+        return lambda value: isinstance(value, t)
+
+    return _typeguard_check(t)
+
+
+class _Handler:
+    """
+    The compiled form of a type: its plan, tagged with the kind of type it
+    handles ('union', 'dict', 'list', 'tuple', 'class', 'terminal' or
+    'custom'), and the handlers of its type arguments.
+
+    Plans are functions ``plan(data, try_all, key)`` that return a _Mismatch
+    rather than raising when the data does not match. ``nested`` tells
+    whether values of the type can hold class instances, which are the only
+    values that can be nested arbitrarily deep.
+    """
+
+    def __init__(self, tag: str, t, plan: Callable[..., Any],
+                 args: Sequence['_Handler'] = ()):
+        self.tag = tag
+        self.type = t
+        self.plan = plan
+        self.args = tuple(args)
+        self.nested = tag == 'class' or any(arg.nested for arg in self.args)
+
+    def __repr__(self):
+        return '_Handler(tag={}, type={})'.format(self.tag, self.type)
+
+
+# Compiled handlers, keyed on the type they deserialize into.
+_handlers = {}
+# Plans as handed out by compile_deserializer, which do raise. Keyed on the
+# type, or on the factory of the plan and its arguments for projected and
+# lazy plans.
+_entry_plans = {}
+
+
+def compile_deserializer(rule, only: Optional[Iterable[str]] = None,
+                         lazy: bool = False, interner=None) \
+        -> Callable[..., Any]:
+    """
+    Compiles a rule into a reusable deserialization plan.
+
+    The plan is a function ``plan(data, try_all=True, key='[root]')`` that
+    behaves exactly like ``deserialize(rule, data, try_all, key, only=only,
+    lazy=lazy, interner=interner)``. Plans are cached on the type they
+    deserialize into (and the options), so compiling the same type twice is
+    cheap.
+
+    :param rule: The rule (or type) to compile.
+    :param only: (Optionally) the paths of the fields to deserialize, see
+        ``deserialize``.
+    :param lazy: Whether to defer nested fields, see ``deserialize``.
+    :param interner: (Optionally) the ``Interner`` to pass strings through,
+        see ``dict_deserializer.interning``.
+    :return: A function that deserializes data into something matching rule.
+    """
+    rule = Rule.to_rule(rule)
+    if interner is not None:
+        if lazy or only is not None:
+            raise ValueError('An interner can not be combined with only or '
+                             'lazy.')
+        # The interner caches its own plans.
+        # noinspection PyProtectedMember
+        return _entry_plan(interner._get_plan(rule.type), rule.default)
+    if lazy:
+        if only is not None:
+            raise ValueError('only and lazy can not be combined.')
+        factory, args = _compile_lazy, (rule.type,)
+        cache_key = (factory, rule.type)
+    elif only is not None:
+        factory, args = _compile_checked_projection, \
+            (rule.type, _parse_projection(only))
+        cache_key = (factory,) + args
+    else:
+        factory, args = _compile, (rule.type,)
+        cache_key = rule.type
+
+    if rule.default is None:
+        try:
+            return _entry_plans[cache_key]
+        except KeyError:
+            pass
+        except TypeError:
+            return _entry_plan(factory(*args), None)
+
+        with _lock:
+            plan = _entry_plans.get(cache_key)
+            if plan is None:
+                plan = _entry_plan(factory(*args), None)
+                _entry_plans[cache_key] = plan
+        return plan
+    return _entry_plan(factory(*args), rule.default)
+
+
+def _entry_plan(plan: Callable[..., Any], default) -> Callable[..., Any]:
+
+    def _plan(data, try_all=True, key='[root]'):
+        value = plan(data, try_all, key)
+        if type(value) is _Mismatch:
+            raise value.error()
+        if value is None:
+            return default
+        return value
+
+    return _plan
+
+
+def _compile(t) -> Callable[..., Any]:
+    """
+    Returns the (cached) plan for type t.
+    """
+    return _get_handler(t).plan
+
+
+def _get_handler(t) -> _Handler:
+    """
+    Returns the (cached) handler for type t.
+    """
+    try:
+        return _handlers[t]
+    except KeyError:
         pass
+    except TypeError:
+        # Unhashable type arguments, these can't be cached.
+        return _compile_handler(t)
+
+    with _lock:
+        handler = _handlers.get(t)
+        if handler is None:
+            handler = _compile_handler(t)
+            _handlers[t] = handler
+    return handler
+
+
+def _compile_handler(t) -> _Handler:
+    factory = None
+    origin = _get_origin(t)
+    if origin is not None:
+        try:
+            factory = _origin_factories.get(origin)
+        except TypeError:
+            pass
+    elif isinstance(t, type):
+        for base in t.__mro__:
+            factory = _class_factories.get(base)
+            if factory is not None:
+                break
+
+    if factory is None:
+        factory = _compile_terminal
+    return factory(t)
+
+
+def _compile_terminal(t) -> _Handler:
+    error_string = Rule(t).error_string()
+    is_type = isinstance(t, type)
+
+    accepted = _native_type(t)
+    if accepted is not None:
+        def _native_plan(data, try_all=True, key='[root]'):
+            if isinstance(data, accepted):
+                return data
+
+            if not is_type:
+                return _Mismatch('{!r} is not a type!', t)
+            return _Mismatch('Expected something of type {}, but got type {} '
+                             'at <{}>.', error_string, type(data).__name__,
+                             _Path(key))
 
-    # Deserialize type unions
-    if type(rule.type) is type(Union):
-        for arg in rule.type.__args__:
+        return _Handler('terminal', t, _native_plan)
+
+    check = _compile_check(t)
+
+    def _plan(data, try_all=True, key='[root]'):
+        if check(data):
+            return data
+
+        if not is_type:
+            return _Mismatch('{!r} is not a type!', t)
+        return _Mismatch('Expected something of type {}, but got type {} '
+                         'at <{}>.', error_string, type(data).__name__,
+                         _Path(key))
+
+    return _Handler('terminal', t, _plan)
+
+
+def _compile_union(t) -> _Handler:
+    handlers = [_get_handler(arg) for arg in t.__args__]
+    return _Handler('union', t,
+                    _union_plan(t, [handler.plan for handler in handlers]),
+                    handlers)
+
+
+def _union_plan(t, plans: Sequence[Callable[..., Any]],
+                rebuild: bool = False) -> Callable[..., Any]:
+    """
+    Returns the plan for Union t, which tries the plans of its arguments.
+    Data that already matches t is returned as is, unless rebuild is true.
+    It is then rebuilt by the plan of the first argument it matches.
+    """
+    check = _compile_check(t)
+    args = t.__args__
+    branches = list(zip(args, plans))
+    if rebuild:
+        matches = [(_compile_check(arg), plan) for arg, plan in branches]
+
+    def _plan(data, try_all=True, key='[root]'):
+        if check(data):
+            if not rebuild:
+                return data
+            for arg_check, plan in matches:
+                if arg_check(data):
+                    try:
+                        value = plan(data, try_all, key)
+                    except TypeError:
+                        return data
+                    return data if type(value) is _Mismatch else value
+            return data
+
+        for arg, plan in branches:
             try:
-                v = deserialize(Rule(arg), data, try_all, key)
-                if v is None:
-                    v = rule.default
-                return v
+                value = plan(data, try_all, key)
             except TypeError:
+                # Raised by a validator further down.
                 pass
-        raise TypeError('{} did not match any of {} for key <{}>.'
-                        .format(type(data).__name__, rule.type.__args__, key))
-
-    # Deserialize dicts
-    if (version_info.minor >= 8 and get_origin(rule.type) == dict) or \
-        (version_info.minor < 8 and type(rule.type) is type(Dict) and getattr(rule.type, "__origin__", None) == Dict):
-        if len(rule.type.__args__) != 2:
-            raise TypeError('Cannot handle dicts with 0, 1 or more than two '
-                            'type arguments '
-                            'at <{}>'.format(key))
-
-        if isinstance(data, dict):
-            data: dict
-
-            result = {}
-            for k, v in data.items():
-                dict_key = deserialize(
-                    Rule(rule.type.__args__[0]),
-                    k,
-                    try_all,
-                    '{}.{}'.format(key, k))
-
-                dict_value = deserialize(
-                    Rule(rule.type.__args__[1]),
-                    v,
-                    try_all,
-                    '{}.{}'.format(key, dict_key))
-
-                result[dict_key] = dict_value
-            return result
+            else:
+                if type(value) is not _Mismatch:
+                    return value
+            if _observing:
+                _union_branch_failed(t, arg)
+        return _Mismatch('{} did not match any of {} for key <{}>.',
+                         type(data).__name__, args, _Path(key))
 
-    # Deserialize lists
-    if (version_info.minor >= 8 and get_origin(rule.type) == list) or\
-        (version_info.minor < 8 and type(rule.type) is type(List) and getattr(rule.type, "__origin__", None) == List):
-        if len(rule.type.__args__) != 1:
-            raise TypeError(
-                'Cannot handle list with 0 or more than 1 type arguments '
-                'at <{}>.'.format(key))
-        if type(data) != list:
-            raise TypeError(
-                'Cannot deserialize {} into list '
-                'at <{}>.'.format(type(data).__name__, key))
-        data: list
-        t = rule.type.__args__[0]
-        result = []
-        for i, v in enumerate(data):
-            result.append(deserialize(
-                Rule(t),
-                v,
-                try_all,
-                '{}.{}'.format(key, i)
-            ))
-        return result
+    return _plan
 
-    # Deserialize tuples
-    if (version_info.minor >= 8 and get_origin(rule.type) == tuple) or\
-        (version_info.minor < 8 and type(rule.type) is type(Tuple)):
-        if not isinstance(data, list):
-            raise TypeError(
-                'Expected a list to convert to tuple, but got {}'
-                'at <{}>'.format(_type_to_str(type(data)), key))
 
-        data: list
-        if len(rule.type.__args__) != len(data):
-            raise TypeError(
-                'Expected a list of {} elements, but got {} elements '
-                'at <{}>.'.format(len(rule.type.__args__), len(data), key))
+def _compile_dict(t) -> _Handler:
+    args = getattr(t, '__args__', ())
+    if len(args) != 2:
+        return _Handler('dict', t, _dict_plan(t, None, None))
+    handlers = [_get_handler(args[0]), _get_handler(args[1])]
+    return _Handler('dict', t,
+                    _dict_plan(t, handlers[0].plan, handlers[1].plan),
+                    handlers)
+
 
-        return tuple(deserialize(Rule(v[0]), v[1], key="{}.{}".format(key, k))
-                     for k, v in enumerate(zip(rule.type.__args__, data)))
+def _dict_plan(t, key_plan: Optional[Callable[..., Any]],
+               value_plan: Optional[Callable[..., Any]],
+               rebuild: bool = False) -> Callable[..., Any]:
+    """
+    Returns the plan for Dict t, using the plans for its keys and values.
+    Unless rebuild is true, data that already matches t is returned as is.
+    """
+    check = _never if rebuild else _compile_check(t)
+    args = getattr(t, '__args__', ())
 
-    # Deserialize classes
-    if not isinstance(rule.type, type):
-        raise TypeError(repr(rule.type) + " is not a type!")
-    if issubclass(rule.type, Deserializable):
+    def _plan(data, try_all=True, key='[root]'):
+        if check(data):
+            return data
+
+        if len(args) != 2:
+            return _Mismatch('Cannot handle dicts with 0, 1 or more than two '
+                             'type arguments '
+                             'at <{}>', _Path(key))
         if not isinstance(data, dict):
-            raise TypeError(
-                'Cannot deserialize non-dict into class instance '
-                'at <>.'.format(key))
+            return _Mismatch('{!r} is not a type!', t)
 
-        data: dict
+        result = {}
+        for k, v in data.items():
+            dict_key = key_plan(k, try_all, (key, k))
+            if type(dict_key) is _Mismatch:
+                return dict_key
+            dict_value = value_plan(v, try_all, (key, dict_key))
+            if type(dict_value) is _Mismatch:
+                return dict_value
+            result[dict_key] = dict_value
+        return result
 
-        classes = get_deserialization_classes(rule.type, data,
-                                              try_all)
+    return _plan
 
-        cause = None
 
-        for cls in classes:
-            try:
-                # Instantiate cls with parameters generated by
-                # the list comprehension.
-                # It loops through all defined attributes, and
-                # defines it by recursively calling deserialize on
-                # each of those attributes with the values found in
-                # either data, or by using a default.
-                return cls(**{k: deserialize(
-                    r,
-                    data[k] if k in data else r.default,
-                    try_all,
-                    key='{}.{}'.format(key, k)
-                ) for k, r in cls.get_attrs().items()})
-            except TypeError as e:
+def _compile_list(t) -> _Handler:
+    args = getattr(t, '__args__', ())
+    if len(args) != 1:
+        return _Handler('list', t, _list_plan(t, None))
+    return _Handler('list', t, _list_plan(t, _compile_many(args[0])),
+                    [_get_handler(args[0])])
+
+
+def _list_plan(t, many_plan: Optional[Callable[..., Any]],
+               rebuild: bool = False) -> Callable[..., Any]:
+    """
+    Returns the plan for List t, which deserializes the list with many_plan.
+    Unless rebuild is true, data that already matches t is returned as is.
+    """
+    check = _never if rebuild else _compile_check(t)
+    args = getattr(t, '__args__', ())
+
+    def _plan(data, try_all=True, key='[root]'):
+        if check(data):
+            return data
+
+        if len(args) != 1:
+            return _Mismatch(
+                'Cannot handle list with 0 or more than 1 type arguments '
+                'at <{}>.', _Path(key))
+        if type(data) != list:
+            return _Mismatch(
+                'Cannot deserialize {} into list '
+                'at <{}>.', type(data).__name__, _Path(key))
+
+        return many_plan(data, try_all, key)
+
+    return _plan
+
+
+def _compile_tuple(t) -> _Handler:
+    handlers = [_get_handler(arg) for arg in getattr(t, '__args__', ())]
+    return _Handler('tuple', t,
+                    _tuple_plan(t, [handler.plan for handler in handlers]),
+                    handlers)
+
+
+def _tuple_plan(t, item_plans: Sequence[Callable[..., Any]]) \
+        -> Callable[..., Any]:
+    """
+    Returns the plan for Tuple t, using the plans for each of its items.
+    """
+    check = _compile_check(t)
+    args = getattr(t, '__args__', ())
+
+    def _plan(data, try_all=True, key='[root]'):
+        if check(data):
+            return data
+
+        if not isinstance(data, list):
+            return _Mismatch(
+                'Expected a list to convert to tuple, but got {}'
+                'at <{}>', _type_to_str(type(data)), _Path(key))
+        if len(args) != len(data):
+            return _Mismatch(
+                'Expected a list of {} elements, but got {} elements '
+                'at <{}>.', len(args), len(data), _Path(key))
+
+        result = []
+        for i, (plan, v) in enumerate(zip(item_plans, data)):
+            value = plan(v, True, (key, i))
+            if type(value) is _Mismatch:
+                return value
+            result.append(value)
+        return tuple(result)
+
+    return _plan
+
+
+def _class_attribute(cls, name: str):
+    """
+    Returns the attribute called name as found on cls or its bases, without
+    invoking descriptors.
+    """
+    for c in cls.__mro__:
+        if name in c.__dict__:
+            return c.__dict__[name]
+    return None
+
+
+def _get_field_plans(cls) -> List[Tuple[str, Any, Callable[..., Any],
+                                        Optional[Callable[..., Any]], str]]:
+    """
+    Returns the (cached) list of ``(name, default, plan, validator,
+    attribute)`` for all fields of cls. For ``@validated`` fields, the
+    validator is called directly and the value is stored in attribute.
+    """
+    plans = cls.__dict__.get('_field_plans')
+    if plans is None:
+        with _lock:
+            plans = cls.__dict__.get('_field_plans')
+            if plans is None:
+                plans = _compute_field_plans(cls)
+                type.__setattr__(cls, '_field_plans', plans)
+    return plans
+
+
+def _compute_field_plans(cls) -> List[Tuple]:
+    plans = []
+    for k, r in cls.get_attrs().items():
+        attribute = _class_attribute(cls, k)
+        if isinstance(attribute, ValidatedProperty):
+            plans.append((k, r.default, _compile(r.type),
+                          attribute.validator, attribute.storage))
+        else:
+            plans.append((k, r.default, _compile(r.type), None, k))
+    return plans
+
+
+def _construct(cls, fields, values):
+    """
+    Creates an instance of cls, like the generated constructor does, from
+    the values of each of the field plans in fields.
+    """
+    instance = cls.__new__(cls)
+    for (_, _, _, validator, attribute), value in zip(fields, values):
+        if validator is not None:
+            validator(instance, value)
+        setattr(instance, attribute, value)
+    return instance
+
+
+def _compile_builder(cls, fields: Optional[List[Tuple]] = None) \
+        -> Callable[..., Any]:
+    """
+    Returns a function ``build(data, try_all, key)`` that deserializes the
+    dict data into an instance of cls (and not any of its subclasses).
+
+    :param cls: The class to build.
+    :param fields: (Optionally) the field plans to use, as returned by
+        _get_field_plans (which is used by default).
+    """
+    if fields is None:
+        fields = _get_field_plans(cls)
+
+    def _build(data, try_all, key):
+        values = []
+        for k, default, plan, _, _ in fields:
+            value = plan(data[k] if k in data else default, try_all, (key, k))
+            if type(value) is _Mismatch:
+                return value
+            values.append(default if value is None else value)
+        return _construct(cls, fields, values)
+
+    return _build
+
+
+# Creates the builders of classes, see _compile_builder. This is replaced
+# when code generation is enabled.
+_builder_factory = _compile_builder
+
+
+def _get_builder(cls) -> Callable[..., Any]:
+    """
+    Returns the (cached) builder of cls.
+    """
+    builder = cls.__dict__.get('_builder')
+    if builder is None:
+        with _lock:
+            builder = cls.__dict__.get('_builder')
+            if builder is None:
+                builder = _builder_factory(cls)
+                type.__setattr__(cls, '_builder', builder)
+    return builder
+
+
+def _get_required(cls) -> frozenset:
+    """
+    Returns the (cached) set of keys that data needs to have to be
+    deserialized into cls.
+    """
+    required = cls.__dict__.get('_required')
+    if required is None:
+        with _lock:
+            required = cls.__dict__.get('_required')
+            if required is None:
+                required = _compute_required(cls)
+                type.__setattr__(cls, '_required', required)
+    return required
+
+
+def _compute_required(cls) -> frozenset:
+    """
+    Returns the keys of the fields of cls that have no default, and whose
+    plan does not accept the None they would get when the key is missing.
+    """
+    required = []
+    for k, default, plan, _, _ in _get_field_plans(cls):
+        if default is not None:
+            continue
+        try:
+            missing = type(plan(None, True, k)) is _Mismatch
+        except (TypeError, ValueError):
+            missing = True
+        if missing:
+            required.append(k)
+    return frozenset(required)
+
+
+def _instantiate_first(t, classes, data, try_all, key,
+                       get_builder=_get_builder):
+    """
+    Deserializes data into the first of the candidate classes that matches,
+    using the builders returned by get_builder.
+
+    When several candidates are tried, those that require a key that data
+    does not have are skipped, since they could never match.
+    """
+    cause = None
+    prune = try_all and len(classes) > 1
+    skipped = False
+
+    for cls in classes:
+        if prune and not data.keys() >= _get_required(cls):
+            skipped = True
+            continue
+        skipped = False
+
+        try:
+            value = get_builder(cls)(data, try_all, key)
+        except (TypeError, ValueError) as e:
+            # Raised by a validator.
+            if not try_all:
+                raise e
+            cause = e
+            continue
+
+        if type(value) is not _Mismatch:
+            return value
+        if not try_all:
+            return value
+        cause = value
+
+    if skipped:
+        cause = _explain(classes[-1], data, try_all, key, get_builder)
+    return _no_candidate(t, key, cause)
+
+
+def _explain(cls, data, try_all, key, get_builder=_get_builder):
+    """
+    Returns why data does not match cls (which was skipped), to report the
+    same error as trying cls would have.
+    """
+    try:
+        return get_builder(cls)(data, try_all, key)
+    except (TypeError, ValueError) as e:
+        return e
+
+
+def _no_candidate(t, key, cause) -> _Mismatch:
+    return _Mismatch('Unable to find matching non-abstract (sub)type of '
+                     '{} with key <{}>. '
+                     'Reason: {}', Rule(t).error_string(), _Path(key), cause)
+
+
+# Deserializes data into the first matching candidate class. This is
+# replaced by _observed_instantiate while anything is observed.
+_instantiate = _instantiate_first
+
+# The observer and the current depth of each thread, see observe().
+_observation = local()
+# The number of observe() blocks that are active, in all threads.
+_observing = 0
+
+
+def _observed_instantiate(t, classes, data, try_all, key,
+                          get_builder=_get_builder):
+    """
+    Like _instantiate_first, but reports to the observer of the current
+    thread.
+    """
+    observer = getattr(_observation, 'observer', None)
+    if observer is None:
+        return _instantiate_first(t, classes, data, try_all, key,
+                                  get_builder)
+
+    depth = _observation.depth + 1
+    _observation.depth = depth
+    start = perf_counter()
+    tried = 0
+    cause = None
+    prune = try_all and len(classes) > 1
+    skipped = False
+
+    try:
+        for cls in classes:
+            if prune and not data.keys() >= _get_required(cls):
+                observer.candidate_skipped(t, cls)
+                skipped = True
+                continue
+            skipped = False
+
+            tried += 1
+            try:
+                value = get_builder(cls)(data, try_all, key)
+            except (TypeError, ValueError) as e:
                 if not try_all:
+                    observer.failed(t, tried, depth, perf_counter() - start)
                     raise e
-                else:
-                    cause = e
-            except ValueError as e:
+                observer.candidate_failed(t, cls)
+                cause = e
+                continue
+
+            if type(value) is not _Mismatch:
+                observer.instantiated(t, cls, tried, depth,
+                                      perf_counter() - start)
+                return value
+            if not try_all:
+                observer.failed(t, tried, depth, perf_counter() - start)
+                return value
+            observer.candidate_failed(t, cls)
+            cause = value
+
+        if skipped:
+            cause = _explain(classes[-1], data, try_all, key, get_builder)
+        observer.failed(t, tried, depth, perf_counter() - start)
+        return _no_candidate(t, key, cause)
+    finally:
+        _observation.depth = depth - 1
+
+
+def _union_branch_failed(t, arg):
+    observer = getattr(_observation, 'observer', None)
+    if observer is not None:
+        observer.union_branch_failed(t, arg)
+
+
+@contextmanager
+def observe(observer: Observer):
+    """
+    Reports everything the current thread deserializes within the with
+    block to observer::
+
+        with observe(Stats()) as stats:
+            deserialize(Rule(Object), data)
+        print(stats.as_dict())
+
+    Nothing is observed (and nothing costs any extra time) outside of these
+    blocks.
+
+    :param observer: The observer, see ``dict_deserializer.observers``.
+    :return: A context manager returning observer.
+    """
+    global _instantiate, _observing
+
+    previous = getattr(_observation, 'observer', None)
+    if previous is None:
+        _observation.depth = 0
+    _observation.observer = observer
+    with _lock:
+        _observing += 1
+        _instantiate = _observed_instantiate
+
+    try:
+        yield observer
+    finally:
+        _observation.observer = previous
+        with _lock:
+            _observing -= 1
+            if not _observing:
+                _instantiate = _instantiate_first
+
+
+def _compile_class(t) -> _Handler:
+    return _Handler('class', t, _class_plan(t, _get_builder))
+
+
+def _class_plan(t, get_builder: Callable[[type], Callable[..., Any]]) \
+        -> Callable[..., Any]:
+    """
+    Returns the plan for class t, which deserializes into t or one of its
+    subclasses using the builders returned by get_builder.
+    """
+    def _plan(data, try_all=True, key='[root]'):
+        if isinstance(data, t):
+            return data
+
+        if not isinstance(data, dict):
+            return _Mismatch(
+                'Cannot deserialize non-dict into class instance '
+                'at <>.')
+
+        return _instantiate(t, _candidates(t, data, try_all), data, try_all,
+                            key, get_builder)
+
+    return _plan
+
+
+# Factories for the handlers of typing constructs, keyed on their origin.
+_origin_factories = {
+    Union: _compile_union,
+    dict: _compile_dict,
+    list: _compile_list,
+    tuple: _compile_tuple,
+}
+if version_info.minor >= 10:
+    _origin_factories[UnionType] = _compile_union
+
+# Factories for the handlers of classes, matched along the class's MRO.
+_class_factories = {
+    Deserializable: _compile_class,
+}
+
+
+def register_handler(origin, factory: Callable[[Any], Callable[..., Any]]):
+    """
+    Registers how to deserialize types that are not supported out of the box.
+
+    The handler is used for all typing constructs whose origin (as returned
+    by ``typing.get_origin``) is origin, e.g. ``set`` for ``Set[int]``. If
+    origin is a class, it is used for that class and its subclasses as well.
+
+    factory is called once for every such type ``t``, and must return a
+    function ``plan(data, try_all, key)``. That function returns the
+    deserialized value, or raises a TypeError when data does not match.
+    ``str(key)`` is the path of the value; it can be passed on as-is to
+    plans of nested types created with ``compile_deserializer``.
+
+    :param origin: The origin or class to handle.
+    :param factory: A function creating the plan for a type.
+    """
+    def _factory(t) -> _Handler:
+        plan = factory(t)
+
+        def _plan(data, try_all=True, key='[root]'):
+            try:
+                return plan(data, try_all, _Path(key))
+            except TypeError as e:
+                return _Mismatch('{}', e)
+
+        return _Handler('custom', t, _plan)
+
+    with _lock:
+        _origin_factories[origin] = _factory
+        if isinstance(origin, type):
+            _class_factories[origin] = _factory
+        _clear_plans()
+
+
+# Incremented whenever all plans are dropped, so that plans cached elsewhere
+# can tell they are outdated.
+_generation = 0
+
+
+def _clear_plans():
+    """
+    Drops all compiled plans, since they might have used another handler.
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        _handlers.clear()
+        _entry_plans.clear()
+        _many_plans.clear()
+        _validations.clear()
+        _projections.clear()
+        _lazy_plans.clear()
+        _serializer_plans.clear()
+        Deserializable._invalidate()
+
+
+# Plans that deserialize a list of elements of the same type, keyed on the
+# element type.
+_many_plans = {}
+
+
+def _compile_many(t) -> Callable[..., Any]:
+    """
+    Returns the (cached) plan that deserializes a list of elements of type t.
+    """
+    try:
+        return _many_plans[t]
+    except KeyError:
+        pass
+    except TypeError:
+        return _compile_many_uncached(t)
+
+    with _lock:
+        plan = _many_plans.get(t)
+        if plan is None:
+            plan = _compile_many_uncached(t)
+            _many_plans[t] = plan
+    return plan
+
+
+def _rows_plan(item_plan: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Returns a plan that deserializes a list one element at a time, using
+    item_plan.
+    """
+    def _rows(items, try_all=True, key='[root]'):
+        result = []
+        for i, v in enumerate(items):
+            value = item_plan(v, try_all, (key, i))
+            if type(value) is _Mismatch:
+                return value
+            result.append(value)
+        return result
+
+    return _rows
+
+
+def _compile_many_uncached(t) -> Callable[..., Any]:
+    item_plan = _compile(t)
+    _rows = _rows_plan(item_plan)
+
+    if _get_handler(t).tag != 'class':
+        # Not a class, or one with a registered handler.
+        return _rows
+
+    def _columns(cls, indices, items, try_all, key, result) -> bool:
+        """
+        Deserializes items[i] for all i in indices into cls, one field at a
+        time. Returns False when anything does not match.
+        """
+        fields = _get_field_plans(cls)
+        columns = []
+        try:
+            for k, default, plan, _, _ in fields:
+                column = []
+                for i in indices:
+                    d = items[i]
+                    value = plan(d[k] if k in d else default, try_all,
+                                 ((key, i), k))
+                    if type(value) is _Mismatch:
+                        return False
+                    column.append(default if value is None else value)
+                columns.append(column)
+
+            for i, row in zip(indices, zip(*columns)):
+                result[i] = _construct(cls, fields, row)
+        except (TypeError, ValueError):
+            # Raised by a validator, possibly of a nested class.
+            return False
+        return True
+
+    def _plan(items, try_all=True, key='[root]'):
+        if _observing:
+            # Objects are only reported when they are built one by one.
+            return _rows(items, try_all, key)
+
+        result = [None] * len(items)
+        groups = {}
+        for i, d in enumerate(items):
+            if not isinstance(d, dict) or isinstance(d, t):
+                return _rows(items, try_all, key)
+            classes = _candidates(t, d, try_all)
+            if len(classes) != 1:
+                # Several candidates have to be tried one by one. Elements
+                # of the groups come before this one, so errors are reported
+                # by going through all elements in order.
+                try:
+                    value = item_plan(d, try_all, (key, i))
+                except (TypeError, ValueError):
+                    return _rows(items, try_all, key)
+                if type(value) is _Mismatch:
+                    return _rows(items, try_all, key)
+                result[i] = value
+                continue
+            cls = classes[0]
+            if cls in groups:
+                groups[cls].append(i)
+            else:
+                groups[cls] = [i]
+
+        for cls, indices in groups.items():
+            if not _columns(cls, indices, items, try_all, key, result):
+                # Go through the elements in order to report the same error
+                # as deserializing them one by one would.
+                return _rows(items, try_all, key)
+        return result
+
+    return _plan
+
+
+def _parse_projection(only: Iterable[str]) -> tuple:
+    """
+    Converts dotted paths into the (hashable) tree of selected fields: a
+    sorted tuple of ``(name, subtree)``, where a subtree of None selects the
+    whole field.
+    """
+    if isinstance(only, str):
+        only = [only]
+    tree = {}
+    for path in only:
+        if not isinstance(path, str):
+            raise TypeError('Expected a field path, but got type {}.'
+                            .format(type(path).__name__))
+        node = tree
+        names = path.split('.')
+        for name in names[:-1]:
+            child = node.get(name, {})
+            if child is None:
+                # The whole field was selected already.
+                break
+            node = node.setdefault(name, child)
+        else:
+            node[names[-1]] = None
+
+    def _freeze(node):
+        if node is None:
+            return None
+        return tuple(sorted(((name, _freeze(child))
+                             for name, child in node.items()),
+                            key=lambda item: item[0]))
+
+    return _freeze(tree)
+
+
+# Plans that deserialize only some of the fields, keyed on the type and the
+# tree of selected fields.
+_projections = {}
+
+
+def _compile_projection(t, tree: Optional[tuple]) -> Callable[..., Any]:
+    """
+    Returns the (cached) plan for type t, that only deserializes the fields
+    selected by tree. Other fields keep their raw value.
+    """
+    if tree is None:
+        return _compile(t)
+    try:
+        return _projections[(t, tree)]
+    except KeyError:
+        pass
+    except TypeError:
+        return _compile_projection_uncached(t, tree)
+
+    with _lock:
+        plan = _projections.get((t, tree))
+        if plan is None:
+            plan = _compile_projection_uncached(t, tree)
+            _projections[(t, tree)] = plan
+    return plan
+
+
+def _compile_checked_projection(t, tree: tuple) -> Callable[..., Any]:
+    """
+    Like _compile_projection, but first checks that every path in tree
+    selects a field.
+    """
+    _check_projection([t], tree)
+    return _compile_projection(t, tree)
+
+
+def _check_projection(types: Sequence, tree: tuple, path: str = ''):
+    """
+    Raises a ValueError for the first name in tree that is not a field of
+    any of the classes that values of types can be deserialized into (the
+    classes themselves and their subclasses, also inside lists, dicts,
+    tuples and unions).
+    """
+    classes = []
+    _collect_classes(types, classes)
+    for name, subtree in tree:
+        field_types = [cls.get_attrs()[name].type for cls in classes
+                       if name in cls.get_attrs()]
+        if not field_types:
+            raise ValueError('{}{} is not a field of any candidate class.'
+                             .format(path, name))
+        if subtree is not None:
+            _check_projection(field_types, subtree,
+                              '{}{}.'.format(path, name))
+
+
+def _collect_classes(types: Sequence, classes: list):
+    for t in types:
+        handler = _get_handler(t)
+        if handler.tag == 'class':
+            pending = [t]
+            while pending:
+                cls = pending.pop()
+                if isinstance(cls, DeserializableMeta) \
+                        and cls not in classes:
+                    classes.append(cls)
+                    pending.extend(cls.__subclasses__())
+        elif handler.tag in ('union', 'list', 'dict', 'tuple'):
+            _collect_classes(getattr(t, '__args__', ()), classes)
+
+
+def _compile_projection_uncached(t, tree: tuple) -> Callable[..., Any]:
+    return _derived_plan(t, lambda arg: _compile_projection(arg, tree),
+                         lambda: _projected_class_plan(t, tree))
+
+
+def _projected_class_plan(t, tree: tuple) -> Callable[..., Any]:
+    """
+    Like _class_plan, but only deserializes the fields selected by tree.
+
+    Fields that are not selected can not tell candidates apart. When several
+    candidates could match, each is therefore first deserialized eagerly, to
+    choose the same class as deserialize without only would.
+    """
+    def _get_projected(cls) -> Callable[..., Any]:
+        return _get_projected_builder(cls, tree)
+
+    def _get_checked(cls) -> Callable[..., Any]:
+        builder = _get_builder(cls)
+        projected = _get_projected_builder(cls, tree)
+
+        def _build(data, try_all, key):
+            value = builder(data, try_all, key)
+            if type(value) is _Mismatch:
+                return value
+            return projected(data, try_all, key)
+
+        return _build
+
+    def _plan(data, try_all=True, key='[root]'):
+        if isinstance(data, t):
+            return data
+
+        if not isinstance(data, dict):
+            return _Mismatch(
+                'Cannot deserialize non-dict into class instance '
+                'at <>.')
+
+        classes = _candidates(t, data, try_all)
+        get_builder = _get_projected
+        if _is_ambiguous(classes, data, try_all):
+            get_builder = _get_checked
+        return _instantiate(t, classes, data, try_all, key, get_builder)
+
+    return _plan
+
+
+def _derived_plan(t, derive: Callable[[Any], Callable[..., Any]],
+                  class_plan: Callable[[], Callable[..., Any]],
+                  rebuild: bool = False) -> Callable[..., Any]:
+    """
+    Returns a plan for t that works like the regular one, but uses
+    ``derive(arg)`` as the plan of each of its type arguments. Classes get
+    ``class_plan()`` instead. Terminal and custom types keep their regular
+    plan.
+
+    Data that already matches t is normally returned as is, without calling
+    the derived plans. When rebuild is true, lists, dicts and the matching
+    argument of a union are rebuilt using them. (Tuples are always built
+    from lists.)
+    """
+    handler = _get_handler(t)
+    args = getattr(t, '__args__', ())
+    if handler.tag == 'class':
+        return class_plan()
+    if handler.tag == 'union':
+        return _union_plan(t, [derive(arg) for arg in args], rebuild)
+    if handler.tag == 'list' and len(args) == 1:
+        return _list_plan(t, _rows_plan(derive(args[0])), rebuild)
+    if handler.tag == 'dict' and len(args) == 2:
+        return _dict_plan(t, derive(args[0]), derive(args[1]), rebuild)
+    if handler.tag == 'tuple':
+        return _tuple_plan(t, [derive(arg) for arg in args])
+    return handler.plan
+
+
+def _get_projected_builder(cls, tree: tuple) -> Callable[..., Any]:
+    """
+    Returns the (cached) builder of cls, that only deserializes the fields
+    selected by tree.
+    """
+    projected = cls.__dict__.get('_projected')
+    if projected is not None:
+        builder = projected.get(tree)
+        if builder is not None:
+            return builder
+    with _lock:
+        projected = cls.__dict__.get('_projected')
+        if projected is None:
+            projected = {}
+            type.__setattr__(cls, '_projected', projected)
+        builder = projected.get(tree)
+        if builder is None:
+            builder = _compile_projected_builder(cls, tree)
+            projected[tree] = builder
+    return builder
+
+
+def _compile_projected_builder(cls, tree: tuple) -> Callable[..., Any]:
+    """
+    Like _compile_builder, but fields that are not selected by tree are not
+    deserialized or validated: they are set to the raw value.
+    """
+    selected = dict(tree)
+    fields = []
+    for k, default, plan, validator, attribute in _get_field_plans(cls):
+        if k in selected:
+            r = cls.get_attrs()[k]
+            fields.append((k, default,
+                           _compile_projection(r.type, selected[k]),
+                           validator, attribute))
+        else:
+            fields.append((k, default, None, None, attribute))
+
+    def _build(data, try_all, key):
+        values = []
+        for k, default, plan, _, _ in fields:
+            value = data[k] if k in data else default
+            if plan is not None:
+                value = plan(value, try_all, (key, k))
+                if type(value) is _Mismatch:
+                    return value
+            values.append(default if value is None else value)
+        return _construct(cls, fields, values)
+
+    return _build
+
+
+# Plans that defer the nested fields of classes, keyed on the type.
+_lazy_plans = {}
+
+
+def _compile_lazy(t) -> Callable[..., Any]:
+    """
+    Returns the (cached) plan for type t, that defers the nested fields of
+    the instances it creates.
+    """
+    handler = _get_handler(t)
+    if not handler.nested:
+        return handler.plan
+    try:
+        return _lazy_plans[t]
+    except KeyError:
+        pass
+    except TypeError:
+        return _compile_lazy_uncached(t)
+
+    with _lock:
+        plan = _lazy_plans.get(t)
+        if plan is None:
+            plan = _compile_lazy_uncached(t)
+            _lazy_plans[t] = plan
+    return plan
+
+
+def _compile_lazy_uncached(t) -> Callable[..., Any]:
+    return _derived_plan(t, _compile_lazy, lambda: _lazy_class_plan(t))
+
+
+def _lazy_class_plan(t) -> Callable[..., Any]:
+    """
+    Like _class_plan, but defers the nested fields of the instance, if it is
+    known which class to deserialize into without trying the candidates.
+
+    Deferred fields are only checked to have the right shape, so they can
+    not tell candidates apart. When several candidates could match, data is
+    therefore deserialized eagerly (including everything nested in it), to
+    choose the same class as deserialize without lazy would.
+    """
+    def _plan(data, try_all=True, key='[root]'):
+        if isinstance(data, t):
+            return data
+
+        if not isinstance(data, dict):
+            return _Mismatch(
+                'Cannot deserialize non-dict into class instance '
+                'at <>.')
+
+        classes = _candidates(t, data, try_all)
+        get_builder = _get_lazy_builder
+        if _is_ambiguous(classes, data, try_all):
+            get_builder = _get_builder
+        return _instantiate(t, classes, data, try_all, key, get_builder)
+
+    return _plan
+
+
+def _is_ambiguous(classes: Sequence[type], data: dict, try_all: bool) \
+        -> bool:
+    """
+    Returns whether more than one of the candidate classes could match data,
+    so that they can only be told apart by deserializing all fields.
+    """
+    if not try_all or len(classes) < 2:
+        return False
+    viable = 0
+    for cls in classes:
+        if data.keys() >= _get_required(cls):
+            viable += 1
+    return viable > 1
+
+
+def _get_lazy_builder(cls) -> Callable[..., Any]:
+    """
+    Returns the (cached) builder of cls, that defers its nested fields.
+    """
+    builder = cls.__dict__.get('_lazy_builder')
+    if builder is None:
+        with _lock:
+            builder = cls.__dict__.get('_lazy_builder')
+            if builder is None:
+                builder = _compile_lazy_builder(cls)
+                type.__setattr__(cls, '_lazy_builder', builder)
+    return builder
+
+
+def _shape_check(t) -> Callable[[Any], bool]:
+    """
+    Returns whether a value has the outer shape of t: a list for lists, a
+    dict for dicts and classes. Values of other types are checked
+    completely.
+    """
+    handler = _get_handler(t)
+    if handler.tag == 'list':
+        return lambda value: type(value) is list
+    if handler.tag == 'dict':
+        return lambda value: isinstance(value, dict)
+    if handler.tag == 'class':
+        return lambda value: isinstance(value, (dict, t))
+    if handler.tag == 'union':
+        checks = [_shape_check(arg) for arg in t.__args__]
+        return lambda value: any(check(value) for check in checks)
+    return _compile_check(t)
+
+
+# Marks the values of deferred fields in _compile_lazy_builder.
+_deferred = object()
+
+
+def _compile_lazy_builder(cls) -> Callable[..., Any]:
+    """
+    Like _compile_builder, but the values of nested fields (classes, lists
+    and dicts) are only checked to have the right shape, and kept as they
+    are until the field is first accessed.
+
+    Fields with a validator are not deferred, and neither are fields with a
+    default that is stored on the class, since that would hide them from
+    ``__getattr__``.
+    """
+    attrs = cls.get_attrs()
+    fields = []
+    checks = []
+    deferrable = {}
+    for k, default, plan, validator, attribute in _get_field_plans(cls):
+        t = attrs[k].type
+        handler = _get_handler(t)
+        stored = _class_attribute(cls, k)
+        if validator is None and \
+                (stored is None or isinstance(stored, MemberDescriptorType)) \
+                and (handler.nested or handler.tag in ('list', 'dict')):
+            checks.append(_shape_check(t))
+            deferrable[k] = (_compile_lazy(t), default)
+        else:
+            checks.append(None)
+        fields.append((k, default, _compile_lazy(t), validator, attribute))
+
+    def _build(data, try_all, key):
+        values = []
+        deferred = None
+        for (k, default, plan, _, _), check in zip(fields, checks):
+            value = data[k] if k in data else default
+            if check is not None and value is not None and check(value):
+                if deferred is None:
+                    deferred = {}
+                deferred[k] = value
+                values.append(_deferred)
+                continue
+            value = plan(value, try_all, (key, k))
+            if type(value) is _Mismatch:
+                return value
+            values.append(default if value is None else value)
+
+        instance = cls.__new__(cls)
+        for (_, _, _, validator, attribute), value in zip(fields, values):
+            if value is _deferred:
+                continue
+            if validator is not None:
+                validator(instance, value)
+            setattr(instance, attribute, value)
+        if deferred is not None:
+            object.__setattr__(instance, '_lazy', (deferred, try_all, key))
+        return instance
+
+    _build.deferrable = deferrable
+    return _build
+
+
+def _resolve_deferred(instance, name: str):
+    """
+    Deserializes and sets the deferred field called name of instance.
+
+    :raise AttributeError: When name is not a deferred field.
+    :raise TypeError: When the value of the field does not match.
+    """
+    try:
+        pending = object.__getattribute__(instance, '_lazy')
+    except AttributeError:
+        pending = None
+    if pending is None or name not in pending[0]:
+        raise AttributeError('{!r} object has no attribute {!r}'.format(
+            type(instance).__name__, name))
+
+    deferred, try_all, key = pending
+    raw = deferred.get(name, _deferred)
+    if raw is _deferred:
+        # Resolved by another thread in the meantime.
+        return object.__getattribute__(instance, name)
+
+    plan, default = _get_lazy_builder(type(instance)).deferrable[name]
+    value = plan(raw, try_all, (key, name))
+    if type(value) is _Mismatch:
+        raise value.error()
+    if value is None:
+        value = default
+    setattr(instance, name, value)
+
+    deferred.pop(name, None)
+    if not deferred:
+        try:
+            object.__delattr__(instance, '_lazy')
+        except AttributeError:
+            pass
+    return value
+
+
+def materialize(value):
+    """
+    Deserializes all fields that were deferred by ``deserialize(...,
+    lazy=True)``, in value and everything nested in it.
+
+    :param value: The result of a lazy deserialize.
+    :return: value, which no longer has deferred fields.
+    :raise TypeError: When the value of a deferred field does not match.
+    """
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, Deserializable):
+            for k in type(v).get_attrs():
+                stack.append(getattr(v, k, None))
+        elif isinstance(v, (list, tuple)):
+            stack.extend(v)
+        elif isinstance(v, dict):
+            stack.extend(v.values())
+    return value
+
+
+class Invalid:
+    """
+    Describes why data does not match a rule, as returned by ``validate``.
+
+    ``message`` is the message of the TypeError that ``deserialize`` would
+    raise for the same data. ``path`` holds the segments of the path to the
+    value that did not match, like ``('[root]', 'members', 0, 'name')``.
+    """
+
+    def __init__(self, message: str, path: Optional[tuple]):
+        self.message = message
+        self.path = path
+
+    def __repr__(self):
+        return 'Invalid(message={!r}, path={!r})'.format(self.message,
+                                                          self.path)
+
+    def __str__(self):
+        return self.message
+
+    def error(self) -> TypeError:
+        return TypeError(self.message)
+
+
+def _invalid(mismatch) -> Invalid:
+    """
+    Converts the reason why validation failed into an Invalid, with the path
+    of the most deeply nested value that was reported.
+    """
+    if type(mismatch) is not _Mismatch:
+        # An exception raised by a validator.
+        return Invalid(str(mismatch), None)
+
+    message = str(mismatch)
+    path = None
+    while mismatch is not None:
+        nested = None
+        for arg in mismatch.args:
+            if type(arg) is _Path:
+                path = arg.segments()
+            elif type(arg) is _Mismatch:
+                nested = arg
+        mismatch = nested
+    return Invalid(message, path)
+
+
+# Validation plans, keyed on the type they validate.
+_validations = {}
+
+
+def _compile_validation(t) -> Callable[..., Any]:
+    """
+    Returns the (cached) validation plan for type t. Validation plans are
+    like plans, but return None when data matches, instead of the
+    deserialized value.
+    """
+    try:
+        return _validations[t]
+    except KeyError:
+        pass
+    except TypeError:
+        return _compile_validation_uncached(t)
+
+    with _lock:
+        plan = _validations.get(t)
+        if plan is None:
+            plan = _compile_validation_uncached(t)
+            _validations[t] = plan
+    return plan
+
+
+def _compile_validation_uncached(t) -> Callable[..., Any]:
+    handler = _get_handler(t)
+    factory = _validation_factories.get(handler.tag,
+                                        _compile_plan_validation)
+    return factory(handler)
+
+
+def _compile_plan_validation(handler: _Handler) -> Callable[..., Any]:
+    """
+    Validates using the plan itself, for terminal and custom types.
+    """
+    plan = handler.plan
+
+    def _validate(data, try_all=True, key='[root]'):
+        value = plan(data, try_all, key)
+        if type(value) is _Mismatch:
+            return value
+        return None
+
+    return _validate
+
+
+def _compile_union_validation(handler: _Handler) -> Callable[..., Any]:
+    t = handler.type
+    check = _compile_check(t)
+    args = t.__args__
+    branches = [_compile_validation(arg) for arg in args]
+
+    def _validate(data, try_all=True, key='[root]'):
+        if check(data):
+            return None
+
+        for branch in branches:
+            try:
+                if branch(data, try_all, key) is None:
+                    return None
+            except TypeError:
+                # Raised by a validator further down.
+                pass
+        return _Mismatch('{} did not match any of {} for key <{}>.',
+                         type(data).__name__, args, _Path(key))
+
+    return _validate
+
+
+def _compile_dict_validation(handler: _Handler) -> Callable[..., Any]:
+    t = handler.type
+    check = _compile_check(t)
+    args = getattr(t, '__args__', ())
+    if len(args) == 2:
+        key_check = _compile_check(args[0])
+        key_validation = _compile_validation(args[0])
+        value_check = _compile_check(args[1])
+        value_validation = _compile_validation(args[1])
+
+    def _validate(data, try_all=True, key='[root]'):
+        if check(data):
+            return None
+
+        if len(args) != 2:
+            return _Mismatch('Cannot handle dicts with 0, 1 or more than two '
+                             'type arguments '
+                             'at <{}>', _Path(key))
+        if not isinstance(data, dict):
+            return _Mismatch('{!r} is not a type!', t)
+
+        for k, v in data.items():
+            if not key_check(k):
+                mismatch = key_validation(k, try_all, (key, k))
+                if mismatch is not None:
+                    return mismatch
+            if not value_check(v):
+                mismatch = value_validation(v, try_all, (key, k))
+                if mismatch is not None:
+                    return mismatch
+        return None
+
+    return _validate
+
+
+def _compile_list_validation(handler: _Handler) -> Callable[..., Any]:
+    t = handler.type
+    check = _compile_check(t)
+    args = getattr(t, '__args__', ())
+    if len(args) == 1:
+        item_check = _compile_check(args[0])
+        item_validation = _compile_validation(args[0])
+
+    def _validate(data, try_all=True, key='[root]'):
+        if check(data):
+            return None
+
+        if len(args) != 1:
+            return _Mismatch(
+                'Cannot handle list with 0 or more than 1 type arguments '
+                'at <{}>.', _Path(key))
+        if type(data) != list:
+            return _Mismatch(
+                'Cannot deserialize {} into list '
+                'at <{}>.', type(data).__name__, _Path(key))
+
+        for i, v in enumerate(data):
+            if not item_check(v):
+                mismatch = item_validation(v, try_all, (key, i))
+                if mismatch is not None:
+                    return mismatch
+        return None
+
+    return _validate
+
+
+def _compile_tuple_validation(handler: _Handler) -> Callable[..., Any]:
+    t = handler.type
+    check = _compile_check(t)
+    args = getattr(t, '__args__', ())
+    items = [(_compile_check(arg), _compile_validation(arg)) for arg in args]
+
+    def _validate(data, try_all=True, key='[root]'):
+        if check(data):
+            return None
+
+        if not isinstance(data, list):
+            return _Mismatch(
+                'Expected a list to convert to tuple, but got {}'
+                'at <{}>', _type_to_str(type(data)), _Path(key))
+        if len(args) != len(data):
+            return _Mismatch(
+                'Expected a list of {} elements, but got {} elements '
+                'at <{}>.', len(args), len(data), _Path(key))
+
+        for i, ((item_check, item_validation), v) in enumerate(
+                zip(items, data)):
+            if not item_check(v):
+                mismatch = item_validation(v, True, (key, i))
+                if mismatch is not None:
+                    return mismatch
+        return None
+
+    return _validate
+
+
+def _get_field_validation(cls) -> Callable[..., Any]:
+    """
+    Returns the (cached) validation plan of the fields of cls, which checks
+    data like the builder of cls would deserialize it.
+    """
+    validation = cls.__dict__.get('_field_validation')
+    if validation is None:
+        with _lock:
+            validation = cls.__dict__.get('_field_validation')
+            if validation is None:
+                validation = _compile_field_validation(cls)
+                type.__setattr__(cls, '_field_validation', validation)
+    return validation
+
+
+def _compile_field_validation(cls) -> Callable[..., Any]:
+    attrs = cls.get_attrs()
+    fields = _get_field_plans(cls)
+    checks = [(k, default, _accepted(attrs[k].type),
+               _compile_check(attrs[k].type),
+               _compile_validation(attrs[k].type))
+              for k, default, _, _, _ in fields]
+    validators = [(k, default, plan, validator)
+                  for k, default, plan, validator, _ in fields
+                  if validator is not None
+                  and not _uses_instance(validator)]
+
+    def _validate(data, try_all, key):
+        for k, default, accepted, check, validation in checks:
+            value = data[k] if k in data else default
+            if accepted is not None:
+                if isinstance(value, accepted):
+                    continue
+            elif check(value):
+                continue
+            mismatch = validation(value, try_all, (key, k))
+            if mismatch is not None:
+                return mismatch
+
+        # Validators get None instead of an instance, and the deserialized
+        # value. They are rare, so building the value is affordable.
+        for k, default, plan, validator in validators:
+            value = plan(data[k] if k in data else default, try_all,
+                         (key, k))
+            if type(value) is _Mismatch:
+                return value
+            validator(None, default if value is None else value)
+        return None
+
+    return _validate
+
+
+def _uses_instance(validator) -> bool:
+    """
+    Returns whether validator reads its first argument (the instance), by
+    looking at its bytecode. Anything but a plain function is assumed to.
+    """
+    code = getattr(validator, '__code__', None)
+    if code is None or code.co_argcount == 0:
+        return True
+    name = code.co_varnames[0]
+    if name in code.co_cellvars:
+        # Read by a nested function.
+        return True
+    for instruction in dis.get_instructions(code):
+        if instruction.opname.startswith('LOAD_FAST'):
+            argval = instruction.argval
+            if argval == name or \
+                    (isinstance(argval, tuple) and name in argval):
+                return True
+    return False
+
+
+def _compile_class_validation(handler: _Handler) -> Callable[..., Any]:
+    t = handler.type
+
+    def _validate(data, try_all=True, key='[root]'):
+        if isinstance(data, t):
+            return None
+
+        if not isinstance(data, dict):
+            return _Mismatch(
+                'Cannot deserialize non-dict into class instance '
+                'at <>.')
+
+        classes = _candidates(t, data, try_all)
+        prune = try_all and len(classes) > 1
+        skipped = False
+        cause = None
+
+        for cls in classes:
+            if prune and not data.keys() >= _get_required(cls):
+                skipped = True
+                continue
+            skipped = False
+
+            try:
+                mismatch = _get_field_validation(cls)(data, try_all, key)
+            except (TypeError, ValueError) as e:
+                # Raised by a validator.
                 if not try_all:
                     raise e
-                else:
-                    cause = e
+                cause = e
+                continue
+
+            if mismatch is None:
+                return None
+            if not try_all:
+                return mismatch
+            cause = mismatch
+
+        if skipped:
+            try:
+                cause = _get_field_validation(classes[-1])(data, try_all,
+                                                           key)
+            except (TypeError, ValueError) as e:
+                cause = e
+        return _no_candidate(t, key, cause)
+
+    return _validate
+
+
+# Factories for validation plans, keyed on the tag of the handler of a type.
+_validation_factories = {
+    'union': _compile_union_validation,
+    'dict': _compile_dict_validation,
+    'list': _compile_list_validation,
+    'tuple': _compile_tuple_validation,
+    'class': _compile_class_validation,
+}
+
+
+def validate(rule: Rule, data, try_all: bool = True,
+             key: str = '[root]') -> Optional[Invalid]:
+    """
+    Checks whether data can be deserialized into rule, without actually
+    building anything. This is the same as checking whether ``deserialize``
+    raises a TypeError, but a lot faster.
+
+    ``@validated`` validators are called as well, but with None instead of
+    the instance. They do get the deserialized value, which is built only
+    for these fields. Validators that read the instance can not be called,
+    so they are skipped: their checks only happen in ``deserialize``.
+    Exceptions other than a TypeError or ValueError are not caught.
+
+    :param rule: The rule (or type) to validate against.
+    :param data: The data to validate.
+    :param try_all: Whether to attempt other subtypes when a TypeError has
+        occurred.
+    :param key: Used for error reporting.
+    :return: None when data is valid, or an Invalid describing why not.
+    """
+    rule = Rule.to_rule(rule)
+    try:
+        mismatch = _compile_validation(rule.type)(data, try_all, key)
+    except (TypeError, ValueError) as e:
+        # Raised by a validator, with try_all disabled.
+        return _invalid(e)
+    if mismatch is None:
+        return None
+    return _invalid(mismatch)
+
+
+def _serialize_any(value, skip_defaults: bool = False):
+    """
+    Serializes value without knowing its type, by looking at what it holds.
+    """
+    if isinstance(value, Deserializable):
+        return _get_serializer(type(value), skip_defaults)(value)
+    if isinstance(value, dict):
+        return {_serialize_any(k, skip_defaults):
+                _serialize_any(v, skip_defaults) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serialize_any(v, skip_defaults) for v in value]
+    return value
+
+
+# Serializers, keyed on the type they serialize and skip_defaults. None means
+# that values of the type are serialized as they are.
+_serializer_plans = {}
+
+
+def _compile_serializer(t, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the (cached) serializer for type t: a function that converts a
+    value of type t into plain dicts, lists and terminal values. Returns None
+    when values of t need no conversion.
+    """
+    try:
+        return _serializer_plans[(t, skip_defaults)]
+    except KeyError:
+        pass
+    except TypeError:
+        return _compile_serializer_uncached(t, skip_defaults)
+
+    with _lock:
+        if (t, skip_defaults) not in _serializer_plans:
+            _serializer_plans[(t, skip_defaults)] = \
+                _compile_serializer_uncached(t, skip_defaults)
+        return _serializer_plans[(t, skip_defaults)]
+
+
+def _compile_serializer_uncached(t, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    handler = _get_handler(t)
+    factory = _serializer_factories.get(handler.tag, _compile_any_serializer)
+    return factory(handler, skip_defaults)
+
+
+def _compile_any_serializer(handler: _Handler, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    """
+    Serializes terminal and custom types. Natively checked types are kept as
+    they are, other values (like those of ``Any``) are inspected.
+    """
+    if handler.tag == 'terminal' and _native_type(handler.type) is not None:
+        return None
+
+    def _serialize(value):
+        return _serialize_any(value, skip_defaults)
+
+    return _serialize
+
+
+def _serialized_check(handler: _Handler) -> Callable[[Any], bool]:
+    """
+    Returns a predicate that tells whether a value is one of handler's type,
+    looking only at the value itself (not at the items it holds).
+    """
+    t = handler.type
+    if handler.tag == 'class':
+        return lambda value: isinstance(value, t)
+    origin = {'dict': dict, 'list': list, 'tuple': tuple}.get(handler.tag)
+    if origin is not None:
+        return lambda value: isinstance(value, origin)
+    return _compile_check(t)
+
+
+def _compile_union_serializer(handler: _Handler, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    branches = [(_serialized_check(arg),
+                 _compile_serializer(arg.type, skip_defaults))
+                for arg in handler.args]
+    if all(serializer is None for _, serializer in branches):
+        return None
+
+    def _serialize(value):
+        for check, serializer in branches:
+            if check(value):
+                return value if serializer is None else serializer(value)
+        return _serialize_any(value, skip_defaults)
+
+    return _serialize
+
+
+def _compile_dict_serializer(handler: _Handler, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    if len(handler.args) != 2:
+        return _compile_any_serializer(handler, skip_defaults)
+    key_serializer, value_serializer = [
+        _compile_serializer(arg.type, skip_defaults) for arg in handler.args]
+
+    if key_serializer is None and value_serializer is None:
+        return dict
+    if key_serializer is None:
+        return lambda value: {k: v if v is None else value_serializer(v)
+                              for k, v in value.items()}
+
+    def _serialize(value):
+        return {key_serializer(k):
+                v if v is None or value_serializer is None
+                else value_serializer(v)
+                for k, v in value.items()}
+
+    return _serialize
 
-        raise TypeError('Unable to find matching non-abstract (sub)type of '
-                        '{} with key <{}>. '
-                        'Reason: {}'.format(rule.error_string(), key, cause))
 
-    raise TypeError('Expected something of type {}, but got type {} '
-                    'at <{}>.'.format(rule.error_string(), type(data).__name__,
-                                      key))
+def _compile_list_serializer(handler: _Handler, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    if len(handler.args) != 1:
+        return _compile_any_serializer(handler, skip_defaults)
+    item_serializer = _compile_serializer(handler.args[0].type,
+                                          skip_defaults)
+    if item_serializer is None:
+        return list
+    return lambda value: [item_serializer(v) for v in value]
+
+
+def _compile_tuple_serializer(handler: _Handler, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    item_serializers = [_compile_serializer(arg.type, skip_defaults)
+                        for arg in handler.args]
+    if all(serializer is None for serializer in item_serializers):
+        return list
+    # Tuples are deserialized from lists, so they are serialized into them.
+    return lambda value: [v if serializer is None else serializer(v)
+                          for serializer, v in zip(item_serializers, value)]
+
+
+def _compile_class_serializer(handler: _Handler, skip_defaults: bool) \
+        -> Optional[Callable[[Any], Any]]:
+    def _serialize(value):
+        if not isinstance(value, Deserializable):
+            return _serialize_any(value, skip_defaults)
+
+        # Subclasses have fields of their own. This is the fast path of
+        # _get_serializer, inlined.
+        serializers = type(value).__dict__['_serializers']
+        if serializers is not None:
+            serializer = serializers.get(skip_defaults)
+            if serializer is not None:
+                return serializer(value)
+        return _get_serializer(type(value), skip_defaults)(value)
+
+    return _serialize
+
+
+# Factories for serializers, keyed on the tag of the handler of a type.
+_serializer_factories = {
+    'union': _compile_union_serializer,
+    'dict': _compile_dict_serializer,
+    'list': _compile_list_serializer,
+    'tuple': _compile_tuple_serializer,
+    'class': _compile_class_serializer,
+}
+
+
+def _get_serializer(cls, skip_defaults: bool = False) \
+        -> Callable[[Any], dict]:
+    """
+    Returns the (cached) serializer of the fields of instances of cls (and
+    not of any of its subclasses).
+    """
+    serializers = cls.__dict__.get('_serializers')
+    if serializers is not None:
+        serializer = serializers.get(skip_defaults)
+        if serializer is not None:
+            return serializer
+    with _lock:
+        serializers = cls.__dict__.get('_serializers')
+        if serializers is None:
+            serializers = {}
+            type.__setattr__(cls, '_serializers', serializers)
+        serializer = serializers.get(skip_defaults)
+        if serializer is None:
+            serializer = _serializer_factory(cls, skip_defaults)
+            serializers[skip_defaults] = serializer
+    return serializer
+
+
+def _discriminated(cls) -> Dict[str, Any]:
+    """
+    Returns the keys and values that the discriminators of cls (and its
+    bases) require, and that are not fields of cls.
+    """
+    attrs = cls.get_attrs()
+    discriminated = {}
+    for c in reversed(cls.__mro__):
+        for dc in c.__dict__.get('_discriminators', ()):
+            if isinstance(dc, KeyValueDiscriminator) and dc.has_value and \
+                    dc.key not in attrs:
+                discriminated[dc.key] = dc.value
+    return discriminated
+
+
+def _compile_fields_serializer(cls, skip_defaults: bool) \
+        -> Callable[[Any], dict]:
+    """
+    Returns a function that converts an instance of cls into a dict, the
+    reverse of the builder of cls.
+    """
+    attrs = cls.get_attrs()
+    fields = [(k, default, _compile_serializer(attrs[k].type, skip_defaults))
+              for k, default, _, _, _ in _get_field_plans(cls)]
+    attributes = [attribute for _, _, _, _, attribute in _get_field_plans(cls)]
+    discriminated = _discriminated(cls)
+
+    if len(attributes) == 1:
+        attribute = attributes[0]
+
+        def get(instance):
+            return getattr(instance, attribute),
+    elif attributes:
+        get = attrgetter(*attributes)
+    else:
+        def get(_):
+            return ()
+
+    def _values(instance):
+        # Used for instances of which not all fields are set.
+        return [getattr(instance, attribute, None)
+                for attribute in attributes]
+
+    if skip_defaults:
+        def _serialize(instance):
+            try:
+                values = get(instance)
+            except AttributeError:
+                values = _values(instance)
+
+            result = dict(discriminated)
+            for (k, default, serializer), value in zip(fields, values):
+                if value is default or (type(value) is type(default) and
+                                        value == default):
+                    continue
+                if serializer is not None and value is not None:
+                    value = serializer(value)
+                result[k] = value
+            return result
+
+        return _serialize
+
+    keys = [k for k, _, _ in fields]
+    converted = [(i, k, serializer)
+                 for i, (k, _, serializer) in enumerate(fields)
+                 if serializer is not None]
+
+    def _serialize(instance):
+        try:
+            values = get(instance)
+        except AttributeError:
+            values = _values(instance)
+
+        if discriminated:
+            result = dict(discriminated)
+            result.update(zip(keys, values))
+        else:
+            result = dict(zip(keys, values))
+        for i, k, serializer in converted:
+            value = values[i]
+            if value is not None:
+                result[k] = serializer(value)
+        return result
+
+    return _serialize
+
+
+# Creates the serializers of classes, see _compile_fields_serializer. This is
+# replaced when code generation is enabled.
+_serializer_factory = _compile_fields_serializer
+
+
+def serialize(rule: Rule, obj, skip_defaults: bool = False):
+    """
+    Converts obj, an instance matching rule, back into dicts, lists and
+    terminal values, the reverse of ``deserialize``. Tuples become lists,
+    and the keys and values that ``@discriminate`` annotations require are
+    added to the dicts of instances.
+
+    The conversion is compiled once per type (and per class), from the same
+    field table ``deserialize`` uses. Instances are serialized using their
+    own class, which may be a subclass of the one in rule. Lazy fields are
+    deserialized when they are serialized.
+
+    :param rule: The rule (or type) obj matches.
+    :param obj: The value to serialize.
+    :param skip_defaults: Whether to leave out fields that are equal to
+        their default (which is None for fields without one), to keep the
+        output small. Deserializing the output gives the same result.
+    :return: The serialized value, e.g. to pass to ``json.dumps``.
+    """
+    rule = Rule.to_rule(rule)
+    serializer = _compile_serializer(rule.type, skip_defaults)
+    if serializer is None or obj is None:
+        return obj
+    return serializer(obj)
+
+
+def deserialize_many(rule: Rule, items: List, try_all: bool = True,
+                     key: str = '[root]') -> List:
+    """
+    Deserializes a list of elements that all match the same rule. This is
+    equivalent to (but faster than) deserializing every element on its own.
+
+    Elements of Deserializable classes are grouped by the class they
+    deserialize into, after which every field is deserialized for the whole
+    group at once.
+
+    :param rule: The rule (or type) of a single element.
+    :param items: The elements to deserialize.
+    :param try_all: Whether to attempt other subtypes when a TypeError has
+        occurred.
+    :param key: Used for error reporting. Errors report the path of the
+        element as ``<key>.<index>``.
+    :return: A list of instances matching rule.
+    """
+    rule = Rule.to_rule(rule)
+    result = _compile_many(rule.type)(items, try_all, key)
+    if type(result) is _Mismatch:
+        raise result.error()
+    if rule.default is not None:
+        result = [rule.default if v is None else v for v in result]
+    return result
+
+
+def deserialize(rule: Rule, data, try_all: bool = True, key: str = '[root]',
+                observer: Optional[Observer] = None,
+                only: Optional[Iterable[str]] = None, lazy: bool = False,
+                interner=None):
+    """
+    Converts the passed in data into a type that is compatible with rule.
+
+    :param rule:
+    :param data:
+    :param try_all: Whether to attempt other subtypes when a TypeError has
+        occurred. This is useful when automatically deriving discriminators.
+    :param key: Used for exceptions and error reporting. Preferrably the full
+        path to the current value.
+    :param observer: (Optionally) an observer to report to, see
+        ``dict_deserializer.observers``.
+    :param only: (Optionally) the dotted paths of the fields to deserialize,
+        e.g. ``{'name', 'members.name'}``. Paths pass through lists, dicts
+        and unions. Fields that are not selected are set to the raw value,
+        without being checked. A ValueError is raised for paths that do not
+        name a field of any candidate class.
+    :param lazy: Whether to defer the nested fields (classes, lists and
+        dicts) of the instances that are created. Their values are only
+        checked to have the right shape, and deserialized when the field is
+        first accessed. Use ``materialize`` to deserialize all of them.
+    :param interner: (Optionally) an ``Interner`` that makes equal strings
+        share a single object, see ``dict_deserializer.interning``.
+    :return: An instance matching Rule.
+    """
+    plan = compile_deserializer(rule, only, lazy, interner)
+    if observer is not None:
+        with observe(observer):
+            return plan(data, try_all, key)
+    return plan(data, try_all, key)
@@ -0,0 +1,226 @@
+"""
+Interning of the strings (and tuples) that are deserialized.
+
+JSON parsers create a new string object for every string in a document, so
+a list of a million users that all belong to one of ten groups holds a
+million group name strings. When an ``Interner`` is passed to
+``deserialize``, equal strings share a single object instead::
+
+    from dict_deserializer.interning import Interner
+
+    interner = Interner(types=[User])
+    users = deserialize(Rule(List[User]), data, interner=interner)
+    print(interner.as_dict()['bytes_saved'])
+
+An interner can be reused for many calls, which is where most of the
+savings come from.
+"""
+from sys import getsizeof
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from dict_deserializer import deserializer
+from dict_deserializer.deserializer import _class_plan, _compile_builder, \
+    _derived_plan, _get_field_plans, _get_handler
+
+
+def _signature(value: tuple) -> tuple:
+    """
+    Returns the types of the items of value, and of the items of the tuples
+    in it.
+    """
+    return tuple(_signature(v) if type(v) is tuple else type(v)
+                 for v in value)
+
+
+class Interner:
+    """
+    A bounded table of strings (and optionally tuples), used while
+    deserializing.
+
+    By default, all strings are interned: the values of ``str`` fields and
+    the items and keys of lists and dicts of strings. When types or fields
+    are passed, only the strings in the fields of those classes (and their
+    subclasses) are.
+
+    Once the table is full, new strings are no longer added, but the strings
+    in it are still shared.
+    """
+
+    def __init__(self, size: int = 65536,
+                 types: Optional[Iterable[type]] = None,
+                 fields: Optional[Iterable[Tuple[type, str]]] = None,
+                 tuples: bool = False):
+        """
+        :param size: The maximal amount of strings and tuples in the table.
+        :param types: (Optionally) the classes of which to intern all string
+            fields.
+        :param fields: (Optionally) ``(class, field name)`` pairs of the
+            fields to intern.
+        :param tuples: Whether to deduplicate the tuples that are created
+            for ``Tuple`` fields as well, when all of their items are
+            hashable.
+        """
+        if size < 1:
+            raise ValueError('size must be at least 1.')
+        self.size = size
+        self.types = None if types is None else tuple(types)
+        self.fields = None if fields is None else tuple(fields)
+        self.tuples = tuples
+
+        self._table = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+        self._plans = {}
+        self._builders = {}
+        # noinspection PyProtectedMember
+        self._generation = deserializer._generation
+
+    def intern(self, value: Hashable):
+        """
+        Returns the value from the table that equals value, after adding
+        value when there is none (and the table is not full).
+        """
+        found = self._table.get(value)
+        if found is None:
+            self.misses += 1
+            if len(self._table) < self.size:
+                self._table[value] = value
+            return value
+
+        self.hits += 1
+        if found is not value:
+            self.bytes_saved += getsizeof(value)
+        return found
+
+    def dedupe(self, value: tuple) -> tuple:
+        """
+        Like intern, for tuples. Tuples only match when their items are of
+        the same types as well, so that ``(1,)`` is not replaced by
+        ``(True,)``.
+
+        :raise TypeError: When an item of value is not hashable.
+        """
+        found = self._table.get((_signature(value), value))
+        if found is None:
+            self.misses += 1
+            if len(self._table) < self.size:
+                self._table[(_signature(value), value)] = value
+            return value
+
+        self.hits += 1
+        if found is not value:
+            self.bytes_saved += getsizeof(value)
+        return found
+
+    def clear(self):
+        """
+        Empties the table and resets the statistics.
+        """
+        self._table = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the statistics as a dict of plain values: the amount of
+        values in the table (``size``), how many values were found in the
+        table (``hits``) or not (``misses``), and the amount of bytes the
+        values that were replaced by one in the table took
+        (``bytes_saved``).
+        """
+        return {
+            'size': len(self._table),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes_saved': self.bytes_saved,
+        }
+
+    def _interns(self, cls: type, k: str) -> bool:
+        """
+        Returns whether the strings in field k of cls are interned.
+        """
+        if self.types is None and self.fields is None:
+            return True
+        if self.types is not None and issubclass(cls, self.types):
+            return True
+        return self.fields is not None and any(
+            k == name and issubclass(cls, owner)
+            for owner, name in self.fields)
+
+    def _get_plan(self, t) -> Callable[..., Any]:
+        """
+        Returns the (cached) plan for the top-level type t.
+        """
+        # noinspection PyProtectedMember
+        if self._generation != deserializer._generation:
+            # The handlers changed, see register_handler.
+            # noinspection PyProtectedMember
+            self._generation = deserializer._generation
+            self._plans = {}
+        return self._compile(t, self.types is None and self.fields is None)
+
+    def _compile(self, t, interning: bool) -> Callable[..., Any]:
+        try:
+            return self._plans[(t, interning)]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._compile_uncached(t, interning)
+
+        plan = self._compile_uncached(t, interning)
+        self._plans[(t, interning)] = plan
+        return plan
+
+    def _compile_uncached(self, t, interning: bool) -> Callable[..., Any]:
+        handler = _get_handler(t)
+        if t is str and interning:
+            return self._interning_plan(handler.plan, str)
+        if handler.tag == 'terminal' or \
+                not (handler.nested or interning):
+            return handler.plan
+
+        # Lists and dicts of strings would be returned as they are, unless
+        # they are rebuilt.
+        plan = _derived_plan(t, lambda arg: self._compile(arg, interning),
+                             lambda: _class_plan(t, self._get_builder),
+                             rebuild=interning)
+        if handler.tag == 'tuple' and self.tuples:
+            return self._interning_plan(plan, tuple)
+        return plan
+
+    def _interning_plan(self, plan: Callable[..., Any], cls: type) \
+            -> Callable[..., Any]:
+        intern = self.dedupe if cls is tuple else self.intern
+
+        def _plan(data, try_all=True, key='[root]'):
+            value = plan(data, try_all, key)
+            if type(value) is not cls:
+                return value
+            try:
+                return intern(value)
+            except TypeError:
+                # A tuple holding unhashable items.
+                return value
+
+        return _plan
+
+    def _get_builder(self, cls: type) -> Callable[..., Any]:
+        """
+        Returns the (cached) builder of cls that interns the strings of its
+        fields.
+        """
+        fields = _get_field_plans(cls)
+        entry = self._builders.get(cls)
+        if entry is None or entry[0] is not fields:
+            # The class changed since, or was never seen.
+            attrs = cls.get_attrs()
+            interned = [(k, default,
+                         self._compile(attrs[k].type, self._interns(cls, k)),
+                         validator, attribute)
+                        for k, default, _, validator, attribute in fields]
+            entry = (fields, _compile_builder(cls, interned))
+            self._builders[cls] = entry
+        return entry[1]
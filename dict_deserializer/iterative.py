@@ -0,0 +1,374 @@
+"""
+Deserializes arbitrarily deep data without recursing.
+
+``deserialize`` in ``dict_deserializer.deserializer`` calls the plan of
+every nested value from the plan of its parent, so data that is nested more
+deeply than the recursion limit (about a thousand levels by default) raises
+a RecursionError. This module walks the same compiled handlers with an
+explicit stack instead. Every list, dict, tuple, Union and class that is
+being deserialized is a generator on that stack, which yields the nested
+values it needs and receives their results. Values that can not hold class
+instances (and therefore can not be nested arbitrarily deep) are handled in
+place by their regular plans, without a stack entry.
+
+The result, and the error raised when the data does not match, are the same
+as those of ``deserialize``. The arguments of a Union and the candidate
+subclasses of a class are always tried in the order they were declared
+(also when adaptive ordering is enabled), and observers are not notified.
+
+Example::
+
+    from dict_deserializer import iterative
+
+    root = iterative.deserialize(Rule(Object), data)
+"""
+from types import GeneratorType
+from typing import Any, Callable, List, Tuple
+
+from dict_deserializer import deserializer
+from dict_deserializer.deserializer import Rule, _Handler, _Mismatch, \
+    _Path, _candidates, _compile_check, _construct, _get_builder, \
+    _get_field_plans, _get_handler, _get_required, _no_candidate, \
+    _type_to_str
+
+
+def _get_field_table(cls) -> Tuple[List[Tuple], List[Tuple], bool]:
+    """
+    Returns the field plans of cls, ``(name, default, plan, handler)`` for
+    each of them, and whether none of them are nested. handler is None for
+    fields that are not nested, whose plan is called directly.
+    """
+    entry = cls.__dict__.get('_field_table')
+    if entry is None:
+        # noinspection PyProtectedMember
+        with deserializer._lock:
+            entry = cls.__dict__.get('_field_table')
+            if entry is None:
+                entry = _compute_field_table(cls)
+                type.__setattr__(cls, '_field_table', entry)
+    return entry
+
+
+def _compute_field_table(cls) -> Tuple[List[Tuple], List[Tuple], bool]:
+    fields = _get_field_plans(cls)
+    attrs = cls.get_attrs()
+    table = []
+    for k, default, plan, _, _ in fields:
+        handler = _get_handler(attrs[k].type)
+        table.append((k, default, plan,
+                      handler if handler.nested else None))
+    return fields, table, all(row[3] is None for row in table)
+
+
+def _walk_union(handler: _Handler, data, try_all, key):
+    t = handler.type
+    if _compile_check(t)(data):
+        return data
+
+    for arg in handler.args:
+        try:
+            if arg.nested:
+                value = yield arg, data, try_all, key
+            else:
+                value = arg.plan(data, try_all, key)
+        except TypeError:
+            # Raised by a validator further down.
+            pass
+        else:
+            if type(value) is not _Mismatch:
+                return value
+    return _Mismatch('{} did not match any of {} for key <{}>.',
+                     type(data).__name__, t.__args__, _Path(key))
+
+
+def _walk_dict(handler: _Handler, data, try_all, key):
+    t = handler.type
+    if _compile_check(t)(data):
+        return data
+
+    if len(handler.args) != 2:
+        return _Mismatch('Cannot handle dicts with 0, 1 or more than two '
+                         'type arguments '
+                         'at <{}>', _Path(key))
+    if not isinstance(data, dict):
+        return _Mismatch('{!r} is not a type!', t)
+
+    key_handler, value_handler = handler.args
+    walk_keys = key_handler.nested
+    walk_values = value_handler.nested
+    result = {}
+    for k, v in data.items():
+        if walk_keys:
+            dict_key = yield key_handler, k, try_all, (key, k)
+        else:
+            dict_key = key_handler.plan(k, try_all, (key, k))
+        if type(dict_key) is _Mismatch:
+            return dict_key
+        if walk_values:
+            dict_value = yield value_handler, v, try_all, (key, dict_key)
+        else:
+            dict_value = value_handler.plan(v, try_all, (key, dict_key))
+        if type(dict_value) is _Mismatch:
+            return dict_value
+        result[dict_key] = dict_value
+    return result
+
+
+def _walk_list(handler: _Handler, data, try_all, key):
+    if _compile_check(handler.type)(data):
+        return data
+
+    if len(handler.args) != 1:
+        return _Mismatch(
+            'Cannot handle list with 0 or more than 1 type arguments '
+            'at <{}>.', _Path(key))
+    if type(data) != list:
+        return _Mismatch(
+            'Cannot deserialize {} into list '
+            'at <{}>.', type(data).__name__, _Path(key))
+
+    item_handler = handler.args[0]
+    walk = item_handler.nested
+    plan = item_handler.plan
+    result = []
+    for i, v in enumerate(data):
+        if walk:
+            value = yield item_handler, v, try_all, (key, i)
+        else:
+            value = plan(v, try_all, (key, i))
+        if type(value) is _Mismatch:
+            return value
+        result.append(value)
+    return result
+
+
+def _walk_tuple(handler: _Handler, data, try_all, key):
+    if _compile_check(handler.type)(data):
+        return data
+
+    if not isinstance(data, list):
+        return _Mismatch(
+            'Expected a list to convert to tuple, but got {}'
+            'at <{}>', _type_to_str(type(data)), _Path(key))
+    if len(handler.args) != len(data):
+        return _Mismatch(
+            'Expected a list of {} elements, but got {} elements '
+            'at <{}>.', len(handler.args), len(data), _Path(key))
+
+    result = []
+    for i, (item_handler, v) in enumerate(zip(handler.args, data)):
+        if item_handler.nested:
+            value = yield item_handler, v, True, (key, i)
+        else:
+            value = item_handler.plan(v, True, (key, i))
+        if type(value) is _Mismatch:
+            return value
+        result.append(value)
+    return tuple(result)
+
+
+def _walk_fields(cls, data, try_all, key):
+    """
+    Deserializes data into an instance of cls (and not any of its
+    subclasses), like the builder of cls.
+    """
+    fields, table, _ = _get_field_table(cls)
+    values = []
+    for k, default, plan, handler in table:
+        v = data[k] if k in data else default
+        if handler is not None:
+            value = yield handler, v, try_all, (key, k)
+        else:
+            value = plan(v, try_all, (key, k))
+        if type(value) is _Mismatch:
+            return value
+        values.append(default if value is None else value)
+    return _construct(cls, fields, values)
+
+
+def _walk_class(handler: _Handler, data, try_all, key):
+    """
+    Unlike the other walkers, this is not a generator function itself. It
+    tries the candidates without nested fields in place, and only returns a
+    generator once a candidate with nested fields is to be tried.
+    """
+    t = handler.type
+    if isinstance(data, t):
+        return data
+
+    if not isinstance(data, dict):
+        return _Mismatch(
+            'Cannot deserialize non-dict into class instance '
+            'at <>.')
+
+    classes = _candidates(t, data, try_all)
+    cause = None
+    prune = try_all and len(classes) > 1
+    skipped = False
+
+    for i, cls in enumerate(classes):
+        if prune and not data.keys() >= _get_required(cls):
+            skipped = True
+            continue
+        skipped = False
+
+        if not _get_field_table(cls)[2]:
+            return _walk_candidates(t, classes, i, cause, data, try_all, key)
+        try:
+            value = _get_builder(cls)(data, try_all, key)
+        except (TypeError, ValueError) as e:
+            # Raised by a validator.
+            if not try_all:
+                raise e
+            cause = e
+            continue
+
+        if type(value) is not _Mismatch:
+            return value
+        if not try_all:
+            return value
+        cause = value
+
+    if skipped:
+        return _walk_candidates(t, classes, len(classes), cause, data,
+                                try_all, key)
+    return _no_candidate(t, key, cause)
+
+
+def _walk_candidates(t, classes, start, cause, data, try_all, key):
+    """
+    Continues _walk_class from the candidate at index start.
+    """
+    prune = try_all and len(classes) > 1
+    skipped = start == len(classes)
+
+    for cls in classes[start:]:
+        if prune and not data.keys() >= _get_required(cls):
+            skipped = True
+            continue
+        skipped = False
+
+        try:
+            if _get_field_table(cls)[2]:
+                value = _get_builder(cls)(data, try_all, key)
+            else:
+                value = yield from _walk_fields(cls, data, try_all, key)
+        except (TypeError, ValueError) as e:
+            # Raised by a validator.
+            if not try_all:
+                raise e
+            cause = e
+            continue
+
+        if type(value) is not _Mismatch:
+            return value
+        if not try_all:
+            return value
+        cause = value
+
+    if skipped:
+        # Reports the same error as trying the last candidate would have.
+        try:
+            cause = yield from _walk_fields(classes[-1], data, try_all, key)
+        except (TypeError, ValueError) as e:
+            cause = e
+    return _no_candidate(t, key, cause)
+
+
+# Functions returning the generator that walks a value of a nested handler,
+# keyed on the tag of the handler.
+_walkers = {
+    'union': _walk_union,
+    'dict': _walk_dict,
+    'list': _walk_list,
+    'tuple': _walk_tuple,
+    'class': _walk_class,
+}
+
+
+def _run(walker: GeneratorType):
+    """
+    Runs walker, and the walkers of all the nested values it yields, to
+    completion. Returns the result of walker.
+    """
+    stack = []
+    value = None
+    error = None
+    while True:
+        try:
+            if error is None:
+                request = walker.send(value)
+            else:
+                thrown, error = error, None
+                request = walker.throw(thrown)
+        except StopIteration as stop:
+            if not stack:
+                return stop.value
+            value = stop.value
+            walker = stack.pop()
+            continue
+        except Exception as e:
+            if not stack:
+                raise
+            error = e
+            walker = stack.pop()
+            continue
+
+        handler, data, try_all, key = request
+        try:
+            nested = _walkers[handler.tag](handler, data, try_all, key)
+        except Exception as e:
+            error = e
+            continue
+        if type(nested) is GeneratorType:
+            stack.append(walker)
+            walker = nested
+            value = None
+        else:
+            value = nested
+
+
+def compile_deserializer(rule) -> Callable[..., Any]:
+    """
+    Like ``compile_deserializer`` in ``dict_deserializer.deserializer``, but
+    the returned plan deserializes without recursing.
+
+    :param rule: The rule (or type) to compile.
+    :return: A function ``plan(data, try_all=True, key='[root]')``.
+    """
+    rule = Rule.to_rule(rule)
+    t = rule.type
+    default = rule.default
+
+    def _plan(data, try_all=True, key='[root]'):
+        handler = _get_handler(t)
+        if handler.nested:
+            value = _walkers[handler.tag](handler, data, try_all, key)
+            if type(value) is GeneratorType:
+                value = _run(value)
+        else:
+            value = handler.plan(data, try_all, key)
+        if type(value) is _Mismatch:
+            raise value.error()
+        if value is None:
+            return default
+        return value
+
+    return _plan
+
+
+def deserialize(rule: Rule, data, try_all: bool = True,
+                key: str = '[root]'):
+    """
+    Converts the passed in data into a type that is compatible with rule,
+    exactly like ``deserialize`` in ``dict_deserializer.deserializer``, but
+    for data of any depth.
+
+    :param rule: The rule (or type) to deserialize into.
+    :param data: The data to deserialize.
+    :param try_all: Whether to attempt other subtypes when a TypeError has
+        occurred.
+    :param key: Used for exceptions and error reporting.
+    :return: An instance matching rule.
+    """
+    return compile_deserializer(rule)(data, try_all, key)
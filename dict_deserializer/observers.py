@@ -0,0 +1,143 @@
+"""
+Observers receive events while deserializing, which helps to find out why a
+payload is slow to deserialize. Pass one to ``deserialize``::
+
+    stats = Stats()
+    deserialize(Rule(Object), data, observer=stats)
+    print(stats.as_dict())
+
+Or observe everything a block of code deserializes, using
+``dict_deserializer.deserializer.observe``.
+"""
+from typing import Any, Dict
+
+
+def _name(t) -> str:
+    if isinstance(t, type):
+        return t.__qualname__
+    return str(t)
+
+
+class Observer:
+    """
+    Base class for all observers. All events are ignored by default.
+
+    ``t`` is always the type that was deserialized into, as found in the
+    annotations. ``cls`` is a candidate class: t itself, or one of its
+    subclasses.
+    """
+
+    def instantiated(self, t: type, cls: type, candidates: int, depth: int,
+                     elapsed: float):
+        """
+        Data was deserialized into cls.
+
+        :param t: The type that was deserialized into.
+        :param cls: The class of the instance.
+        :param candidates: The amount of candidate classes that were tried,
+            including cls.
+        :param depth: The amount of objects this object is nested in, plus
+            one.
+        :param elapsed: The amount of seconds it took, including the time
+            spent on nested objects.
+        """
+
+    def failed(self, t: type, candidates: int, depth: int, elapsed: float):
+        """
+        Data could not be deserialized into t, or any of its subclasses.
+        """
+
+    def candidate_failed(self, t: type, cls: type):
+        """
+        Candidate cls did not match, after which the next candidate is tried
+        (since try_all is True).
+        """
+
+    def candidate_skipped(self, t: type, cls: type):
+        """
+        Candidate cls was not tried, since the data lacks a key it requires.
+        """
+
+    def union_branch_failed(self, t, arg):
+        """
+        Type argument arg of Union t did not match, after which the next
+        argument is tried.
+        """
+
+
+class Stats(Observer):
+    """
+    Collects statistics, per type that is deserialized into.
+    """
+
+    def __init__(self):
+        self.types = {}
+        self.candidate_misses = 0
+        self.candidate_skips = 0
+        self.union_misses = 0
+        self.max_depth = 0
+
+    def _type(self, t) -> Dict[str, Any]:
+        name = _name(t)
+        stats = self.types.get(name)
+        if stats is None:
+            stats = self.types[name] = {
+                'count': 0,
+                'failures': 0,
+                'time': 0.0,
+                'candidates': 0,
+                'candidate_misses': 0,
+                'candidate_skips': 0,
+                'union_misses': 0,
+            }
+        return stats
+
+    def instantiated(self, t, cls, candidates, depth, elapsed):
+        stats = self._type(t)
+        stats['count'] += 1
+        stats['time'] += elapsed
+        stats['candidates'] += candidates
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def failed(self, t, candidates, depth, elapsed):
+        stats = self._type(t)
+        stats['failures'] += 1
+        stats['time'] += elapsed
+        stats['candidates'] += candidates
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def candidate_failed(self, t, cls):
+        self._type(t)['candidate_misses'] += 1
+        self.candidate_misses += 1
+
+    def candidate_skipped(self, t, cls):
+        self._type(t)['candidate_skips'] += 1
+        self.candidate_skips += 1
+
+    def union_branch_failed(self, t, arg):
+        self._type(t)['union_misses'] += 1
+        self.union_misses += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the statistics as a dict of plain values.
+
+        ``types`` maps the name of each type to the amount of times it was
+        deserialized into (``count``) or failed to (``failures``), the
+        seconds spent on it including nested objects (``time``), the amount
+        of candidate classes tried in total (``candidates``), how many of
+        those did not match (``candidate_misses``), and how many were not
+        tried since a key was missing (``candidate_skips``). For Unions, it
+        holds the amount of type arguments that did not match
+        (``union_misses``).
+        """
+        return {
+            'types': {name: dict(stats)
+                      for name, stats in self.types.items()},
+            'candidate_misses': self.candidate_misses,
+            'candidate_skips': self.candidate_skips,
+            'union_misses': self.union_misses,
+            'max_depth': self.max_depth,
+        }
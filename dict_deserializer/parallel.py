@@ -0,0 +1,160 @@
+"""
+Deserializes large top-level collections in a pool of processes.
+
+Example::
+
+    from dict_deserializer.parallel import ParallelDeserializer
+
+    with ParallelDeserializer(List[User], workers=4) as parallel:
+        users = parallel.deserialize(payload)
+
+The classes that are deserialized into have to be importable by the worker
+processes, just like anything else that is sent to a process pool.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from dict_deserializer.deserializer import Rule, _compile, _compile_check, \
+    _compile_many, _is_dict, _is_list, _Mismatch, compile_deserializer
+
+
+def _deserialize_list_chunk(t, items: list, try_all: bool, key, start: int) \
+        -> list:
+    """
+    Deserializes items, which start at index start of the complete list,
+    into a list of elements of type t.
+    """
+    result = _compile_many(t)(items, try_all, key)
+    if type(result) is not _Mismatch:
+        return result
+
+    # Find the failing element again, so its global index is reported.
+    plan = _compile(t)
+    for i, v in enumerate(items, start):
+        value = plan(v, try_all, (key, i))
+        if type(value) is _Mismatch:
+            raise value.error()
+    raise result.error()
+
+
+def _deserialize_dict_chunk(key_type, value_type, items: List[Tuple],
+                            try_all: bool, key) -> List[Tuple]:
+    """
+    Deserializes the (key, value) pairs of a part of a dict.
+    """
+    key_plan = _compile(key_type)
+    value_plan = _compile(value_type)
+
+    result = []
+    for k, v in items:
+        dict_key = key_plan(k, try_all, (key, k))
+        if type(dict_key) is _Mismatch:
+            raise dict_key.error()
+        dict_value = value_plan(v, try_all, (key, dict_key))
+        if type(dict_value) is _Mismatch:
+            raise dict_value.error()
+        result.append((dict_key, dict_value))
+    return result
+
+
+class ParallelDeserializer:
+    """
+    Deserializes ``List[T]`` and ``Dict[K, T]`` payloads by splitting them
+    into chunks, which are deserialized in a ``ProcessPoolExecutor``.
+
+    The result, and the errors that are raised, are the same as those of
+    ``deserialize``: elements are returned in order, and errors report the
+    path of the element in the complete collection. Other types, and
+    collections that fit in a single chunk, are deserialized in the calling
+    process.
+    """
+
+    def __init__(self, rule, workers: Optional[int] = None,
+                 chunk_size: int = 1000, executor: Optional[Executor] = None):
+        """
+        :param rule: The rule (or type) to deserialize into.
+        :param workers: The number of processes to use. Defaults to the
+            number of processors.
+        :param chunk_size: The number of elements that is sent to a worker
+            at once.
+        :param executor: (Optionally) the executor to use. It is not shut
+            down by ``close()``.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1.')
+
+        self.rule = Rule.to_rule(rule)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._plan = compile_deserializer(self.rule)
+        self._check = _compile_check(self.rule.type)
+
+    def __enter__(self) -> 'ParallelDeserializer':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the worker processes, if they were started by this
+        deserializer.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def deserialize(self, data, try_all: bool = True, key: str = '[root]') \
+            -> Any:
+        """
+        Converts data into a type that is compatible with the rule.
+
+        :param data: The (parsed) payload.
+        :param try_all: Whether to attempt other subtypes when a TypeError
+            has occurred.
+        :param key: Used for error reporting.
+        :return: An instance matching the rule.
+        """
+        t = self.rule.type
+        size = self.chunk_size
+        args = getattr(t, '__args__', ())
+
+        if _is_list(t) and len(args) == 1 and type(data) == list and \
+                len(data) > size and not self._check(data):
+            starts = range(0, len(data), size)
+            chunks = self._get_executor().map(
+                _deserialize_list_chunk,
+                [args[0]] * len(starts),
+                [data[i:i + size] for i in starts],
+                [try_all] * len(starts),
+                [key] * len(starts),
+                starts)
+            result = []
+            for chunk in chunks:
+                result.extend(chunk)
+            return result
+
+        if _is_dict(t) and len(args) == 2 and isinstance(data, dict) and \
+                len(data) > size and not self._check(data):
+            items = list(data.items())
+            starts = range(0, len(items), size)
+            chunks = self._get_executor().map(
+                _deserialize_dict_chunk,
+                [args[0]] * len(starts),
+                [args[1]] * len(starts),
+                [items[i:i + size] for i in starts],
+                [try_all] * len(starts),
+                [key] * len(starts))
+            result = {}
+            for chunk in chunks:
+                result.update(chunk)
+            return result
+
+        return self._plan(data, try_all, key)
@@ -0,0 +1,343 @@
+"""
+Deserializes the elements of large collections one at a time.
+
+A JSON document has to be parsed completely before ``deserialize`` can be
+called on it, so a list of a million users is held in memory three times
+over: as text, as dicts and as instances. ``iter_deserialize`` instead reads
+a JSON array or NDJSON file in chunks, and yields every element as soon as
+it has been parsed and deserialized::
+
+    from dict_deserializer.streaming import iter_deserialize
+
+    with open('users.json', 'rb') as f:
+        for user in iter_deserialize(Rule(User), f):
+            ...
+
+``aiter_deserialize`` does the same for an async iterable of chunks.
+"""
+import asyncio
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Iterator, List, Union
+
+from dict_deserializer.deserializer import Rule, compile_deserializer
+
+_whitespace = ' \t\n\r'
+# The characters that matter while scanning an element, outside and inside
+# of strings.
+_structural = re.compile(r'[\[\]{}"]')
+_string_special = re.compile(r'["\\]')
+# The characters that end a number, true, false or null.
+_literal_end = re.compile(r'[ \t\n\r,\]]')
+# The amount of characters aiter_deserialize parses at once, before handing
+# control back to the event loop.
+_slice_size = 65536
+
+
+class JSONStreamParser:
+    """
+    Incrementally parses a stream of JSON text that is either a single
+    top-level JSON array, or newline-delimited JSON (NDJSON). Which of the two
+    it is, is decided by the first non-whitespace character.
+
+    Text is pushed into the parser with ``feed``, which returns the top-level
+    elements that were completed by it. Only the element that is currently
+    being received is kept in memory.
+
+    Every character is scanned once: the parser keeps track of the nesting
+    and strings of the element that is being received, and only decodes it
+    once it is complete. A malformed element therefore fails as soon as it
+    ends, and the time taken is linear in the size of the stream.
+    """
+
+    def __init__(self):
+        # One of: 'start', 'value' (expecting an element), 'first' (expecting
+        # an element or the end of the array), 'separator' (expecting a comma
+        # or the end of the array), 'end' (array closed) and 'ndjson'.
+        self._state = 'start'
+        # The text received so far of the element (or NDJSON line) that is
+        # not complete yet, and whether there is one.
+        self._pending = []
+        self._receiving = False
+        # Where the scan of the pending element is: whether it is a number or
+        # literal, its nesting depth, whether it is in a string, and whether
+        # the previous chunk ended in the middle of an escape sequence.
+        self._literal = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        """
+        Adds text to the stream.
+
+        :param text: The next chunk of JSON text.
+        :return: The elements that were completed by this chunk.
+        :raise ValueError: When the stream is not valid JSON.
+        """
+        if self._state == 'start':
+            stripped = text.lstrip(_whitespace)
+            if not stripped:
+                return []
+            if stripped[0] == '[':
+                self._state = 'first'
+                text = stripped[1:]
+            else:
+                self._state = 'ndjson'
+                text = stripped
+
+        if self._state == 'ndjson':
+            return self._parse_lines(text)
+        return self._parse_array(text)
+
+    def close(self) -> List[Any]:
+        """
+        Signals the end of the stream.
+
+        :return: The elements that were still pending.
+        :raise ValueError: When the stream ended in the middle of an element
+            or of the array.
+        """
+        items = []
+        if self._state == 'ndjson':
+            line = ''.join(self._pending)
+            self._pending = []
+            if line.strip(_whitespace):
+                items.append(json.loads(line))
+        elif self._receiving and self._literal:
+            # A number at the very end of the stream.
+            items.append(self._complete(''))
+
+        if self._state not in ('start', 'end', 'ndjson') or self._receiving:
+            raise ValueError('Unexpected end of JSON stream.')
+        return items
+
+    def _parse_lines(self, text: str) -> List[Any]:
+        items = []
+        pos = 0
+        while True:
+            newline = text.find('\n', pos)
+            if newline < 0:
+                if pos < len(text):
+                    self._pending.append(text[pos:])
+                return items
+            line = ''.join(self._pending) + text[pos:newline]
+            self._pending = []
+            if line.strip(_whitespace):
+                items.append(json.loads(line))
+            pos = newline + 1
+
+    def _parse_array(self, text: str) -> List[Any]:
+        items = []
+        pos = 0
+        end = len(text)
+
+        while True:
+            if not self._receiving:
+                while pos < end and text[pos] in _whitespace:
+                    pos += 1
+                if pos == end:
+                    break
+
+                if self._state == 'end':
+                    raise ValueError('Unexpected data after JSON array.')
+
+                if self._state in ('first', 'separator') and \
+                        text[pos] == ']':
+                    self._state = 'end'
+                    pos += 1
+                    continue
+
+                if self._state == 'separator':
+                    if text[pos] != ',':
+                        raise ValueError('Expected "," or "]" in JSON array, '
+                                         'got {!r}.'.format(text[pos]))
+                    self._state = 'value'
+                    pos += 1
+                    continue
+
+                self._receiving = True
+                self._literal = text[pos] not in '[{"'
+
+            start = pos
+            pos = self._scan(text, pos)
+            if pos is None:
+                # The element continues in the next chunk.
+                self._pending.append(text[start:])
+                break
+
+            items.append(self._complete(text[start:pos]))
+            self._state = 'separator'
+
+        return items
+
+    def _scan(self, text: str, pos: int):
+        """
+        Continues scanning the pending element at pos. Returns the position
+        right after its end, or None when it does not end in text.
+        """
+        if self._literal:
+            # Only complete once something follows, since a number might
+            # continue in the next chunk.
+            match = _literal_end.search(text, pos)
+            return None if match is None else match.start()
+
+        end = len(text)
+        if self._escape:
+            if pos == end:
+                return None
+            self._escape = False
+            pos += 1
+
+        while True:
+            if self._in_string:
+                match = _string_special.search(text, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                if match.group() == '\\':
+                    if pos == end:
+                        self._escape = True
+                        return None
+                    pos += 1
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+            else:
+                match = _structural.search(text, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                c = match.group()
+                if c == '"':
+                    self._in_string = True
+                elif c in '[{':
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+
+    def _complete(self, text: str):
+        """
+        Decodes the pending element, of which text is the last part.
+        """
+        element = ''.join(self._pending) + text
+        self._pending = []
+        self._receiving = False
+        self._depth = 0
+        return json.loads(element)
+
+
+def _read_chunks(source, chunk_size: int) -> Iterator[str]:
+    decoder = None
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = decoder.decode(chunk)
+        yield chunk
+
+    if decoder is not None:
+        yield decoder.decode(b'', final=True)
+
+
+def _iter_parsed(source, chunk_size: int) -> Iterator[Any]:
+    parser = JSONStreamParser()
+    for chunk in _read_chunks(source, chunk_size):
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
+
+
+def iter_deserialize(rule, source, try_all: bool = True,
+                     key: str = '[root]', chunk_size: int = 65536) \
+        -> Iterator[Any]:
+    """
+    Deserializes the elements of a (possibly very large) collection one at a
+    time, so that neither the input nor the output has to be held in memory
+    completely.
+
+    :param rule: The rule (or type) of a single element.
+    :param source: Either an iterable of already parsed elements, or a file
+        object (text or binary) containing a JSON array or NDJSON.
+    :param try_all: Whether to attempt other subtypes when a TypeError has
+        occurred.
+    :param key: Used for error reporting. Errors report the path of the
+        element as ``<key>.<index>``.
+    :param chunk_size: The amount of characters (or bytes) to read from a
+        file object at once.
+    :return: An iterator of instances matching rule.
+    """
+    plan = compile_deserializer(Rule.to_rule(rule))
+
+    if hasattr(source, 'read'):
+        items = _iter_parsed(source, chunk_size)
+    elif isinstance(source, (str, bytes)):
+        raise TypeError('Expected an iterable of elements or a file object, '
+                        'but got {}.'.format(type(source).__name__))
+    else:
+        items = source
+
+    for i, item in enumerate(items):
+        yield plan(item, try_all, (key, i))
+
+
+async def aiter_deserialize(rule, source: AsyncIterable[Union[bytes, str]],
+                            try_all: bool = True, key: str = '[root]',
+                            yield_every: int = 100) -> AsyncIterator[Any]:
+    """
+    Like ``iter_deserialize``, but reads the JSON array or NDJSON from an
+    asynchronous source, such as a request body or an
+    ``asyncio.StreamReader``. Elements are yielded as soon as they have been
+    received completely.
+
+    Parsing and deserializing are not asynchronous themselves, so control is
+    handed back to the event loop every yield_every elements, and after
+    every 64 KiB of a chunk is parsed. This keeps large chunks from blocking
+    other tasks. A single element is still deserialized in one go.
+
+    :param rule: The rule (or type) of a single element.
+    :param source: An async iterable of chunks of JSON text (bytes or str).
+    :param try_all: Whether to attempt other subtypes when a TypeError has
+        occurred.
+    :param key: Used for error reporting. Errors report the path of the
+        element as ``<key>.<index>``.
+    :param yield_every: The amount of elements after which the event loop
+        gets to run other tasks.
+    :return: An async iterator of instances matching rule.
+    """
+    if yield_every < 1:
+        raise ValueError('yield_every must be at least 1.')
+    plan = compile_deserializer(Rule.to_rule(rule))
+    parser = JSONStreamParser()
+    decoder = None
+    i = 0
+
+    async for chunk in source:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = decoder.decode(chunk)
+        for start in range(0, len(chunk), _slice_size):
+            if start:
+                await asyncio.sleep(0)
+            for item in parser.feed(chunk[start:start + _slice_size]):
+                yield plan(item, try_all, (key, i))
+                i += 1
+                if i % yield_every == 0:
+                    await asyncio.sleep(0)
+
+    items = parser.feed(decoder.decode(b'', final=True)) \
+        if decoder is not None else []
+    for item in items + parser.close():
+        yield plan(item, try_all, (key, i))
+        i += 1
+        if i % yield_every == 0:
+            await asyncio.sleep(0)
@@ -0,0 +1,92 @@
+import unittest
+from typing import List, Union
+
+from dict_deserializer import adaptive
+from dict_deserializer.annotations import abstract
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+from dict_deserializer.observers import Stats
+
+
+@abstract
+class Event(Deserializable):
+    at: int
+
+
+class Created(Event):
+    source: int
+
+
+class Moved(Event):
+    source: str
+
+
+class Point(Deserializable):
+    x: int
+    y: int
+
+
+class Size(Deserializable):
+    width: int
+
+
+events = [{'at': i, 'source': 'a'} for i in range(10)]
+
+
+class TestAdaptive(unittest.TestCase):
+    def setUp(self):
+        adaptive.enable()
+
+    def tearDown(self):
+        adaptive.disable()
+
+    def test_WinningSubclassIsTriedFirst(self):
+        stats = Stats()
+        result = deserialize(Rule(List[Event]), events, observer=stats)
+
+        self.assertEqual([Moved] * 10, [type(e) for e in result])
+        self.assertEqual(list(range(10)), [e.at for e in result])
+        # Only the first event tries Created.
+        self.assertEqual(1, stats.as_dict()['candidate_misses'])
+
+    def test_WinningUnionArgumentIsTriedFirst(self):
+        stats = Stats()
+        data = [{'width': i} for i in range(10)]
+        result = deserialize(Rule(List[Union[Point, Size]]), data,
+                             observer=stats)
+
+        self.assertEqual(list(range(10)), [s.width for s in result])
+        self.assertEqual(1, stats.as_dict()['union_misses'])
+
+        # Data of another shape still matches in declaration order.
+        point = deserialize(Rule(Union[Point, Size]), {'x': 1, 'y': 2})
+        self.assertIsInstance(point, Point)
+
+    def test_ErrorsAreTheSame(self):
+        deserialize(Rule(List[Event]), events)
+        bad = {'at': 'now', 'source': 'a'}
+
+        with self.assertRaises(TypeError) as adapted:
+            deserialize(Rule(Event), bad)
+        adaptive.disable()
+        with self.assertRaises(TypeError) as ordered:
+            deserialize(Rule(Event), bad)
+        self.assertEqual(str(ordered.exception), str(adapted.exception))
+
+    def test_MemoryIsBounded(self):
+        adaptive.enable(size=2)
+        for i in range(5):
+            deserialize(Rule(Event), dict(events[0], **{'extra' + str(i): i}))
+        # noinspection PyProtectedMember
+        self.assertEqual(2, len(adaptive._winners))
+
+    def test_Disable(self):
+        deserialize(Rule(List[Event]), events)
+        adaptive.disable()
+
+        stats = Stats()
+        deserialize(Rule(List[Event]), events, observer=stats)
+        self.assertEqual(10, stats.as_dict()['candidate_misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from typing import Optional
+
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+
+
+class Base(Deserializable):
+    name: str
+
+
+class Child(Base):
+    age: int = 0
+
+
+class TestAttrs(unittest.TestCase):
+    def test_AttrsAreCached(self):
+        self.assertIs(Child.get_attrs(), Child.get_attrs())
+
+    def test_AttrsAreReadOnly(self):
+        with self.assertRaises(TypeError):
+            Child.get_attrs()['name'] = Rule(int)
+
+    def test_ClassAttributeChangeInvalidates(self):
+        class Thing(Deserializable):
+            name: str
+
+        attrs = Thing.get_attrs()
+        Thing.size = 5
+        self.assertIsNot(attrs, Thing.get_attrs())
+        self.assertEqual(5, Thing.get_attrs()['size'].default)
+        self.assertEqual(5, deserialize(Rule(Thing), {'name': 'a'}).size)
+
+        del Thing.size
+        self.assertNotIn('size', Thing.get_attrs())
+
+    def test_AnnotationChangeInvalidatesSubclasses(self):
+        class Parent(Deserializable):
+            name: str
+
+        class Sub(Parent):
+            pass
+
+        self.assertEqual('a', deserialize(Rule(Sub), {'name': 'a'}).name)
+
+        Parent.__annotations__['name'] = int
+        self.assertIs(int, Sub.get_attrs()['name'].type)
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Sub), {'name': 'a'})
+
+        Parent.__annotations__['extra'] = Optional[str]
+        self.assertIn('extra', Sub.__annotations__)
+
+    def test_ConstructorAcceptsAttributeMap(self):
+        # noinspection PyArgumentList
+        child = Child(Child.get_attrs(), name='Rolf')
+        self.assertEqual('Rolf', child.name)
+        self.assertIsNone(child.age)
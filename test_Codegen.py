@@ -0,0 +1,110 @@
+import unittest
+from typing import List, Optional
+
+from dict_deserializer import codegen, deserializer
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    register_handler, serialize, Rule
+from test_DirectoryExample import Object, User, DictTest
+from test_Property import Object as Validated
+
+
+directory = {
+    'name': 'IAPC',
+    'members': [
+        {'name': 'Rolf', 'full_name': 'Rolf van Kleef'},
+        {'name': 'Syscom', 'members': [
+            {'name': 'Kevin', 'full_name': 'Kevin Alberts',
+             'calling_name': 'Kevin'},
+        ]},
+    ],
+}
+
+invalid = [
+    (Rule(Object), {'name': 'Karel', 'full_name': 0.0}),
+    (Rule(Object), {'name': 'Rolf', 'full_name': 'Rolf', 'calling_name': 1}),
+    (Rule(List[User]), [{'name': 'Rolf'}]),
+    (Rule(DictTest), {'test': {'a': []}}),
+    (Rule(Validated), {'name': 'abcdefghijklmnopqrstuvwxyz'}),
+]
+
+
+class Measurement(Deserializable):
+    value: float
+    error: Optional[float]
+
+
+def _float_factory(t):
+    def _plan(data, try_all, key):
+        try:
+            return float(data)
+        except (TypeError, ValueError):
+            raise TypeError('Expected a number at <{}>.'.format(key))
+
+    return _plan
+
+
+class TestCodegen(unittest.TestCase):
+    def setUp(self):
+        self.sources = {}
+        codegen.enable(hook=self.sources.__setitem__)
+
+    def tearDown(self):
+        codegen.disable()
+
+    def test_SameResult(self):
+        generated = deserialize(Rule(Object), directory)
+        codegen.disable()
+        self.assertEqual(deserialize(Rule(Object), directory), generated)
+
+    def test_SameSerialization(self):
+        instance = deserialize(Rule(Object), directory)
+        generated = [serialize(Rule(Object), instance, skip_defaults)
+                     for skip_defaults in (False, True)]
+        self.assertIn('def serialize(instance):',
+                      codegen.get_serializer_source(User))
+        codegen.disable()
+        self.assertEqual([serialize(Rule(Object), instance, skip_defaults)
+                          for skip_defaults in (False, True)], generated)
+        self.assertEqual(directory, generated[1])
+
+    def test_SameErrors(self):
+        for rule, data in invalid:
+            for try_all in (True, False):
+                with self.assertRaises(TypeError) as generated:
+                    deserialize(rule, data, try_all=try_all)
+                codegen.disable()
+                with self.assertRaises(TypeError) as generic:
+                    deserialize(rule, data, try_all=try_all)
+                codegen.enable()
+                self.assertEqual(str(generic.exception),
+                                 str(generated.exception))
+
+    def test_RegisteredHandlersAreUsed(self):
+        def _unregister():
+            # noinspection PyProtectedMember
+            with deserializer._lock:
+                del deserializer._origin_factories[float]
+                del deserializer._class_factories[float]
+                deserializer._clear_plans()
+
+        register_handler(float, _float_factory)
+        self.addCleanup(_unregister)
+
+        data = {'value': '1.5', 'error': '0.25'}
+        generated = deserialize(Rule(Measurement), data)
+        self.assertEqual((1.5, 0.25), (generated.value, generated.error))
+        self.assertNotIn('isinstance', codegen.get_source(Measurement))
+        codegen.disable()
+        self.assertEqual(vars(deserialize(Rule(Measurement), data)),
+                         vars(generated))
+
+    def test_SourceIsAvailable(self):
+        deserialize(Rule(User), {'name': 'a', 'full_name': 'b'})
+        source = codegen.get_source(User)
+        self.assertIn('def build(data, try_all, key):', source)
+        self.assertIn("'full_name' in data", source)
+        self.assertEqual(source, self.sources[User])
+
+    def test_DisabledHasNoSource(self):
+        codegen.disable()
+        self.assertIsNone(codegen.get_source(User))
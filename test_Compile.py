@@ -0,0 +1,94 @@
+import unittest
+from typing import List, Optional, Dict, Tuple
+
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    compile_deserializer, Rule
+
+
+class Item(Deserializable):
+    name: str
+    amount: int = 1
+
+    def __eq__(self, other):
+        return isinstance(other, Item) and other.name == self.name and \
+            other.amount == self.amount
+
+
+class Basket(Deserializable):
+    items: List[Item]
+    owner: Optional[Item]
+
+
+class TestCompile(unittest.TestCase):
+    def test_PlanIsCachedPerType(self):
+        self.assertIs(compile_deserializer(Rule(List[Item])),
+                      compile_deserializer(List[Item]))
+
+    def test_PlanMatchesDeserialize(self):
+        plan = compile_deserializer(Rule(Basket))
+        data = {'items': [{'name': 'apple'}, {'name': 'pear', 'amount': 3}],
+                'owner': None}
+
+        basket = plan(data)
+        self.assertEqual([Item(name='apple', amount=1),
+                          Item(name='pear', amount=3)], basket.items)
+        self.assertIsNone(basket.owner)
+        self.assertEqual(basket.items, deserialize(Rule(Basket), data).items)
+
+    def test_OptionalClassDeserializes(self):
+        basket = deserialize(Rule(Basket), {
+            'items': [],
+            'owner': {'name': 'Rolf'},
+        })
+        self.assertEqual(Item(name='Rolf', amount=1), basket.owner)
+
+    def test_PlanWithDefault(self):
+        plan = compile_deserializer(Rule(Optional[int], default=5))
+        self.assertEqual(5, plan(None))
+        self.assertEqual(3, plan(3))
+
+    def test_PlanReportsKey(self):
+        plan = compile_deserializer(Rule(List[int]))
+        with self.assertRaisesRegex(TypeError, r'<\[root\]\.1>'):
+            plan([1, 'two'])
+
+    def test_NestedErrorWithoutTryAll(self):
+        with self.assertRaisesRegex(
+                TypeError, r'^Expected something of type int, but got type '
+                           r'str at <\[root\]\.items\.0\.amount>\.$'):
+            deserialize(Rule(Basket), {
+                'items': [{'name': 'apple', 'amount': 'many'}],
+            }, try_all=False)
+
+    def test_PathIsFormattedOnError(self):
+        with self.assertRaisesRegex(
+                TypeError, r'^Expected something of type int, but got type '
+                           r'str at <\[root\]\.a\.1\.0>\.$'):
+            deserialize(Rule(Dict[str, List[Tuple[int]]]),
+                        {'a': [[1], ['x']]})
+
+
+class TestNativeChecks(unittest.TestCase):
+    def test_NativeChecksAgreeWithTypeguard(self):
+        from typeguard import check_type
+        from dict_deserializer.deserializer import _compile_check
+
+        values = [0, 1, True, False, 1.5, 1j, 'a', b'a', bytearray(b'a'),
+                  None, {}, [], (), {'a': 1}, [1]]
+        types = [int, float, complex, bool, str, bytes, dict, list,
+                 type(None)]
+
+        for t in types:
+            for value in values:
+                try:
+                    check_type('value', value, t)
+                    expected = True
+                except TypeError:
+                    expected = False
+                self.assertEqual(expected, _compile_check(t)(value),
+                                 '{!r} as {}'.format(value, t))
+
+    def test_IntIsNotAcceptedForBool(self):
+        with self.assertRaises(TypeError):
+            deserialize(Rule(bool), 1)
+        self.assertIs(True, deserialize(Rule(int), True))
@@ -0,0 +1,155 @@
+import unittest
+from typing import Any, List, Optional
+
+from dict_deserializer.annotations import abstract, discriminate, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    get_deserialization_classes, Rule
+
+
+@abstract
+class Shape(Deserializable):
+    name: str
+
+
+@discriminate('type', 'circle')
+class Circle(Shape):
+    radius: float
+
+
+@discriminate('type', 'square')
+class Square(Shape):
+    size: float
+
+
+@discriminate('rounded', True)
+class RoundedSquare(Square):
+    pass
+
+
+@discriminate(matcher=lambda d: 'points' in d)
+class Polygon(Shape):
+    points: int
+
+
+@abstract
+class Item(Deserializable):
+    name: str
+
+
+class Document(Item):
+    pages: int
+    author: Optional[str]
+    extra: Any
+    title: str = 'untitled'
+
+
+class Folder(Item):
+    items: List[Item]
+
+    @validated()
+    def owner(self, value):
+        if value is None:
+            raise TypeError('owner is required')
+
+
+class TestDispatch(unittest.TestCase):
+    def test_KeyValueDispatch(self):
+        self.assertEqual([Circle], get_deserialization_classes(
+            Shape, {'type': 'circle'}))
+        self.assertEqual([Square], get_deserialization_classes(
+            Shape, {'type': 'square'}))
+        self.assertEqual([], get_deserialization_classes(
+            Shape, {'type': 'triangle'}))
+
+    def test_UnhashableValueDoesNotMatch(self):
+        self.assertEqual([], get_deserialization_classes(
+            Shape, {'type': ['circle']}))
+
+    def test_NestedDiscriminators(self):
+        self.assertEqual([RoundedSquare, Square], get_deserialization_classes(
+            Shape, {'type': 'square', 'rounded': True}))
+        self.assertIsInstance(deserialize(Rule(Shape), {
+            'type': 'square', 'rounded': True, 'name': 'a', 'size': 1.0,
+        }), RoundedSquare)
+
+    def test_FunctionDiscriminator(self):
+        self.assertEqual([Polygon], get_deserialization_classes(
+            Shape, {'points': 5}))
+
+    def test_LateDiscriminatorIsIndexed(self):
+        @abstract
+        class Animal(Deserializable):
+            pass
+
+        class Cat(Animal):
+            pass
+
+        self.assertEqual([Cat], get_deserialization_classes(
+            Animal, {'kind': 'dog'}))
+
+        discriminate('kind', 'cat')(Cat)
+        self.assertEqual([], get_deserialization_classes(
+            Animal, {'kind': 'dog'}))
+
+        class Dog(Animal):
+            pass
+
+        self.assertEqual([Dog], get_deserialization_classes(
+            Animal, {'kind': 'dog'}))
+
+
+class TestRequiredKeys(unittest.TestCase):
+    def test_RequiredKeys(self):
+        # noinspection PyProtectedMember
+        from dict_deserializer.deserializer import _get_required
+        self.assertEqual({'name', 'pages'}, _get_required(Document))
+        # Validators are not run to find out whether None is accepted.
+        self.assertEqual({'name', 'items'}, _get_required(Folder))
+
+    def test_CandidatesMissingKeysAreSkipped(self):
+        calls = []
+
+        @abstract
+        class Base(Deserializable):
+            name: str
+
+        class Watched(Base):
+            pages: int
+
+            @validated()
+            def size(self, value):
+                calls.append(value)
+
+        class Other(Base):
+            items: List[Base]
+
+        other = deserialize(Rule(Base), {
+            'name': 'root', 'items': [{'name': 'doc', 'pages': 3}]})
+        self.assertIsInstance(other, Other)
+        self.assertIsInstance(other.items[0], Watched)
+        # Watched was only tried for the element that has 'pages'.
+        self.assertEqual([None], calls)
+
+        folder = deserialize(Rule(Item), {
+            'name': 'root', 'owner': 'me',
+            'items': [{'name': 'doc', 'pages': 3}]})
+        self.assertIsInstance(folder, Folder)
+        self.assertIsInstance(folder.items[0], Document)
+
+    def test_ErrorIsTheSame(self):
+        @abstract
+        class Base(Deserializable):
+            name: str
+
+        class First(Base):
+            first: int
+
+        class Last(Base):
+            last: int
+
+        with self.assertRaises(TypeError) as e:
+            deserialize(Rule(Base), {'name': 'x', 'first': 'one'})
+        # The cause is that of the last candidate, like without skipping.
+        self.assertTrue(str(e.exception).endswith(
+            'Reason: Expected something of type int, but got type NoneType '
+            'at <[root].last>.'))
@@ -0,0 +1,54 @@
+import unittest
+from datetime import date
+from typing import Set, List, Dict
+
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    compile_deserializer, register_handler, Rule
+
+
+def _set_factory(t):
+    item_plan = compile_deserializer(Rule(t.__args__[0]))
+
+    def _plan(data, try_all, key):
+        if not isinstance(data, list):
+            raise TypeError('Expected a list for a set at <{}>.'.format(key))
+        return {item_plan(v, try_all, (key, i)) for i, v in enumerate(data)}
+
+    return _plan
+
+
+def _date_factory(t):
+    def _plan(data, try_all, key):
+        if isinstance(data, t):
+            return data
+        try:
+            return t.fromisoformat(data)
+        except (TypeError, ValueError):
+            raise TypeError('Invalid date at <{}>.'.format(key))
+
+    return _plan
+
+
+register_handler(set, _set_factory)
+register_handler(date, _date_factory)
+
+
+class Calendar(Deserializable):
+    days: Set[date]
+    notes: Dict[date, List[str]]
+
+
+class TestHandlers(unittest.TestCase):
+    def test_RegisteredHandlersAreUsed(self):
+        calendar = deserialize(Rule(Calendar), {
+            'days': ['2020-01-01', '2020-01-02', '2020-01-01'],
+            'notes': {'2020-01-01': ['New year']},
+        })
+        self.assertEqual({date(2020, 1, 1), date(2020, 1, 2)}, calendar.days)
+        self.assertEqual({date(2020, 1, 1): ['New year']}, calendar.notes)
+
+    def test_ErrorsCarryThePath(self):
+        with self.assertRaisesRegex(
+                TypeError, r'^Invalid date at <\[root\]\.days\.1>\.$'):
+            deserialize(Rule(Calendar), {'days': ['2020-01-01', 'never'],
+                                         'notes': {}}, try_all=False)
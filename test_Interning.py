@@ -0,0 +1,151 @@
+import json
+import unittest
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+from dict_deserializer.interning import Interner
+
+
+class Member(Deserializable):
+    name: str
+    group: str
+    tags: List[str]
+    labels: Dict[str, int]
+    alias: Optional[str]
+    position: Tuple[int, int]
+
+
+class Label(Deserializable):
+    name: str
+
+
+class Team(Deserializable):
+    name: str
+    members: List[Member]
+
+
+def members(n):
+    # json.loads creates a new string object for every string.
+    return json.loads(json.dumps([
+        {'name': 'm{}'.format(i), 'group': 'group{}'.format(i % 2),
+         'tags': ['tag'], 'labels': {'label': i}, 'alias': 'alias',
+         'position': [1, 2]}
+        for i in range(n)]))
+
+
+class TestInterning(unittest.TestCase):
+    def test_StringsAreShared(self):
+        data = members(4)
+        self.assertIsNot(data[0]['group'], data[2]['group'])
+
+        result = deserialize(Rule(List[Member]), data, interner=Interner())
+        self.assertIs(result[0].group, result[2].group)
+        self.assertIs(result[0].tags[0], result[1].tags[0])
+        self.assertIs(list(result[0].labels)[0], list(result[1].labels)[0])
+        self.assertIs(result[0].alias, result[1].alias)
+        self.assertEqual(['m0', 'm1', 'm2', 'm3'],
+                         [m.name for m in result])
+
+    def test_SameResult(self):
+        data = members(10)
+        plain = deserialize(Rule(List[Member]), data)
+        interned = deserialize(Rule(List[Member]), data, interner=Interner())
+        for a, b in zip(plain, interned):
+            self.assertEqual(a.__dict__, b.__dict__)
+
+        with self.assertRaises(TypeError):
+            deserialize(Rule(List[Member]), [dict(data[0], tags=[1])],
+                        interner=Interner())
+
+    def test_UnionsPickTheSameArgument(self):
+        cases = [
+            (Union[Label, Dict[str, Any]], {'name': 'x'}),
+            (Union[Tuple[int, int], List[int]], [1, 2]),
+            (Union[List[str], Dict[str, str]], {'a': 'b'}),
+        ]
+        for t, data in cases:
+            plain = deserialize(Rule(t), data)
+            interned = deserialize(Rule(t), data, interner=Interner())
+            self.assertIs(type(plain), type(interned))
+            self.assertEqual(plain, interned)
+
+        data = json.loads('[["tag"], ["tag"]]')
+        result = deserialize(Rule(List[Optional[List[str]]]), data,
+                             interner=Interner())
+        self.assertIs(result[0][0], result[1][0])
+
+    def test_ReusedAcrossCalls(self):
+        interner = Interner()
+        first = deserialize(Rule(Member), members(1)[0], interner=interner)
+        second = deserialize(Rule(Member), members(1)[0], interner=interner)
+        self.assertIs(first.group, second.group)
+
+    def test_Policy(self):
+        data = {'name': 'team', 'members': members(2)}
+
+        result = deserialize(Rule(Team), data,
+                             interner=Interner(types=[Member]))
+        self.assertIs(result.members[0].alias, result.members[1].alias)
+
+        result = deserialize(Rule(Team), data,
+                             interner=Interner(fields=[(Member, 'tags')]))
+        self.assertIs(result.members[0].tags[0], result.members[1].tags[0])
+        self.assertIsNot(result.members[0].alias, result.members[1].alias)
+
+        result = deserialize(Rule(Team), data,
+                             interner=Interner(types=[Team]))
+        self.assertIsNot(result.members[0].alias, result.members[1].alias)
+
+    def test_BoundedTable(self):
+        interner = Interner(size=2)
+        for word in ['a', 'b', 'c', 'd']:
+            interner.intern(''.join([word, word]))
+        self.assertEqual(2, interner.as_dict()['size'])
+        self.assertEqual(4, interner.as_dict()['misses'])
+
+        # Strings in the table are still shared.
+        self.assertIs(interner.intern(''.join(['a', 'a'])),
+                      interner.intern(''.join(['a', 'a'])))
+        self.assertEqual(2, interner.as_dict()['hits'])
+
+        with self.assertRaises(ValueError):
+            Interner(size=0)
+
+    def test_Tuples(self):
+        data = members(3)
+        result = deserialize(Rule(List[Member]), data, interner=Interner())
+        self.assertIsNot(result[0].position, result[1].position)
+
+        result = deserialize(Rule(List[Member]), data,
+                             interner=Interner(tuples=True))
+        self.assertIs(result[0].position, result[1].position)
+
+        interner = Interner()
+        self.assertIs(type(interner.dedupe((1,))[0]), int)
+        self.assertIs(type(interner.dedupe((True,))[0]), bool)
+        self.assertIs(type(interner.dedupe(((1.0,),))[0][0]), float)
+        self.assertIs(type(interner.dedupe(((1,),))[0][0]), int)
+
+    def test_Stats(self):
+        interner = Interner()
+        deserialize(Rule(List[Member]), members(10), interner=interner)
+        stats = interner.as_dict()
+        self.assertGreater(stats['hits'], 0)
+        self.assertGreater(stats['bytes_saved'], 0)
+        self.assertEqual(stats['size'], stats['misses'])
+
+        interner.clear()
+        self.assertEqual({'size': 0, 'hits': 0, 'misses': 0,
+                          'bytes_saved': 0}, interner.as_dict())
+
+    def test_NotCombined(self):
+        with self.assertRaises(ValueError):
+            deserialize(Rule(Member), members(1)[0], interner=Interner(),
+                        lazy=True)
+        with self.assertRaises(ValueError):
+            deserialize(Rule(Member), members(1)[0], interner=Interner(),
+                        only={'name'})
+
+
+if __name__ == '__main__':
+    unittest.main()
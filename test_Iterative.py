@@ -0,0 +1,150 @@
+import unittest
+from typing import Dict, List, Optional, Tuple, Union
+
+from dict_deserializer import iterative
+from dict_deserializer.annotations import abstract, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+class Group(Object):
+    members: List[Object]
+
+
+class Account(Deserializable):
+    name: str
+
+    @validated()
+    def age(self, value):
+        if value is not None and value < 0:
+            raise TypeError('age must not be negative')
+
+
+class Node(Deserializable):
+    children: Dict[str, Union[int, 'Node']]
+    pair: Optional[Tuple[int, Object]]
+
+
+Node.__annotations__['children'] = Dict[str, Union[int, Node]]
+
+
+def plain(value):
+    """
+    Converts deserialized (shallow) values into comparable values.
+    """
+    if isinstance(value, Deserializable):
+        return type(value), {k: plain(v) for k, v in vars(value).items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(plain(v) for v in value)
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    return value
+
+
+def chain(depth: int, leaf: dict) -> dict:
+    data = leaf
+    for i in range(depth):
+        data = {'name': 'g{}'.format(i), 'members': [data]}
+    return data
+
+
+class TestIterative(unittest.TestCase):
+    def assertSameResult(self, rule, data, try_all=True):
+        expected = deserialize(rule, data, try_all)
+        result = iterative.deserialize(rule, data, try_all)
+        self.assertEqual(plain(expected), plain(result))
+        return result
+
+    def assertSameError(self, rule, data, try_all=True):
+        with self.assertRaises(TypeError) as expected:
+            deserialize(rule, data, try_all)
+        with self.assertRaises(TypeError) as result:
+            iterative.deserialize(rule, data, try_all)
+        self.assertEqual(str(expected.exception), str(result.exception))
+
+    def test_SameResults(self):
+        self.assertSameResult(Rule(int), 1)
+        self.assertSameResult(Rule(List[int]), [1, 2])
+        self.assertSameResult(Rule(Object), {'name': 'u', 'full_name': 'U'})
+        self.assertSameResult(Rule(Optional[Object]), None)
+
+        group = self.assertSameResult(Rule(Object), chain(3, {
+            'name': 'u', 'full_name': 'U', 'calling_name': None}))
+        user = group.members[0].members[0].members[0]
+        self.assertIsInstance(user, User)
+        self.assertEqual('Unknown', user.calling_name)
+
+        node = self.assertSameResult(Rule(Node), {
+            'children': {'a': 1, 'b': {'children': {}, 'pair': None}},
+            'pair': [1, {'name': 'u', 'full_name': 'U'}]})
+        self.assertIsInstance(node.children['b'], Node)
+        self.assertIsInstance(node.pair[1], User)
+
+    def test_SameErrors(self):
+        self.assertSameError(Rule(int), 'one')
+        self.assertSameError(Rule(List[int]), [1, 'two'])
+        self.assertSameError(Rule(Object), {'name': 'x'})
+        self.assertSameError(Rule(Object), chain(3, {
+            'name': 'u', 'full_name': 5}))
+        self.assertSameError(Rule(Object), chain(3, {
+            'name': 'u', 'full_name': 5}), try_all=False)
+        self.assertSameError(Rule(Node), {
+            'children': {'a': 'one'}, 'pair': None})
+        self.assertSameError(Rule(Node), {
+            'children': {}, 'pair': [1, {'name': 'u'}]})
+
+    def test_Validators(self):
+        self.assertSameError(Rule(Account), {'name': 'a', 'age': -1})
+        self.assertSameError(Rule(List[Union[Account, int]]),
+                             [{'name': 'a', 'age': 1},
+                              {'name': 'a', 'age': -1}])
+        self.assertSameError(Rule(List[Union[Account, int]]),
+                             [{'name': 'a', 'age': -1}], try_all=False)
+        with self.assertRaisesRegex(TypeError, 'must not be negative'):
+            iterative.deserialize(Rule(Account), {'name': 'a', 'age': -1},
+                                  try_all=False)
+
+    def test_DeepData(self):
+        depth = 20000
+        group = iterative.deserialize(Rule(Object), chain(
+            depth, {'name': 'u', 'full_name': 'U'}))
+
+        levels = 0
+        while isinstance(group, Group):
+            group = group.members[0]
+            levels += 1
+        self.assertEqual(depth, levels)
+        self.assertIsInstance(group, User)
+
+    def test_DeepError(self):
+        with self.assertRaisesRegex(TypeError, r'\.members\.0\.full_name>'):
+            iterative.deserialize(Rule(Group), chain(
+                20000, {'name': 'u', 'full_name': 5}), try_all=False)
+
+    def test_DeepErrorTryingAll(self):
+        with self.assertRaises(TypeError) as e:
+            iterative.deserialize(Rule(Group), chain(
+                20000, {'name': 'u', 'full_name': 5}))
+        message = str(e.exception)
+        self.assertTrue(message.startswith(
+            'Unable to find matching non-abstract (sub)type'))
+        self.assertIn('nested causes omitted', message)
+        self.assertLess(len(message), 10 ** 6)
+
+        with self.assertRaises(TypeError) as e:
+            iterative.deserialize(Rule(Group), chain(
+                5, {'name': 'u', 'full_name': 5}))
+        self.assertNotIn('omitted', str(e.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from typing import Dict, List, Optional
+
+from dict_deserializer.annotations import abstract, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    materialize, Rule
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+class Group(Object):
+    members: List[Object]
+
+
+class Base(Deserializable):
+    a: int
+
+
+class Numbers(Base):
+    c: List[int]
+
+
+class Words(Base):
+    c: List[str]
+
+
+validator_calls = []
+
+
+class Reading(Deserializable):
+    @validated()
+    def value(self, value):
+        validator_calls.append(value)
+
+
+class Sensor(Deserializable, slots=True):
+    name: str
+    readings: List[Reading]
+    latest: Optional[Reading]
+    labels: Dict[str, str]
+
+
+directory = {'name': 'root', 'members': [
+    {'name': 'u', 'full_name': 'U'},
+    {'name': 'g', 'members': [{'name': 'v', 'full_name': 'V'}]},
+]}
+
+sensor = {'name': 's', 'readings': [{'value': i} for i in range(100)],
+          'latest': {'value': 99}, 'labels': {'unit': 'C'}}
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        validator_calls.clear()
+
+    def test_NestedFieldsAreDeferred(self):
+        result = deserialize(Rule(Sensor), sensor, lazy=True)
+        self.assertEqual('s', result.name)
+        self.assertEqual([], validator_calls)
+
+        latest = result.latest
+        self.assertIsInstance(latest, Reading)
+        self.assertEqual([99], validator_calls)
+        self.assertIs(latest, result.latest)
+
+        self.assertEqual(list(range(100)), [r.value for r in result.readings])
+        self.assertEqual(101, len(validator_calls))
+        self.assertEqual({'unit': 'C'}, result.labels)
+
+    def test_NestedObjectsAreLazyToo(self):
+        root = deserialize(Rule(Object), directory, lazy=True)
+        self.assertIsInstance(root, Group)
+        self.assertEqual([User, Group], [type(m) for m in root.members])
+        self.assertEqual('V', root.members[1].members[0].full_name)
+        self.assertEqual('Unknown', root.members[0].calling_name)
+
+    def test_TopLevelShapeIsChecked(self):
+        with self.assertRaises(TypeError) as eager:
+            deserialize(Rule(Sensor), dict(sensor, readings={}))
+        with self.assertRaises(TypeError) as lazy:
+            deserialize(Rule(Sensor), dict(sensor, readings={}), lazy=True)
+        self.assertEqual(str(eager.exception), str(lazy.exception))
+
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Sensor), dict(sensor, name=1), lazy=True)
+
+    def test_ErrorsSurfaceOnAccess(self):
+        data = {'name': 'g', 'members': [{'name': 'u', 'full_name': 5}]}
+        with self.assertRaises(TypeError) as eager:
+            deserialize(Rule(Group), data)
+
+        group = deserialize(Rule(Group), data, lazy=True)
+        with self.assertRaises(TypeError) as lazy:
+            group.members
+        # The group itself was created, so only the member fails.
+        self.assertIn(str(lazy.exception), str(eager.exception))
+
+        group = deserialize(Rule(Group), data, lazy=True)
+        with self.assertRaises(TypeError):
+            materialize(group)
+
+    def test_Materialize(self):
+        root = deserialize(Rule(Object), directory, lazy=True)
+        self.assertIs(root, materialize(root))
+        self.assertFalse(hasattr(root, '_lazy'))
+        self.assertFalse(hasattr(root.members[1], '_lazy'))
+        self.assertEqual('V', root.members[1].members[0].full_name)
+
+        result = materialize(deserialize(Rule(Sensor), sensor, lazy=True))
+        self.assertEqual(101, len(validator_calls))
+        self.assertEqual(99, result.latest.value)
+
+    def test_SameSubclassAsEager(self):
+        data = {'a': 1, 'c': ['x']}
+        self.assertIsInstance(deserialize(Rule(Base), data), Words)
+        result = deserialize(Rule(Base), data, lazy=True)
+        self.assertIsInstance(result, Words)
+        self.assertEqual(['x'], result.c)
+
+        # Without trying other candidates, the first one is used, and its
+        # error is raised on access.
+        result = deserialize(Rule(Base), data, try_all=False, lazy=True)
+        self.assertIs(type(result), Numbers)
+        with self.assertRaises(TypeError):
+            result.c
+
+    def test_MissingAttributes(self):
+        root = deserialize(Rule(Object), directory, lazy=True)
+        with self.assertRaisesRegex(AttributeError, "'Group' object has no "
+                                                    "attribute 'missing'"):
+            root.missing
+        self.assertFalse(hasattr(User(), 'missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from typing import List, Optional
+
+from dict_deserializer.annotations import abstract, discriminate, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    deserialize_many, register_handler, Rule
+
+
+@abstract
+class Event(Deserializable):
+    at: int
+
+    def __eq__(self, other):
+        return type(other) is type(self) and vars(other) == vars(self)
+
+
+@discriminate('type', 'click')
+class Click(Event):
+    x: int
+    y: int
+
+
+@discriminate('type', 'key')
+class Key(Event):
+    code: str = 'a'
+
+
+class Inner(Deserializable):
+    n: int
+
+    @validated()
+    def n(self, value):
+        if value < 0:
+            raise ValueError('negative n')
+
+
+class Outer(Deserializable):
+    a: Inner
+    b: int
+
+
+class Money(Deserializable):
+    cents: int
+
+
+def _money_factory(t):
+    def _plan(data, try_all, key):
+        if not isinstance(data, dict):
+            raise TypeError('Expected an amount at <{}>.'.format(key))
+        return Money(cents=int(data['amount'] * 100))
+
+    return _plan
+
+
+register_handler(Money, _money_factory)
+
+
+class TestMany(unittest.TestCase):
+    def test_MatchesDeserializingOneByOne(self):
+        items = [{'type': 'click', 'at': i, 'x': i, 'y': -i}
+                 if i % 3 else {'type': 'key', 'at': i}
+                 for i in range(30)]
+
+        result = deserialize_many(Rule(Event), items)
+        self.assertEqual([deserialize(Rule(Event), item) for item in items],
+                         result)
+        self.assertEqual('a', result[0].code)
+        self.assertEqual(result, deserialize(Rule(List[Event]), items))
+
+    def test_ErrorIsReportedForFirstFailingElement(self):
+        items = [{'type': 'click', 'at': 0, 'x': 0, 'y': 0},
+                 {'type': 'click', 'at': 1, 'x': 1, 'y': 'one'},
+                 {'type': 'click', 'at': 'two', 'x': 2, 'y': 2}]
+
+        with self.assertRaises(TypeError) as many:
+            deserialize_many(Rule(Event), items, try_all=False)
+        with self.assertRaises(TypeError) as single:
+            deserialize(Rule(Event), items[1], key='[root].1', try_all=False)
+        self.assertEqual(str(single.exception), str(many.exception))
+
+    def test_ErrorOrderWithSeveralCandidates(self):
+        # The first element has one candidate class, the second has none
+        # (no discriminator matches), so it is deserialized on its own.
+        items = [{'type': 'click', 'at': 'zero', 'x': 0, 'y': 0},
+                 {'at': 'one'}]
+
+        with self.assertRaisesRegex(TypeError, r'<\[root\]\.0>') as many:
+            deserialize_many(Rule(Event), items)
+        with self.assertRaises(TypeError) as single:
+            deserialize(Rule(List[Event]), items)
+        self.assertEqual(str(single.exception), str(many.exception))
+
+    def test_ErrorOrderWithNestedValidators(self):
+        items = [{'a': {'n': 1}, 'b': 'x'}, {'a': {'n': -1}, 'b': 1}]
+        for try_all in (True, False):
+            with self.assertRaises((TypeError, ValueError)) as many:
+                deserialize_many(Rule(Outer), items, try_all=try_all)
+            with self.assertRaises((TypeError, ValueError)) as single:
+                deserialize(Rule(Outer), items[0], key='[root].0',
+                            try_all=try_all)
+            self.assertEqual(str(single.exception), str(many.exception))
+
+        with self.assertRaisesRegex(TypeError, r'<\[root\]\.0\.b>'):
+            deserialize(Rule(List[Outer]), items, try_all=False)
+
+    def test_RegisteredHandlersAreUsed(self):
+        items = [{'amount': 10, 'cents': 1}, {'amount': 0.5, 'cents': 2}]
+        self.assertEqual(1000, deserialize(Rule(Money), items[0]).cents)
+        self.assertEqual([1000, 50], [m.cents for m in deserialize_many(
+            Rule(Money), items)])
+        self.assertEqual([1000, 50], [m.cents for m in deserialize(
+            Rule(List[Money]), items)])
+
+    def test_Primitives(self):
+        self.assertEqual([1, 5, 3], deserialize_many(
+            Rule(Optional[int], default=5), [1, None, 3]))
@@ -0,0 +1,145 @@
+import threading
+import unittest
+from typing import List, Union
+
+from dict_deserializer.annotations import abstract
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    deserialize_many, observe, Rule
+from dict_deserializer import deserializer
+from dict_deserializer.observers import Observer, Stats
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+class User(Object):
+    full_name: str
+
+
+class Group(Object):
+    members: List[Object]
+
+
+class Point(Deserializable):
+    x: int
+    y: int
+
+
+class Size(Deserializable):
+    width: int
+
+
+data = {'name': 'root', 'members': [
+    {'name': 'u', 'full_name': 'U'},
+    {'name': 'g', 'members': [{'name': 'v', 'full_name': 'V'}]},
+]}
+
+
+class Events(Observer):
+    def __init__(self):
+        self.events = []
+
+    def instantiated(self, t, cls, candidates, depth, elapsed):
+        self.events.append(('instantiated', t, cls, candidates, depth))
+
+    def candidate_failed(self, t, cls):
+        self.events.append(('candidate_failed', t, cls))
+
+    def candidate_skipped(self, t, cls):
+        self.events.append(('candidate_skipped', t, cls))
+
+
+class TestObservers(unittest.TestCase):
+    def test_Events(self):
+        events = Events()
+        deserialize(Rule(Object), data, observer=events)
+
+        self.assertEqual([
+            ('candidate_skipped', Object, User),
+            ('instantiated', Object, User, 1, 2),
+            ('candidate_skipped', Object, User),
+            ('instantiated', Object, User, 1, 3),
+            ('instantiated', Object, Group, 1, 2),
+            ('instantiated', Object, Group, 1, 1),
+        ], events.events)
+
+    def test_Stats(self):
+        stats = Stats()
+        deserialize(Rule(Object), data, observer=stats)
+        deserialize(Rule(List[Union[Size, Point]]),
+                    [{'x': 1, 'y': 2}, {'width': 3}], observer=stats)
+        result = stats.as_dict()
+
+        self.assertEqual(3, result['max_depth'])
+        self.assertEqual(1, result['candidate_misses'])
+        self.assertEqual(2, result['candidate_skips'])
+        self.assertEqual(1, result['union_misses'])
+
+        objects = result['types']['Object']
+        self.assertEqual(4, objects['count'])
+        self.assertEqual(0, objects['failures'])
+        self.assertEqual(4, objects['candidates'])
+        self.assertEqual(0, objects['candidate_misses'])
+        self.assertEqual(2, objects['candidate_skips'])
+        self.assertGreater(objects['time'], 0)
+
+        self.assertEqual(1, result['types']['Size']['failures'])
+        self.assertEqual(1, result['types']['Size']['count'])
+        self.assertEqual(1, result['types']['Point']['count'])
+        self.assertEqual(
+            1, result['types'][str(Union[Size, Point])]['union_misses'])
+
+    def test_ObserveBlock(self):
+        with observe(Stats()) as stats:
+            deserialize_many(Rule(User), [{'name': 'a', 'full_name': 'A'}] * 3)
+        self.assertEqual(3, stats.as_dict()['types']['User']['count'])
+
+        # Nothing is reported after the block, and nothing is swapped in.
+        deserialize(Rule(Object), data)
+        self.assertEqual(3, stats.as_dict()['types']['User']['count'])
+        # noinspection PyProtectedMember
+        self.assertIs(deserializer._instantiate_first,
+                      deserializer._instantiate)
+
+    def test_OtherThreadsAreNotReported(self):
+        stats = Stats()
+        started = threading.Event()
+        done = threading.Event()
+
+        def _observe():
+            with observe(stats):
+                started.set()
+                done.wait()
+
+        thread = threading.Thread(target=_observe)
+        thread.start()
+        started.wait()
+        try:
+            deserialize(Rule(Object), data)
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual({}, stats.as_dict()['types'])
+
+    def test_FailureIsReported(self):
+        stats = Stats()
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Object), {'name': 'x'}, observer=stats)
+        objects = stats.as_dict()['types']['Object']
+        self.assertEqual(1, objects['failures'])
+        self.assertEqual(2, objects['candidate_skips'])
+
+    def test_CandidateMisses(self):
+        stats = Stats()
+        group = deserialize(Rule(Object), {'name': 'g', 'full_name': 1,
+                                           'members': []}, observer=stats)
+        self.assertIsInstance(group, Group)
+        objects = stats.as_dict()['types']['Object']
+        self.assertEqual(1, objects['candidate_misses'])
+        self.assertEqual(0, objects['candidate_skips'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import pickle
+import unittest
+from typing import Dict, List
+
+from dict_deserializer.annotations import validated
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+from dict_deserializer.parallel import ParallelDeserializer
+
+
+class Item(Deserializable):
+    name: str
+    count: int = 1
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.name == self.name and \
+            other.count == self.count
+
+
+class CompactItem(Deserializable, slots=True):
+    name: str
+
+    @validated()
+    def size(self, value):
+        if value is not None and value < 0:
+            raise ValueError('size must not be negative')
+
+
+items = [{'name': 'i{}'.format(i), 'count': i} for i in range(25)]
+
+
+class TestParallel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parallel = ParallelDeserializer(List[Item], workers=2,
+                                            chunk_size=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parallel.close()
+
+    def test_ListIsReturnedInOrder(self):
+        self.assertEqual(deserialize(Rule(List[Item]), items),
+                         self.parallel.deserialize(items))
+
+    def test_ErrorReportsGlobalPath(self):
+        data = items[:17] + [{'name': 17, 'count': 17}] + items[18:]
+
+        with self.assertRaises(TypeError) as parallel:
+            self.parallel.deserialize(data)
+        with self.assertRaises(TypeError) as single:
+            deserialize(Rule(List[Item]), data)
+        self.assertEqual(str(single.exception), str(parallel.exception))
+        self.assertIn('[root].17.name', str(parallel.exception))
+
+    def test_Dict(self):
+        data = {item['name']: item for item in items}
+
+        with ParallelDeserializer(Dict[str, Item], workers=2,
+                                  chunk_size=4) as parallel:
+            result = parallel.deserialize(data)
+        self.assertEqual(deserialize(Rule(Dict[str, Item]), data), result)
+        self.assertEqual(list(data), list(result))
+
+    def test_SmallAndOtherPayloadsAreDeserializedInProcess(self):
+        parallel = ParallelDeserializer(List[Item], chunk_size=100)
+        self.assertEqual(deserialize(Rule(List[Item]), items),
+                         parallel.deserialize(items))
+        self.assertIsNone(parallel._executor)
+
+        with self.assertRaises(TypeError):
+            parallel.deserialize({'name': 'not a list'})
+
+    def test_InstancesPickle(self):
+        item = deserialize(Rule(Item), items[3])
+        self.assertEqual(item, pickle.loads(pickle.dumps(item)))
+
+        compact = deserialize(Rule(CompactItem), {'name': 'c', 'size': 3})
+        copy = pickle.loads(pickle.dumps(compact))
+        self.assertEqual(('c', 3), (copy.name, copy.size))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+from typing import Dict, List, Optional, Tuple, Union
+
+from dict_deserializer.annotations import abstract, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    Rule, compile_deserializer
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+class Group(Object):
+    members: List[Object]
+
+
+class Account(Deserializable):
+    name: str
+
+    @validated()
+    def age(self, value):
+        if value is not None and value < 0:
+            raise TypeError('age must not be negative')
+
+
+class Index(Deserializable):
+    groups: Dict[str, Group]
+    owner: Union[int, User]
+
+
+@abstract
+class Event(Deserializable):
+    at: int
+
+
+class Created(Event):
+    source: int
+
+
+class Moved(Event):
+    source: str
+
+
+directory = {'name': 'root', 'members': [
+    {'name': 'u', 'full_name': 'U'},
+    {'name': 'g', 'members': [{'name': 'v', 'full_name': 'V'}]},
+]}
+
+
+class TestProjection(unittest.TestCase):
+    def test_SelectedFieldsAreDeserialized(self):
+        root = deserialize(Rule(Object), directory,
+                           only={'name', 'members.name'})
+
+        self.assertIsInstance(root, Group)
+        self.assertEqual('root', root.name)
+        self.assertEqual([User, Group], [type(m) for m in root.members])
+        self.assertEqual(['u', 'g'], [m.name for m in root.members])
+        # Not selected, so kept as is.
+        self.assertEqual('U', root.members[0].full_name)
+        self.assertEqual([{'name': 'v', 'full_name': 'V'}],
+                         root.members[1].members)
+
+    def test_OtherFieldsAreNotChecked(self):
+        data = {'name': 'g', 'members': [{'name': 'u', 'full_name': 5}]}
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Object), data)
+
+        group = deserialize(Rule(Object), data, only={'name'})
+        self.assertEqual(data['members'], group.members)
+        group = deserialize(Rule(Object), data, only={'members.name'})
+        self.assertEqual(5, group.members[0].full_name)
+
+        account = deserialize(Rule(Account), {'name': 'a', 'age': -1},
+                              only={'name'})
+        self.assertEqual(-1, account.age)
+
+    def test_SelectedFieldsAreChecked(self):
+        data = {'name': 'g', 'members': [{'name': 1, 'full_name': 'U'}]}
+        with self.assertRaises(TypeError) as e:
+            deserialize(Rule(Group), data, only={'members.name'},
+                        try_all=False)
+        self.assertIn('[root].members.0.name', str(e.exception))
+
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Account), {'name': 'a', 'age': -1},
+                        only={'age'})
+
+    def test_DefaultsAreApplied(self):
+        user = deserialize(Rule(User), {'name': 'u', 'full_name': 'U'},
+                           only={'name'})
+        self.assertEqual('Unknown', user.calling_name)
+
+    def test_SameSubclassAsFull(self):
+        for data in [{'at': 1, 'source': 'a'}, {'at': 1, 'source': 2}]:
+            full = deserialize(Rule(Event), data)
+            projected = deserialize(Rule(Event), data, only={'at'})
+            self.assertIs(type(full), type(projected))
+            self.assertEqual(vars(full), vars(projected))
+
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Event), {'at': 1, 'source': None, 'x': 1},
+                        only={'at'})
+
+    def test_DictsAndUnions(self):
+        data = {'groups': {'a': directory},
+                'owner': {'name': 'o', 'full_name': 'O'}}
+        index = deserialize(Rule(Index), data,
+                            only={'groups.name', 'owner.name'})
+
+        self.assertEqual('root', index.groups['a'].name)
+        self.assertEqual(directory['members'], index.groups['a'].members)
+        self.assertIsInstance(index.owner, User)
+        self.assertEqual(5, deserialize(Rule(Index), dict(data, owner=5),
+                                        only={'owner.name'}).owner)
+
+    def test_WholeFieldWins(self):
+        root = deserialize(Rule(Group), directory,
+                           only={'members.name', 'members'})
+        self.assertEqual('V', root.members[1].members[0].full_name)
+
+    def test_UnknownPathsAreRejected(self):
+        for path in ['nmae', 'groups.nmae', 'groups.members.nmae',
+                     'owner.full_name.first']:
+            with self.assertRaises(ValueError) as e:
+                deserialize(Rule(Index), {}, only={path})
+            self.assertIn(path, str(e.exception))
+
+        # A field of any subclass, or of a class inside a container, will do.
+        deserialize(Rule(Object), directory, only={'full_name', 'members'})
+        deserialize(Rule(Optional[List[Index]]), [],
+                    only={'groups.members.full_name', 'owner.calling_name'})
+        deserialize(Rule(Dict[str, Tuple[Group, ...]]), {},
+                    only={'members.name'})
+
+    def test_PlansAreCached(self):
+        self.assertIs(compile_deserializer(Rule(Object),
+                                           {'name', 'members.name'}),
+                      compile_deserializer(Rule(Object),
+                                           ['members.name', 'name']))
+        self.assertIsNot(compile_deserializer(Rule(Object), {'name'}),
+                         compile_deserializer(Rule(Object)))
+
+
+if __name__ == '__main__':
+    unittest.main()
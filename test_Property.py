@@ -1,4 +1,5 @@
 import unittest
+from typing import List
 
 from dict_deserializer.annotations import validated
 from dict_deserializer.deserializer import Deserializable, deserialize, Rule
@@ -19,6 +20,15 @@ class Object(Deserializable):
         return isinstance(other, Object) and other.name == self.name
 
 
+class Compact(Deserializable, slots=True):
+    name: str
+
+    @validated(default='Unknown')
+    def name(self, value):
+        if len(value) > 10:
+            raise TypeError("Maximum name length is 10 characters")
+
+
 class TestLists(unittest.TestCase):
     def test_SetWrongTypeShouldFail(self):
         with self.assertRaises(TypeError):
@@ -39,3 +49,21 @@ class TestLists(unittest.TestCase):
                'name': 'Rolf'
             }, try_all=False)
         )
+
+    def test_ValuesArePerInstance(self):
+        first = deserialize(Rule(Object), {'name': 'first'})
+        second = deserialize(Rule(Object), {'name': 'second'})
+        self.assertEqual('first', first.name)
+        self.assertEqual('second', second.name)
+
+    def test_DefaultComesFromClass(self):
+        compact = Compact.__new__(Compact)
+        self.assertEqual('Unknown', compact.name)
+
+    def test_SlottedValidatedField(self):
+        compacts = deserialize(Rule(List[Compact]), [{'name': 'a'},
+                                                     {'name': 'b'}])
+        self.assertEqual(['a', 'b'], [c.name for c in compacts])
+        self.assertFalse(hasattr(compacts[0], '__dict__'))
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Compact), {'name': 'abcdefghijklmnopqrstuvwxyz'})
@@ -0,0 +1,141 @@
+import unittest
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from dict_deserializer.annotations import abstract, discriminate, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    serialize, Rule
+from test_Property import Compact
+
+
+@abstract
+class Shape(Deserializable):
+    name: str
+
+
+@discriminate('kind', 'circle')
+class Circle(Shape):
+    radius: float
+
+
+@discriminate('kind', 'polygon')
+class Polygon(Shape):
+    points: List[Tuple[int, int]]
+
+
+class Drawing(Deserializable):
+    title: str
+    shapes: List[Shape]
+    layers: Dict[str, Optional[Shape]]
+    background: Union[Circle, List[Polygon], None]
+    extra: Any
+    scale: Optional[float] = 1.0
+
+
+class Account(Deserializable, slots=True):
+    email: str
+    tags: List[str]
+    active: Optional[bool] = True
+
+    @validated()
+    def email(self, value):
+        if '@' not in value:
+            raise TypeError('Not an address.')
+
+
+drawing = {
+    'title': 'd',
+    'shapes': [
+        {'kind': 'circle', 'name': 'c', 'radius': 1.5},
+        {'kind': 'polygon', 'name': 'p', 'points': [[0, 0], [1, 2]]},
+    ],
+    'layers': {'top': {'kind': 'circle', 'name': 't', 'radius': 2.0},
+               'empty': None},
+    'background': [{'kind': 'polygon', 'name': 'b', 'points': []}],
+    'extra': {'anything': [1, 'a']},
+    'scale': 2.0,
+}
+
+
+class TestSerialize(unittest.TestCase):
+    def test_RoundTrip(self):
+        result = serialize(Rule(Drawing), deserialize(Rule(Drawing), drawing))
+        self.assertEqual(drawing, result)
+        self.assertEqual(list(drawing['shapes'][0]),
+                         list(result['shapes'][0]))
+
+    def test_Types(self):
+        result = serialize(Rule(Drawing), deserialize(Rule(Drawing), drawing))
+        self.assertIs(type(result['shapes'][1]['points'][0]), list)
+        self.assertIs(type(result['layers']['top']), dict)
+        self.assertIsNone(result['layers']['empty'])
+
+        self.assertEqual([[1, 2]], serialize(List[Tuple[int, int]],
+                                             [(1, 2)]))
+        self.assertEqual({'a': 1}, serialize(Dict[str, int], {'a': 1}))
+        self.assertIsNone(serialize(Rule(Drawing), None))
+
+    def test_SubclassesUseTheirOwnFields(self):
+        shape = deserialize(Rule(Shape), drawing['shapes'][0])
+        self.assertEqual(drawing['shapes'][0], serialize(Rule(Shape), shape))
+        self.assertEqual(drawing['shapes'][0],
+                         serialize(Rule(Optional[Shape]), shape))
+
+    def test_ToDict(self):
+        shape = deserialize(Rule(Shape), drawing['shapes'][1])
+        self.assertEqual(drawing['shapes'][1], shape.to_dict())
+        self.assertEqual({'kind': 'polygon', 'name': None, 'points': None},
+                         Polygon().to_dict())
+
+    def test_SkipDefaults(self):
+        data = {'title': 'd', 'shapes': [], 'layers': {},
+                'background': None, 'extra': None, 'scale': 1.0}
+        instance = deserialize(Rule(Drawing), data)
+        compact = instance.to_dict(skip_defaults=True)
+        self.assertEqual({'title': 'd', 'shapes': [], 'layers': {}},
+                         compact)
+        self.assertEqual(data, deserialize(Rule(Drawing), compact).to_dict())
+
+        full = deserialize(Rule(Drawing), drawing)
+        self.assertEqual(drawing, serialize(
+            Rule(Drawing), deserialize(Rule(Drawing), serialize(
+                Rule(Drawing), full, skip_defaults=True))))
+
+    def test_SkipDefaultsComparesTypes(self):
+        class Flags(Deserializable):
+            enabled: Optional[int] = False
+
+        self.assertEqual({'enabled': 0}, Flags(enabled=0).to_dict(True))
+        self.assertEqual({}, Flags(enabled=False).to_dict(True))
+
+    def test_ValidatedAndSlots(self):
+        data = {'email': 'a@b', 'tags': ['x'], 'active': False}
+        account = deserialize(Rule(Account), data)
+        self.assertEqual(data, account.to_dict())
+        self.assertEqual({'email': 'a@b', 'tags': ['x'], 'active': False},
+                         account.to_dict(skip_defaults=True))
+
+        self.assertEqual({'name': 'abc'},
+                         deserialize(Rule(Compact), {'name': 'abc'}).to_dict())
+
+    def test_UnsetFields(self):
+        self.assertEqual({'email': None, 'tags': None, 'active': None},
+                         Account.__new__(Account).to_dict())
+
+    def test_LazyAndProjected(self):
+        lazy = deserialize(Rule(Drawing), drawing, lazy=True)
+        self.assertEqual(drawing, lazy.to_dict())
+
+        projected = deserialize(Rule(Drawing), drawing, only={'title'})
+        self.assertEqual(drawing, projected.to_dict())
+
+    def test_ClassChanges(self):
+        class Changing(Deserializable):
+            a: int
+
+        self.assertEqual({'a': 1}, Changing(a=1).to_dict())
+        Changing.__annotations__['b'] = int
+        self.assertEqual({'a': 1, 'b': None}, Changing(a=1).to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
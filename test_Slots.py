@@ -0,0 +1,73 @@
+import pickle
+import unittest
+from typing import List, Optional
+
+from dict_deserializer.annotations import abstract
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+
+
+@abstract
+class Object(Deserializable, slots=True):
+    name: str
+
+
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+class Group(Object):
+    members: List[Object]
+
+
+class Compact(Deserializable, slots=True):
+    name: str
+    size: int = 0
+
+
+class Loose(Compact, slots=False):
+    pass
+
+
+class Large(Compact):
+    size = 5
+
+
+class TestSlots(unittest.TestCase):
+    def test_InstancesHaveNoDict(self):
+        group = deserialize(Rule(Object), {
+            'name': 'IAPC',
+            'members': [{'name': 'Rolf', 'full_name': 'Rolf van Kleef'}],
+        })
+
+        self.assertIsInstance(group, Group)
+        self.assertFalse(hasattr(group, '__dict__'))
+        self.assertFalse(hasattr(group.members[0], '__dict__'))
+        self.assertEqual('Unknown', group.members[0].calling_name)
+
+    def test_SlotsAreInherited(self):
+        self.assertEqual(('name',), Object.__slots__)
+        self.assertEqual(('full_name', 'calling_name'), User.__slots__)
+        self.assertEqual(('members',), Group.__slots__)
+
+    def test_DefaultsAreKept(self):
+        self.assertEqual('Unknown', User.get_attrs()['calling_name'].default)
+
+    def test_OverriddenDefault(self):
+        self.assertEqual((), Large.__slots__)
+        self.assertEqual(5, Large.get_attrs()['size'].default)
+        self.assertEqual(5, deserialize(Rule(Large), {'name': 'a'}).size)
+        self.assertEqual(3, deserialize(Rule(Large),
+                                        {'name': 'a', 'size': 3}).size)
+        self.assertEqual(0, deserialize(Rule(Compact), {'name': 'a'}).size)
+
+    def test_OptOut(self):
+        loose = deserialize(Rule(Loose), {'name': 'a'})
+        self.assertTrue(hasattr(loose, '__dict__'))
+        self.assertEqual(0, loose.size)
+
+    def test_Pickle(self):
+        user = deserialize(Rule(User), {'name': 'a', 'full_name': 'b'})
+        copy = pickle.loads(pickle.dumps(user))
+        self.assertEqual(('a', 'b', 'Unknown'),
+                         (copy.name, copy.full_name, copy.calling_name))
@@ -0,0 +1,179 @@
+import asyncio
+import io
+import json
+import unittest
+from typing import List
+
+from dict_deserializer.deserializer import Deserializable, Rule
+from dict_deserializer.streaming import aiter_deserialize, \
+    iter_deserialize, JSONStreamParser
+
+
+class Record(Deserializable):
+    name: str
+    tags: List[str]
+
+    def __eq__(self, other):
+        return isinstance(other, Record) and other.name == self.name and \
+            other.tags == self.tags
+
+
+records = [{'name': 'r{}'.format(i), 'tags': ['a', 'b'] * i}
+           for i in range(20)]
+expected = [Record(name=r['name'], tags=r['tags']) for r in records]
+
+
+class TestStreaming(unittest.TestCase):
+    def test_IterableOfParsedItems(self):
+        result = iter_deserialize(Rule(Record), iter(records))
+        self.assertNotIsInstance(result, list)
+        self.assertEqual(expected, list(result))
+
+    def test_JSONArrayInSmallChunks(self):
+        source = io.BytesIO(json.dumps(records).encode('utf-8'))
+        self.assertEqual(expected, list(
+            iter_deserialize(Rule(Record), source, chunk_size=3)))
+
+    def test_NDJSON(self):
+        source = io.StringIO(
+            '\n'.join(json.dumps(r) for r in records) + '\n')
+        self.assertEqual(expected, list(
+            iter_deserialize(Rule(Record), source, chunk_size=7)))
+
+    def test_ErrorReportsElementIndex(self):
+        source = io.StringIO(json.dumps([1, 2, 'three']))
+        result = iter_deserialize(Rule(int), source)
+        self.assertEqual(1, next(result))
+        self.assertEqual(2, next(result))
+        with self.assertRaisesRegex(TypeError, r'<\[root\]\.2>'):
+            next(result)
+
+    def test_NumbersAreNotSplitAcrossChunks(self):
+        parser = JSONStreamParser()
+        self.assertEqual([], parser.feed('[12'))
+        self.assertEqual([123], parser.feed('3, 4'))
+        self.assertEqual([4], parser.feed(']'))
+        self.assertEqual([], parser.close())
+
+    def test_NumbersSplitInsideTheirToken(self):
+        parser = JSONStreamParser()
+        self.assertEqual([], parser.feed('[1.'))
+        self.assertEqual([1.5], parser.feed('5, 2e'))
+        self.assertEqual([2e3], parser.feed('3, 4e'))
+        self.assertEqual([], parser.feed('+'))
+        self.assertEqual([40.0], parser.feed('1]'))
+        self.assertEqual([], parser.close())
+
+        source = io.StringIO('[1.5, 2.25, 3e2, -4e+1]')
+        self.assertEqual([1.5, 2.25, 300.0, -40.0], list(
+            iter_deserialize(Rule(float), source, chunk_size=2)))
+
+    def test_StringsAndNestingAcrossChunks(self):
+        text = json.dumps([{'a': ']}"\\', 'b': [[1], {'c': '['}]}, 'x"'])
+        parser = JSONStreamParser()
+        items = []
+        for c in text:
+            items += parser.feed(c)
+        self.assertEqual(json.loads(text), items + parser.close())
+
+    def test_MalformedElementFailsEarly(self):
+        parser = JSONStreamParser()
+        with self.assertRaises(ValueError):
+            parser.feed('[{"a": 1], ' + '{"b": 2}, ' * 1000)
+
+    def test_TruncatedArrayFails(self):
+        parser = JSONStreamParser()
+        parser.feed('[1, {"a": ')
+        with self.assertRaises(ValueError):
+            parser.close()
+
+
+async def _chunks(text: str, size: int, encode: bool = True):
+    """
+    Stands in for an asynchronous request body.
+    """
+    data = text.encode('utf-8') if encode else text
+    for i in range(0, len(data), size):
+        await asyncio.sleep(0)
+        yield data[i:i + size]
+
+
+async def _collect(result):
+    return [item async for item in result]
+
+
+class TestAsyncStreaming(unittest.TestCase):
+    def test_JSONArrayInSmallChunks(self):
+        text = json.dumps(records)
+        result = asyncio.run(_collect(aiter_deserialize(
+            Rule(Record), _chunks(text, 3))))
+        self.assertEqual(expected, result)
+
+    def test_NDJSON(self):
+        text = '\n'.join(json.dumps(r) for r in records)
+        result = asyncio.run(_collect(aiter_deserialize(
+            Rule(Record), _chunks(text, 7, encode=False))))
+        self.assertEqual(expected, result)
+
+    def test_MultiByteCharactersAcrossChunks(self):
+        text = json.dumps(['\u00e9t\u00e9', '\u2603'], ensure_ascii=False)
+        result = asyncio.run(_collect(aiter_deserialize(
+            Rule(str), _chunks(text, 1))))
+        self.assertEqual(['\u00e9t\u00e9', '\u2603'], result)
+
+    def test_YieldsToOtherTasks(self):
+        received = []
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(received))
+                await asyncio.sleep(0)
+
+        async def single_chunk():
+            yield json.dumps(list(range(100))).encode('utf-8')
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            async for item in aiter_deserialize(Rule(int), single_chunk(),
+                                                yield_every=10):
+                received.append(item)
+            task.cancel()
+
+        asyncio.run(main())
+        self.assertEqual(list(range(100)), received)
+        # The ticker got to run while the single chunk was processed.
+        self.assertLessEqual(9, len(set(ticks)))
+
+    def test_LargeChunksAreParsedInSlices(self):
+        ticks = []
+        text = json.dumps(['x' * 1000] * 300)
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def single_chunk():
+            yield text
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            parsing = asyncio.ensure_future(_collect(aiter_deserialize(
+                Rule(str), single_chunk(), yield_every=1000)))
+            # Counts the ticks before the first element is received.
+            await asyncio.sleep(0)
+            start = len(ticks)
+            result = await parsing
+            task.cancel()
+            return start, result
+
+        start, result = asyncio.run(main())
+        self.assertEqual(300, len(result))
+        # 300 KB is parsed in (at least) 4 slices of 64 KiB.
+        self.assertLessEqual(start + 4, len(ticks))
+
+    def test_ErrorReportsElementIndex(self):
+        with self.assertRaisesRegex(TypeError, r'<\[root\]\.2>'):
+            asyncio.run(_collect(aiter_deserialize(
+                Rule(int), _chunks('[1, 2, "three"]', 4))))
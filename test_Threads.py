@@ -0,0 +1,131 @@
+import sys
+import threading
+import unittest
+from typing import List, Optional
+
+from dict_deserializer.annotations import abstract, discriminate
+from dict_deserializer.deserializer import Deserializable, deserialize, Rule
+
+THREADS = 8
+
+
+def run_threads(target, count=THREADS):
+    """
+    Runs target(i) in count threads that start at the same time, and returns
+    the exceptions they raised.
+    """
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def _run(i):
+        barrier.wait()
+        try:
+            target(i)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class TestThreads(unittest.TestCase):
+    def setUp(self):
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def test_ConcurrentFirstUse(self):
+        for _ in range(20):
+            @abstract
+            class Node(Deserializable):
+                name: str
+
+            class Leaf(Node):
+                value: int
+
+            class Branch(Node):
+                children: List[Node]
+
+            data = {'name': 'root', 'children': [
+                {'name': 'l{}'.format(i), 'value': i} for i in range(10)] + [
+                {'name': 'b', 'children': [{'name': 'l', 'value': 0}]}]}
+            results = []
+
+            def _deserialize(_):
+                results.append(deserialize(Rule(Node), data))
+
+            self.assertEqual([], run_threads(_deserialize))
+            for result in results:
+                self.assertIsInstance(result, Branch)
+                self.assertEqual(list(range(10)),
+                                 [c.value for c in result.children[:10]])
+                self.assertIsInstance(result.children[10], Branch)
+
+    def test_DefiningSubclassesWhileDeserializing(self):
+        @abstract
+        class Shape(Deserializable):
+            kind: str
+
+        @discriminate('kind', 'square')
+        class Square(Shape):
+            size: int
+
+        done = threading.Event()
+        defined = []
+
+        def _work(i):
+            if i == 0:
+                for n in range(50):
+                    @discriminate('kind', 'shape{}'.format(n))
+                    class Other(Shape):
+                        sides: Optional[int]
+                    defined.append(Other)
+                done.set()
+                return
+
+            while not done.is_set():
+                square = deserialize(Rule(Shape),
+                                     {'kind': 'square', 'size': i})
+                self.assertIs(Square, type(square))
+                self.assertEqual(i, square.size)
+
+        self.assertEqual([], run_threads(_work))
+        for n, cls in enumerate(defined):
+            shape = deserialize(Rule(Shape), {'kind': 'shape{}'.format(n)})
+            self.assertIs(cls, type(shape))
+
+    def test_ChangingAnnotationsWhileDeserializing(self):
+        class Record(Deserializable):
+            name: str
+
+        done = threading.Event()
+
+        def _work(i):
+            if i == 0:
+                for n in range(50):
+                    Record.__annotations__['field{}'.format(n)] = int
+                done.set()
+                return
+
+            while not done.is_set():
+                try:
+                    deserialize(Rule(Record), {'name': 'r'})
+                except TypeError:
+                    # A new int field may already be required.
+                    pass
+
+        self.assertEqual([], run_threads(_work))
+        # None of the caches may have been filled with an outdated value.
+        self.assertEqual(51, len(Record.get_attrs()))
+        with self.assertRaises(TypeError):
+            deserialize(Rule(Record), {'name': 'r'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import tracemalloc
+import unittest
+from typing import Dict, List, Optional, Tuple, Union
+
+from dict_deserializer.annotations import abstract, discriminate, validated
+from dict_deserializer.deserializer import Deserializable, deserialize, \
+    Rule, validate
+
+
+@abstract
+class Object(Deserializable):
+    name: str
+
+
+class User(Object):
+    full_name: str
+    calling_name: Optional[str] = 'Unknown'
+
+
+class Group(Object):
+    members: List[Object]
+
+
+@discriminate('kind', 'point')
+class Point(Deserializable):
+    x: int
+    y: int
+
+
+class Shapes(Deserializable):
+    points: Dict[str, Point]
+    corners: Tuple[int, int]
+    label: Union[int, str]
+
+
+validator_calls = []
+
+
+class Account(Deserializable):
+    name: str
+
+    @validated()
+    def age(self, value):
+        validator_calls.append(value)
+        if value is not None and value < 0:
+            raise TypeError('age must not be negative')
+
+
+directory = {'name': 'root', 'members': [
+    {'name': 'u', 'full_name': 'U'},
+    {'name': 'g', 'members': [{'name': 'v', 'full_name': 'V'}]},
+]}
+
+shapes = {'points': {'a': {'kind': 'point', 'x': 1, 'y': 2}},
+          'corners': [1, 2], 'label': 'l'}
+
+
+class TestValidate(unittest.TestCase):
+    def assertSameError(self, rule, data, try_all=True):
+        invalid = validate(rule, data, try_all)
+        self.assertIsNotNone(invalid)
+        with self.assertRaises(TypeError) as e:
+            deserialize(rule, data, try_all)
+        self.assertEqual(str(e.exception), invalid.message)
+        return invalid
+
+    def test_Valid(self):
+        self.assertIsNone(validate(Rule(Object), directory))
+        self.assertIsNone(validate(Rule(Shapes), shapes))
+        self.assertIsNone(validate(Rule(List[int]), [1, 2, 3]))
+        self.assertIsNone(validate(Rule(Optional[Object]), None))
+
+    def test_SameErrorsAsDeserialize(self):
+        self.assertSameError(Rule(int), 'one')
+        self.assertSameError(Rule(List[int]), [1, 'two'])
+        self.assertSameError(Rule(List[int]), {'not': 'a list'})
+        self.assertSameError(Rule(Object), {'name': 'x'})
+        self.assertSameError(Rule(Object), {'name': 'g', 'members': [
+            {'name': 'u', 'full_name': 5}]})
+        self.assertSameError(Rule(Object), {'name': 'g', 'members': [
+            {'name': 'u', 'full_name': 5}]}, try_all=False)
+        self.assertSameError(Rule(Shapes), dict(shapes, corners=[1]))
+        self.assertSameError(Rule(Shapes), dict(shapes, corners=(1, 'x')))
+        self.assertSameError(Rule(Shapes), dict(shapes, label=1.5))
+        self.assertSameError(Rule(Shapes), dict(shapes, points={
+            'a': {'kind': 'point', 'x': 'one', 'y': 2}}))
+
+    def test_Path(self):
+        invalid = validate(Rule(Group), {'name': 'g', 'members': [
+            {'name': 'u', 'full_name': 'U'},
+            {'name': 'v', 'full_name': 5}]}, try_all=False)
+        self.assertEqual(('[root]', 'members', 1, 'full_name'), invalid.path)
+        self.assertIsInstance(invalid.error(), TypeError)
+
+    def test_Validators(self):
+        validator_calls.clear()
+        self.assertIsNone(validate(Rule(Account), {'name': 'a', 'age': 3}))
+        self.assertEqual([3], validator_calls)
+
+        self.assertSameError(Rule(Account), {'name': 'a', 'age': -1})
+        invalid = validate(Rule(Account), {'name': 'a', 'age': -1},
+                           try_all=False)
+        self.assertEqual('age must not be negative', invalid.message)
+
+    def test_ValidatorsGetDeserializedValues(self):
+        class Inner(Deserializable):
+            n: int
+
+        class Outer(Deserializable):
+            inner: Inner
+
+            @validated()
+            def inner(self, value):
+                if not isinstance(value, Inner) or value.n < 0:
+                    raise ValueError('n must not be negative')
+
+        self.assertIsNotNone(deserialize(Rule(Outer), {'inner': {'n': 1}}))
+        self.assertIsNone(validate(Rule(Outer), {'inner': {'n': 1}}))
+        self.assertSameError(Rule(Outer), {'inner': {'n': -1}})
+
+    def test_ValidatorsReadingTheInstanceAreSkipped(self):
+        class Limited(Deserializable):
+            def limit(self):
+                return 1
+
+            @validated()
+            def value(self, value):
+                if value > self.limit():
+                    raise ValueError('value is over the limit')
+
+        class Broken(Deserializable):
+            @validated()
+            def name(self, value):
+                raise RuntimeError('broken')
+
+        data = {'value': 2}
+        with self.assertRaises(ValueError):
+            deserialize(Rule(Limited), data, try_all=False)
+        self.assertIsNone(validate(Rule(Limited), data))
+
+        with self.assertRaises(RuntimeError):
+            validate(Rule(Broken), {'name': 'a'})
+
+    def test_NothingIsBuilt(self):
+        data = [{'name': 'u{}'.format(i), 'full_name': 'U'}
+                for i in range(1000)]
+        validate(Rule(List[User]), data)
+        deserialize(Rule(List[User]), data)
+
+        tracemalloc.start()
+        try:
+            validate(Rule(List[User]), data)
+            validated_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            deserialize(Rule(List[User]), data)
+            deserialized_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(validated_peak * 20, deserialized_peak)
+
+
+if __name__ == '__main__':
+    unittest.main()